@@ -0,0 +1,40 @@
+"""Add analysis_cache table for duplicate tweet text
+
+Revision ID: 0a7d3e5b9c21
+Revises: f2c6d8a41e93
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7d3e5b9c21'
+down_revision = 'f2c6d8a41e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analysis_cache',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('is_ai_related', sa.Boolean(), nullable=False),
+        sa.Column('ai_relevance_score', sa.Float(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('topics', sa.JSON(), nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_analysis_cache_content_hash'), 'analysis_cache', ['content_hash'], unique=True)
+    op.create_index(op.f('ix_analysis_cache_created_at'), 'analysis_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analysis_cache_created_at'), table_name='analysis_cache')
+    op.drop_index(op.f('ix_analysis_cache_content_hash'), table_name='analysis_cache')
+    op.drop_table('analysis_cache')
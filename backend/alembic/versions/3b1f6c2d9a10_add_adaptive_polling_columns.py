@@ -0,0 +1,34 @@
+"""Add adaptive polling columns to monitored_accounts
+
+Revision ID: 3b1f6c2d9a10
+Revises: 648ebc023000
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f6c2d9a10'
+down_revision = '648ebc023000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('monitored_accounts', sa.Column('posting_rate', sa.Float(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('poll_yield', sa.Float(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('poll_interval_minutes', sa.Integer(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('last_polled_at', sa.DateTime(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('next_poll_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_monitored_accounts_next_poll_at'), 'monitored_accounts', ['next_poll_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_monitored_accounts_next_poll_at'), table_name='monitored_accounts')
+    op.drop_column('monitored_accounts', 'next_poll_at')
+    op.drop_column('monitored_accounts', 'last_polled_at')
+    op.drop_column('monitored_accounts', 'poll_interval_minutes')
+    op.drop_column('monitored_accounts', 'poll_yield')
+    op.drop_column('monitored_accounts', 'posting_rate')
@@ -0,0 +1,45 @@
+"""Add task_checkpoints table and keyset index for the unprocessed backlog
+
+Revision ID: 6e1b4d8f2a37
+Revises: 0a7d3e5b9c21
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1b4d8f2a37'
+down_revision = '0a7d3e5b9c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_checkpoints',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('cursor_created_at', sa.DateTime(), nullable=True),
+        sa.Column('cursor_id', sa.BigInteger(), nullable=True),
+        sa.Column('max_engagement', sa.Float(), nullable=True),
+        sa.Column('chunk_count', sa.Integer(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('ai_related_count', sa.Integer(), nullable=False),
+        sa.Column('skipped_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_task_checkpoints_name'), 'task_checkpoints', ['name'], unique=True)
+    op.create_index('ix_tweets_processed_created_at_id', 'tweets', ['processed', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tweets_processed_created_at_id', table_name='tweets')
+    op.drop_index(op.f('ix_task_checkpoints_name'), table_name='task_checkpoints')
+    op.drop_table('task_checkpoints')
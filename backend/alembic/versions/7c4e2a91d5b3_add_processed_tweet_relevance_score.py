@@ -0,0 +1,24 @@
+"""Add ai_relevance_score to processed_tweets
+
+Revision ID: 7c4e2a91d5b3
+Revises: 3b1f6c2d9a10
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e2a91d5b3'
+down_revision = '3b1f6c2d9a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('processed_tweets', sa.Column('ai_relevance_score', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('processed_tweets', 'ai_relevance_score')
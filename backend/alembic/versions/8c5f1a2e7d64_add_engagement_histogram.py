@@ -0,0 +1,34 @@
+"""Add engagement_histogram table for rolling importance normalization
+
+Revision ID: 8c5f1a2e7d64
+Revises: 6e1b4d8f2a37
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c5f1a2e7d64'
+down_revision = '6e1b4d8f2a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'engagement_histogram',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('tweet_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'bucket', name='uq_engagement_histogram_day_bucket')
+    )
+    op.create_index(op.f('ix_engagement_histogram_day'), 'engagement_histogram', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_engagement_histogram_day'), table_name='engagement_histogram')
+    op.drop_table('engagement_histogram')
@@ -0,0 +1,34 @@
+"""Add circuit breaker columns to monitored_accounts
+
+Revision ID: 9d2f5b7e4c18
+Revises: 7c4e2a91d5b3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2f5b7e4c18'
+down_revision = '7c4e2a91d5b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('monitored_accounts', sa.Column('consecutive_failures', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('monitored_accounts', sa.Column('breaker_open_until', sa.DateTime(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('last_failure_reason', sa.String(length=500), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('last_failure_at', sa.DateTime(), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('deactivated_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_monitored_accounts_breaker_open_until'), 'monitored_accounts', ['breaker_open_until'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_monitored_accounts_breaker_open_until'), table_name='monitored_accounts')
+    op.drop_column('monitored_accounts', 'deactivated_at')
+    op.drop_column('monitored_accounts', 'last_failure_at')
+    op.drop_column('monitored_accounts', 'last_failure_reason')
+    op.drop_column('monitored_accounts', 'breaker_open_until')
+    op.drop_column('monitored_accounts', 'consecutive_failures')
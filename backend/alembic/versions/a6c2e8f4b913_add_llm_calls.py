@@ -0,0 +1,43 @@
+"""Add llm_calls table for Claude call telemetry
+
+Revision ID: a6c2e8f4b913
+Revises: d3a7e9c1b584
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c2e8f4b913'
+down_revision = 'd3a7e9c1b584'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_calls',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('stage', sa.String(length=32), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('input_tokens', sa.Integer(), nullable=False),
+        sa.Column('output_tokens', sa.Integer(), nullable=False),
+        sa.Column('cache_creation_input_tokens', sa.Integer(), nullable=False),
+        sa.Column('cache_read_input_tokens', sa.Integer(), nullable=False),
+        sa.Column('latency_ms', sa.Integer(), nullable=True),
+        sa.Column('retries', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_llm_calls_stage'), 'llm_calls', ['stage'], unique=False)
+    op.create_index(op.f('ix_llm_calls_created_at'), 'llm_calls', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_llm_calls_created_at'), table_name='llm_calls')
+    op.drop_index(op.f('ix_llm_calls_stage'), table_name='llm_calls')
+    op.drop_table('llm_calls')
@@ -0,0 +1,106 @@
+"""Compact tweet metadata: allow-listed JSON plus compressed raw remainder
+
+Adds tweets.raw_metadata and backfills it: existing tweet_metadata payloads
+are split into the allow-listed fields (kept in tweet_metadata) and the
+rest (gzip-compressed into raw_metadata).
+
+Revision ID: b41e8c6a2f07
+Revises: 9d2f5b7e4c18
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import gzip
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41e8c6a2f07'
+down_revision = '9d2f5b7e4c18'
+branch_labels = None
+depends_on = None
+
+# Snapshot of the defaults at the time of this migration (TWEET_METADATA_FIELDS)
+KEEP_FIELDS = (
+    "lang", "conversationId", "inReplyToId", "quoteCount", "viewCount",
+    "author.id", "author.userName", "author.name", "author.followers",
+)
+DROP_FIELDS = (
+    "id", "text", "createdAt", "created_at", "url",
+    "likeCount", "retweetCount", "replyCount", "bookmarkCount", "public_metrics",
+)
+BATCH_SIZE = 1000
+
+tweets = sa.table(
+    'tweets',
+    sa.column('id', sa.BigInteger),
+    sa.column('tweet_metadata', sa.JSON),
+    sa.column('raw_metadata', sa.LargeBinary),
+)
+
+
+def _split(data):
+    rest = {k: v for k, v in data.items() if k not in DROP_FIELDS}
+    kept = {}
+    for name in KEEP_FIELDS:
+        head, _, tail = name.partition(".")
+        if head not in rest:
+            continue
+        if not tail:
+            kept[head] = rest.pop(head)
+        elif isinstance(rest[head], dict) and tail in rest[head]:
+            nested = dict(rest[head])
+            kept.setdefault(head, {})[tail] = nested.pop(tail)
+            if nested:
+                rest[head] = nested
+            else:
+                del rest[head]
+    return kept, rest
+
+
+def _compress(data):
+    # Same layout as app.utils.compression.compress_json (gzip marker)
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"G" + gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def upgrade() -> None:
+    op.add_column('tweets', sa.Column('raw_metadata', sa.LargeBinary(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(tweets.c.id, tweets.c.tweet_metadata)
+            .where(tweets.c.id > last_id, tweets.c.tweet_metadata.isnot(None))
+            .order_by(tweets.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            if not isinstance(row.tweet_metadata, dict):
+                continue
+            kept, rest = _split(row.tweet_metadata)
+            updates.append({
+                "row_id": row.id,
+                "kept": kept or None,
+                "raw": _compress(rest) if rest else None,
+            })
+        if updates:
+            conn.execute(
+                tweets.update()
+                .where(tweets.c.id == sa.bindparam("row_id"))
+                .values(tweet_metadata=sa.bindparam("kept"), raw_metadata=sa.bindparam("raw")),
+                updates
+            )
+
+
+def downgrade() -> None:
+    # The compressed remainder is discarded; allow-listed metadata is kept
+    op.drop_column('tweets', 'raw_metadata')
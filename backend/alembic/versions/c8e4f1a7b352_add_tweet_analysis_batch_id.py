@@ -0,0 +1,48 @@
+"""Add analysis_batch_id to tweets for Message Batch claims
+
+Revision ID: c8e4f1a7b352
+Revises: a6c2e8f4b913
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e4f1a7b352'
+down_revision = 'a6c2e8f4b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tweets') as batch_op:
+        batch_op.add_column(sa.Column('analysis_batch_id', sa.BigInteger(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_tweets_analysis_batch_id'), ['analysis_batch_id'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_tweets_analysis_batch_id', 'analysis_batches', ['analysis_batch_id'], ['id']
+        )
+
+    # Claims of batches still open were only recorded in their requests JSON
+    bind = op.get_bind()
+    tweets = sa.table('tweets', sa.column('id', sa.BigInteger()), sa.column('analysis_batch_id', sa.BigInteger()))
+    open_batches = bind.execute(sa.text(
+        "SELECT id, requests FROM analysis_batches WHERE status IN ('submitted', 'ended')"
+    ))
+    for batch_id, requests in open_batches.fetchall():
+        if isinstance(requests, str):
+            requests = json.loads(requests)
+        for tweet_ids in requests.values():
+            bind.execute(
+                tweets.update().where(tweets.c.id.in_(tweet_ids)).values(analysis_batch_id=batch_id)
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tweets') as batch_op:
+        batch_op.drop_constraint('fk_tweets_analysis_batch_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_tweets_analysis_batch_id'))
+        batch_op.drop_column('analysis_batch_id')
@@ -0,0 +1,37 @@
+"""Add translation_cache table for batched translation
+
+Revision ID: d3a7e9c1b584
+Revises: 8c5f1a2e7d64
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7e9c1b584'
+down_revision = '8c5f1a2e7d64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'translation_cache',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('translation', sa.Text(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_translation_cache_content_hash'), 'translation_cache', ['content_hash'], unique=True)
+    op.create_index(op.f('ix_translation_cache_created_at'), 'translation_cache', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_translation_cache_created_at'), table_name='translation_cache')
+    op.drop_index(op.f('ix_translation_cache_content_hash'), table_name='translation_cache')
+    op.drop_table('translation_cache')
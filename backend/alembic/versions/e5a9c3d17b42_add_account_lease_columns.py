@@ -0,0 +1,28 @@
+"""Add collection worker lease columns to monitored_accounts
+
+Revision ID: e5a9c3d17b42
+Revises: b41e8c6a2f07
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c3d17b42'
+down_revision = 'b41e8c6a2f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('monitored_accounts', sa.Column('lease_owner', sa.String(length=100), nullable=True))
+    op.add_column('monitored_accounts', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_monitored_accounts_lease_expires_at'), 'monitored_accounts', ['lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_monitored_accounts_lease_expires_at'), table_name='monitored_accounts')
+    op.drop_column('monitored_accounts', 'lease_expires_at')
+    op.drop_column('monitored_accounts', 'lease_owner')
@@ -0,0 +1,46 @@
+"""Add analysis_batches table for Message Batches analysis
+
+Revision ID: f2c6d8a41e93
+Revises: e5a9c3d17b42
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6d8a41e93'
+down_revision = 'e5a9c3d17b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analysis_batches',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('batch_id', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('requests', sa.JSON(), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False),
+        sa.Column('tweet_count', sa.Integer(), nullable=False),
+        sa.Column('max_engagement', sa.Float(), nullable=False),
+        sa.Column('succeeded_count', sa.Integer(), nullable=False),
+        sa.Column('errored_count', sa.Integer(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_polled_at', sa.DateTime(), nullable=True),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_analysis_batches_batch_id'), 'analysis_batches', ['batch_id'], unique=True)
+    op.create_index(op.f('ix_analysis_batches_status'), 'analysis_batches', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_analysis_batches_status'), table_name='analysis_batches')
+    op.drop_index(op.f('ix_analysis_batches_batch_id'), table_name='analysis_batches')
+    op.drop_table('analysis_batches')
@@ -1,13 +1,16 @@
 """
 API routes for managing monitored Twitter accounts.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 
+from app.config import settings
 from app.database import get_db
 from app.models.monitored_account import MonitoredAccount
+from app.services.account_breaker import account_breaker
+from app.services.account_onboarding import account_onboarding
 from pydantic import BaseModel, Field
 
 
@@ -166,6 +169,9 @@ async def update_account(
         account.display_name = account_data.display_name
 
     if account_data.is_active is not None:
+        if account_data.is_active and not account.is_active:
+            # Give a reactivated account a fresh start instead of an open breaker
+            account_breaker.reset(account)
         account.is_active = account_data.is_active
 
     account.updated_at = datetime.utcnow()
@@ -198,78 +204,36 @@ async def delete_account(
 @router.post("/batch", response_model=dict)
 async def create_accounts_batch(
     accounts: List[MonitoredAccountCreate],
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Add multiple monitored accounts at once.
 
     You can provide just the usernames, and the system will automatically fetch
-    the user_id and display_name from Twitter API.
+    the user_id and display_name from Twitter API (concurrently, cached).
+
+    Lists longer than ACCOUNT_BATCH_ASYNC_THRESHOLD are imported in the
+    background: the response carries a job_id to poll at /batch/{job_id}.
     """
-    from app.services.twitter_collector import twitter_collector
+    payload = [account.model_dump() for account in accounts]
 
-    added = []
-    skipped = []
-    errors = []
-
-    for account_data in accounts:
-        try:
-            # If user_id is not provided, fetch it from Twitter API
-            if not account_data.user_id:
-                user_info = await twitter_collector.fetch_user_by_username(account_data.username)
-
-                if not user_info:
-                    errors.append({
-                        "username": account_data.username,
-                        "error": "Twitter user not found"
-                    })
-                    continue
-
-                account_data.user_id = user_info["user_id"]
-
-                # Also update display_name if not provided
-                if not account_data.display_name:
-                    account_data.display_name = user_info["display_name"]
-
-            # Check if account already exists
-            existing = db.query(MonitoredAccount).filter(
-                (MonitoredAccount.user_id == account_data.user_id) |
-                (MonitoredAccount.username == account_data.username)
-            ).first()
-
-            if existing:
-                skipped.append({
-                    "username": account_data.username,
-                    "reason": "Already exists"
-                })
-                continue
-
-            # Create new account
-            account = MonitoredAccount(
-                user_id=account_data.user_id,
-                username=account_data.username,
-                display_name=account_data.display_name,
-                is_active=account_data.is_active
-            )
+    if len(payload) > settings.account_batch_async_threshold:
+        job = account_onboarding.create_job(payload)
+        background_tasks.add_task(account_onboarding.run_job, job["job_id"], payload)
+        return job
 
-            db.add(account)
-            added.append(account_data.username)
+    return await account_onboarding.onboard(db, payload)
 
-        except Exception as e:
-            errors.append({
-                "username": account_data.username,
-                "error": str(e)
-            })
 
-    db.commit()
+@router.get("/batch/{job_id}", response_model=dict)
+async def get_batch_job(job_id: str):
+    """
+    Get progress of a background batch import.
+    """
+    job = account_onboarding.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
 
-    return {
-        "added": len(added),
-        "skipped": len(skipped),
-        "errors": len(errors),
-        "details": {
-            "added": added,
-            "skipped": skipped,
-            "errors": errors
-        }
-    }
+    return job
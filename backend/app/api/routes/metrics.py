@@ -0,0 +1,98 @@
+"""
+Runtime metrics API routes.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional
+
+from app.database import get_db
+from app.services.analysis_cache import analysis_cache
+from app.services.batch_packer import batch_packer
+from app.services.engagement_normalizer import engagement_normalizer
+from app.services.llm_gateway import llm_gateway
+from app.services.llm_telemetry import llm_telemetry
+from app.services.translation_cache import translation_cache
+from app.services.twitter_collector import twitter_collector
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/collector")
+async def collector_metrics() -> Dict[str, Any]:
+    """
+    Get Twitter collector HTTP metrics.
+
+    Returns:
+        Dictionary with connection pool counters, limiter saturation and retries
+    """
+    return {
+        "http": twitter_collector.get_http_stats(),
+        "requests": twitter_collector.request_engine.get_stats()
+    }
+
+
+@router.get("/analysis-cache")
+async def analysis_cache_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Get analysis cache metrics.
+
+    Returns:
+        Dictionary with hit rate, estimated tokens saved and cache size
+    """
+    return analysis_cache.get_stats(db)
+
+
+@router.get("/translation-cache")
+async def translation_cache_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Get translation cache metrics.
+
+    Returns:
+        Dictionary with hit rate, estimated tokens saved and cache size
+    """
+    return translation_cache.get_stats(db)
+
+
+@router.get("/analyzer")
+async def analyzer_metrics() -> Dict[str, Any]:
+    """
+    Get analyzer request packing metrics.
+
+    Returns:
+        Dictionary with tweets per call, tokens per tweet and truncation splits,
+        and the Claude rate limiter's limits, waits and retries
+    """
+    return {"packing": batch_packer.get_stats(), "rate_limit": llm_gateway.limiter.get_stats()}
+
+
+@router.get("/engagement-normalization")
+async def engagement_normalization_metrics(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Get the rolling engagement window used for importance scores.
+
+    Returns:
+        Dictionary with sample count, readiness and engagement quantiles
+    """
+    engagement_normalizer.refresh_if_stale(db)
+    db.commit()
+    return engagement_normalizer.get_stats()
+
+
+@router.get("/llm")
+async def llm_metrics(
+    days: int = Query(7, ge=1, le=365),
+    stage: Optional[str] = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Get daily Claude usage rollups per stage and model.
+
+    Args:
+        days: Number of days back, including today (UTC)
+        stage: Only this stage (analysis, translation, summary, report, analysis_batch, ...)
+
+    Returns:
+        Dictionary with calls, errors, retries, tokens, latency and estimated
+        cost per day, plus totals by stage
+    """
+    return llm_telemetry.get_stats(db, days, stage)
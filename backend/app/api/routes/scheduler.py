@@ -1,20 +1,30 @@
 """
 Scheduler status API routes.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
 from typing import Dict, Any
 
+from app.database import get_db
+from app.services.account_breaker import account_breaker
+from app.services.account_leases import account_lease_manager
+from app.services.polling_policy import polling_policy
 from app.tasks.scheduler import get_scheduler_status
 
 router = APIRouter(prefix="/api/scheduler", tags=["scheduler"])
 
 
 @router.get("/status")
-async def scheduler_status() -> Dict[str, Any]:
+async def scheduler_status(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
     Get scheduler status and job information.
 
     Returns:
-        Dictionary with scheduler status and jobs
+        Dictionary with scheduler status, jobs, per-account polling intervals
+        circuit breaker state and collection worker leases
     """
-    return get_scheduler_status()
+    status = get_scheduler_status()
+    status["polling"] = polling_policy.get_polling_status(db)
+    status["breakers"] = account_breaker.get_breaker_status(db)
+    status["leases"] = account_lease_manager.get_lease_status(db)
+    return status
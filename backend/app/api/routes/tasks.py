@@ -1,7 +1,7 @@
 """
 API routes for manually triggering tasks.
 """
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 from datetime import date, timedelta
@@ -23,13 +23,42 @@ async def trigger_collection(
     1. Collect tweets from all monitored accounts
     2. Process tweets with AI analysis
 
+    With collection workers enabled the workers own collection, so only
+    step 2 runs (as in the scheduled task).
+
     Returns:
         Status message
     """
+    from app.config import settings
     from app.services.twitter_collector import twitter_collector
     from app.services.ai_analyzer import ai_analyzer
+    from app.services.pipeline import collect_analyze_pipeline
 
     try:
+        if settings.collection_workers_enabled:
+            # Collection workers poll the accounts; only analyze what they stored
+            processed_count = await ai_analyzer.process_unprocessed_tweets(db)
+            return {
+                "status": "success",
+                "message": f"Collection workers are enabled, processed {processed_count} collected tweets",
+                "stats": {
+                    "collected": None,
+                    "processed": processed_count
+                }
+            }
+
+        if settings.pipeline_enabled:
+            # Collect and analyze concurrently
+            result = await collect_analyze_pipeline.run(db)
+            return {
+                "status": "success",
+                "message": (
+                    f"Collected {result['collection'].get('total_tweets', 0)} tweets, "
+                    f"processed {result['analysis']['processed'] + result['analysis']['catch_up_processed']}"
+                ),
+                "stats": result
+            }
+
         # Step 1: Collect tweets
         stats = await twitter_collector.collect_all_tweets(db)
 
@@ -59,6 +88,37 @@ async def trigger_collection(
         }
 
 
+@router.post("/refresh-metrics")
+async def trigger_metric_refresh(
+    window_hours: int = None,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Manually trigger an engagement metric refresh for recent tweets.
+
+    Args:
+        window_hours: Freshness window in hours (defaults to METRIC_REFRESH_WINDOW_HOURS)
+
+    Returns:
+        Refresh statistics
+    """
+    from app.services.metric_refresher import metric_refresher
+
+    try:
+        stats = await metric_refresher.refresh_recent_metrics(db, window_hours)
+        return {
+            "status": "success",
+            "message": f"Updated metrics for {stats['tweets_updated']} tweets",
+            "stats": stats
+        }
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Error refreshing metrics: {str(e)}"
+        }
+
+
 @router.post("/summary")
 async def trigger_summary(
     summary_date: str = None,
@@ -129,8 +189,8 @@ async def test_claude_api() -> Dict[str, Any]:
     """
     Test if Claude API is working.
     """
-    import anthropic
     from app.config import settings
+    from app.services.llm_gateway import llm_gateway
 
     api_key_info = {
         "configured": bool(settings.anthropic_api_key),
@@ -141,24 +201,14 @@ async def test_claude_api() -> Dict[str, Any]:
     }
 
     try:
-        # Create client with optional base_url
-        client_kwargs = {"api_key": settings.anthropic_api_key}
-        if hasattr(settings, 'anthropic_base_url') and settings.anthropic_base_url:
-            client_kwargs["base_url"] = settings.anthropic_base_url
-
-        client = anthropic.Anthropic(**client_kwargs)
-
-        message = client.messages.create(
-            model=settings.claude_model,
-            max_tokens=100,
-            messages=[{"role": "user", "content": "Say hello"}]
-        )
+        # Same pooled client (and base_url) as the analyzer and report services
+        reply = await llm_gateway.complete("health_check", "Say hello")
 
         return {
             "status": "success",
             "api_key_info": api_key_info,
             "model": settings.claude_model,
-            "response": message.content[0].text
+            "response": reply
         }
     except Exception as e:
         import traceback
@@ -205,26 +255,62 @@ async def debug_tweets(
 
 @router.post("/process-tweets")
 async def process_existing_tweets(
+    mode: str = Query("interactive", pattern="^(interactive|batch|drain)$"),
+    restart: bool = False,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Process existing unprocessed tweets with AI analysis.
 
+    Args:
+        mode: "interactive" analyzes the newest tweets now; "batch" submits
+            the backlog as an Anthropic Message Batch (cheaper, results stored
+            when it ends); "drain" analyzes the whole backlog oldest first in
+            the background (progress at GET /api/tasks/drain)
+        restart: In drain mode, start over instead of resuming an interrupted drain
+
     Returns:
         Processing results
     """
     from app.services.ai_analyzer import ai_analyzer
+    from app.services.batch_analyzer import batch_analyzer
+    from app.services.backlog_drain import backlog_drain
     from app.models.tweet import Tweet as TweetModel
 
     try:
         # Check how many unprocessed tweets exist
         unprocessed_count = db.query(TweetModel).filter(TweetModel.processed == False).count()
 
+        if mode == "drain":
+            started = backlog_drain.start(restart=restart)
+            return {
+                "status": "success",
+                "message": "Backlog drain started" if started else "Backlog drain already running",
+                "mode": mode,
+                "unprocessed_before": unprocessed_count,
+                "drain": backlog_drain.describe(db)
+            }
+
+        if mode == "batch":
+            result = await batch_analyzer.run(db)
+            submitted = result["submitted"]
+            return {
+                "status": "success",
+                "message": (
+                    f"Submitted message batch {submitted['batch_id']} with {submitted['tweets']} tweets"
+                    if submitted else "No new tweets to submit"
+                ),
+                "mode": mode,
+                "unprocessed_before": unprocessed_count,
+                **result
+            }
+
         processed_count = await ai_analyzer.process_unprocessed_tweets(db)
 
         return {
             "status": "success",
             "message": f"Processed {processed_count} tweets",
+            "mode": mode,
             "processed": processed_count,
             "unprocessed_before": unprocessed_count
         }
@@ -238,6 +324,85 @@ async def process_existing_tweets(
         }
 
 
+@router.get("/analysis-batches")
+async def list_analysis_batches(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    List recent analysis Message Batches, newest first.
+
+    Returns:
+        Batch IDs with status and request/result counts
+    """
+    from app.models.analysis_batch import AnalysisBatch
+    from app.services.batch_analyzer import batch_analyzer
+
+    batches = db.query(AnalysisBatch).order_by(AnalysisBatch.created_at.desc()).limit(limit).all()
+    return {
+        "status": "success",
+        "batches": [batch_analyzer.describe(batch) for batch in batches]
+    }
+
+
+@router.post("/analysis-batches/{batch_id}/cancel")
+async def cancel_analysis_batch(
+    batch_id: str,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Cancel an open analysis Message Batch and release its tweets.
+
+    The batch is marked failed, so its unprocessed tweets go back to
+    interactive analysis, the drain and the next batch submission.
+
+    Args:
+        batch_id: Anthropic message batch ID
+
+    Returns:
+        The cancelled batch
+    """
+    from app.models.analysis_batch import AnalysisBatch
+    from app.services.batch_analyzer import batch_analyzer
+
+    analysis_batch = db.query(AnalysisBatch).filter(AnalysisBatch.batch_id == batch_id).first()
+    if analysis_batch is None:
+        return {"status": "error", "message": f"Message batch {batch_id} not found"}
+
+    try:
+        await batch_analyzer.cancel(db, analysis_batch)
+        return {
+            "status": "success",
+            "message": f"Cancelled message batch {batch_id}",
+            "batch": batch_analyzer.describe(analysis_batch)
+        }
+
+    except Exception as e:
+        db.rollback()
+        return {
+            "status": "error",
+            "message": f"Error cancelling message batch: {str(e)}"
+        }
+
+
+@router.get("/drain")
+async def get_drain_status(
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Progress of the backlog drain started with /process-tweets?mode=drain.
+
+    Returns:
+        Drain status, keyset cursor, counters and remaining tweets
+    """
+    from app.services.backlog_drain import backlog_drain
+
+    return {
+        "status": "success",
+        "drain": backlog_drain.describe(db)
+    }
+
+
 @router.post("/create-test-data")
 async def create_test_data(
     db: Session = Depends(get_db)
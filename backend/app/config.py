@@ -31,12 +31,113 @@ class Settings(BaseSettings):
     # Twitter API (twitterapi.io)
     twitter_api_key: str
     twitter_api_base_url: str = "https://api.twitterapi.io/v1"
+    twitter_http_timeout: float = 30.0
+    twitter_http_max_connections: int = 20
+    twitter_http_max_keepalive_connections: int = 10
+    twitter_http_keepalive_expiry: float = 60.0  # Seconds an idle connection stays pooled
+    twitter_http2: bool = False  # Requires the optional "h2" package
+    twitter_rate_limit_per_second: float = 10.0  # Sustained request rate allowed by our plan
+    twitter_rate_limit_burst: int = 20
+    twitter_max_retries: int = 4  # Retries for 429/5xx/transport errors
+    twitter_backoff_base: float = 0.5  # Seconds, doubled per attempt (with jitter)
+    twitter_backoff_max: float = 30.0
+    twitter_max_pages_per_account: int = 5  # Cursor pages per account per poll
+    twitter_max_tweets_per_account: int = 200
+    username_cache_ttl_seconds: int = 86400  # Cache resolved username -> user_id lookups
+    account_batch_async_threshold: int = 25  # Larger /api/accounts/batch imports run as background jobs
+    twitter_archive_dir: Optional[str] = None  # Archive raw API responses here (gzip JSONL per day)
+    twitter_replay_dir: Optional[str] = None  # Serve API calls from this archive instead of the network
+
+    # Tweet Metadata (allow-listed JSON + compressed remainder)
+    tweet_metadata_fields: str = (
+        "lang,conversationId,inReplyToId,quoteCount,viewCount,"
+        "author.id,author.userName,author.name,author.followers"
+    )
+    tweet_metadata_keep_raw: bool = True  # Store the rest of the payload compressed (deferred column)
+    tweet_metadata_codec: str = "zstd"  # zstd (needs "zstandard") or gzip
+
+    # Tweet Collection
+    collection_concurrency: int = 10  # Max accounts fetched in parallel (1 = sequential)
+    collection_account_timeout: float = 60.0  # Seconds before a single account fetch is abandoned
+    collection_run_deadline: float = 600.0  # Total seconds a collection run may spend on requests
+
+    # Account Circuit Breaker (skip accounts that keep failing)
+    account_breaker_failure_threshold: int = 3  # Consecutive failures before the breaker opens
+    account_breaker_base_cooldown_minutes: int = 60  # Doubled for every further failure
+    account_breaker_max_cooldown_minutes: int = 2880
+    account_breaker_deactivate_after: int = 10  # Consecutive failures before the account is deactivated
+
+    # Streaming Pipeline (analyze tweets while collection is still running)
+    pipeline_enabled: bool = False
+    pipeline_queue_size: int = 200  # Tweets waiting for analysis before collection blocks
+    pipeline_analyzer_workers: int = 2
+    pipeline_flush_seconds: float = 2.0  # Max wait to fill a batch before analyzing a partial one
+
+    # Collection Workers (lease due accounts from the database; run scripts/collection_worker.py)
+    collection_workers_enabled: bool = False  # The scheduler stops collecting when workers do
+    worker_lease_batch_size: int = 20  # Accounts leased per batch
+    worker_lease_seconds: int = 900  # A crashed worker's accounts are re-leased after this
+    worker_retry_minutes: int = 30  # Failed accounts wait this long before the next lease
+    worker_idle_seconds: float = 30.0  # Sleep when no account is due
+
+    # Adaptive Polling (poll each account only when it is due)
+    adaptive_polling_enabled: bool = False
+    adaptive_poll_min_minutes: int = 30  # Floor for prolific accounts
+    adaptive_poll_max_minutes: int = 1440  # Ceiling for quiet accounts
+    adaptive_poll_target_tweets: float = 3.0  # New tweets we aim to find per poll
+    adaptive_poll_smoothing: float = 0.3  # EWMA weight of the latest observation
 
     # Claude API
     anthropic_api_key: str
     anthropic_base_url: Optional[str] = None  # For API proxy/relay
     claude_model: str = "claude-3-5-sonnet-20241022"
     claude_max_tokens: int = 4096
+    claude_max_concurrency: int = 4  # Analysis batches in flight at once
+
+    # LLM Gateway (one pooled client shared by every Claude call site)
+    llm_timeout: float = 120.0  # Seconds per request, including streamed replies
+    llm_max_retries: int = 3  # Retries for 429/5xx/connection errors, with backoff
+    llm_max_connections: int = 20
+    llm_max_keepalive_connections: int = 10
+    llm_keepalive_expiry: float = 60.0  # Seconds an idle connection stays pooled
+    llm_translation_model: Optional[str] = None  # Per-call-site models default to claude_model
+    llm_translation_max_tokens: int = 1000  # Per call, including batched translations
+    llm_summary_model: Optional[str] = None
+    llm_summary_max_tokens: int = 1500
+    llm_report_model: Optional[str] = None
+    llm_report_max_tokens: int = 8000
+
+    # LLM Rate Limiting (process-wide; interactive calls are served before bulk analysis)
+    llm_rate_limit_enabled: bool = True
+    llm_requests_per_minute: int = 50  # Starting limits, replaced by the API's rate-limit headers
+    llm_tokens_per_minute: int = 40000
+    llm_backoff_base: float = 1.0  # Seconds, doubled per attempt (with jitter)
+    llm_backoff_max: float = 60.0
+
+    # LLM Telemetry (per-call tokens, latency and retries in llm_calls)
+    llm_telemetry_enabled: bool = True
+    llm_telemetry_retention_days: int = 90
+    llm_telemetry_flush_size: int = 50  # Buffered calls written in one insert, off the event loop
+    llm_telemetry_flush_interval: float = 10.0  # Max seconds a call stays buffered while calls keep coming
+
+    # Analyzer Batch Packing (size requests by estimated tokens instead of batch_size)
+    analyzer_token_packing: bool = True
+    analyzer_input_token_budget: int = 6000  # Tweet tokens per request, excluding the instructions
+    analyzer_max_tweets_per_call: int = 40
+    analyzer_output_tokens_per_tweet: int = 90  # Initial estimate, then learned from responses
+    analyzer_output_headroom: float = 0.75  # Share of claude_max_tokens the expected output may use
+    analyzer_output_estimate_smoothing: float = 0.2
+    analyzer_structured_output: bool = True  # Replies through a tool schema instead of free-form JSON text
+
+    # Importance Normalization (engagement percentile over a rolling window instead of the batch maximum)
+    engagement_normalization_enabled: bool = True
+    engagement_window_days: int = 30
+    engagement_min_samples: int = 200  # Tweets in the window before percentiles replace the batch maximum
+
+    # Analysis Cache (reuse results for duplicate tweet texts; bounds also apply to the translation cache)
+    analysis_cache_enabled: bool = True
+    analysis_cache_ttl_days: int = 30
+    analysis_cache_max_entries: int = 50000
 
     # Screenshot Service
     playwright_headless: bool = True
@@ -56,7 +157,10 @@ class Settings(BaseSettings):
 
     # Scheduled Tasks
     schedule_tweet_collection_cron: str = "0 */2 * * *"  # Every 2 hours
+    schedule_adaptive_collection_cron: str = "*/15 * * * *"  # Due-account check when adaptive polling is on
     schedule_daily_summary_cron: str = "0 8 * * *"       # Daily at 8 AM Beijing time
+    schedule_metric_refresh_cron: str = "30 */3 * * *"    # Every 3 hours, offset from collection
+    schedule_analysis_batch_poll_cron: str = "*/10 * * * *"  # Check open Message Batches
     schedule_timezone: str = "Asia/Shanghai"
 
     # Logging
@@ -64,9 +168,17 @@ class Settings(BaseSettings):
 
     # Feature Flags
     enable_translation: bool = True
+    translation_batch_size: int = 10  # Tweets translated per Claude call
     enable_screenshot: bool = True
     enable_email: bool = True
+    enable_metric_refresh: bool = True
     batch_size: int = 10
+    message_batch_max_tweets: int = 10000  # Tweets per Message Batch (offline analysis mode)
+    drain_chunk_size: int = 500  # Tweets loaded and committed per step of a backlog drain
+
+    # Engagement Metric Refresh
+    metric_refresh_window_hours: int = 36  # Re-fetch metrics for tweets younger than this
+    metric_refresh_batch_size: int = 100  # Tweet IDs per /twitter/tweets call
 
     # Ranking & Display Configuration
     top_tweets_count: int = 10  # Number of tweets to show in highlights section
@@ -57,6 +57,9 @@ def get_db_context() -> Generator[Session, None, None]:
 def init_db():
     """Initialize database tables."""
     # Import all models here to ensure they are registered with Base
-    from app.models import tweet, processed_tweet, daily_summary, monitored_account
+    from app.models import (
+        tweet, processed_tweet, daily_summary, monitored_account, analysis_batch,
+        analysis_cache, task_checkpoint, engagement_histogram, translation_cache, llm_call
+    )
 
     Base.metadata.create_all(bind=engine)
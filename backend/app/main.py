@@ -9,7 +9,10 @@ import sys
 
 from app.config import settings
 from app.database import init_db
-from app.api.routes import summaries, accounts, scheduler, tasks
+from app.api.routes import summaries, accounts, scheduler, tasks, metrics
+from app.services.twitter_collector import twitter_collector
+from app.services.llm_gateway import llm_gateway
+from app.services.backlog_drain import backlog_drain
 from app.tasks.scheduler import start_scheduler, stop_scheduler
 
 
@@ -39,6 +42,9 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
 
+    # Open the pooled Twitter API client shared by routes and scheduled tasks
+    await twitter_collector.start()
+
     # Start scheduler
     try:
         start_scheduler()
@@ -46,11 +52,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to start scheduler: {e}")
 
+    # Continue a backlog drain interrupted by the last shutdown
+    try:
+        if backlog_drain.resume_interrupted():
+            logger.info("Resumed interrupted backlog drain")
+    except Exception as e:
+        logger.error(f"Failed to resume backlog drain: {e}")
+
     yield
 
     # Shutdown
     logger.info("Shutting down AI News Collector API")
     stop_scheduler()
+    await backlog_drain.stop()
+    await twitter_collector.close()
+    await llm_gateway.close()
 
 
 # Create FastAPI app
@@ -78,6 +94,7 @@ app.include_router(summaries.router)
 app.include_router(accounts.router)
 app.include_router(scheduler.router)
 app.include_router(tasks.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
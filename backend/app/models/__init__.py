@@ -5,6 +5,12 @@ from app.models.monitored_account import MonitoredAccount
 from app.models.tweet import Tweet
 from app.models.processed_tweet import ProcessedTweet
 from app.models.daily_summary import DailySummary, SummaryTweet
+from app.models.analysis_batch import AnalysisBatch
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.task_checkpoint import TaskCheckpoint
+from app.models.engagement_histogram import EngagementHistogramBucket
+from app.models.translation_cache import TranslationCacheEntry
+from app.models.llm_call import LLMCall
 
 __all__ = [
     "MonitoredAccount",
@@ -12,4 +18,10 @@ __all__ = [
     "ProcessedTweet",
     "DailySummary",
     "SummaryTweet",
+    "AnalysisBatch",
+    "AnalysisCacheEntry",
+    "TaskCheckpoint",
+    "EngagementHistogramBucket",
+    "TranslationCacheEntry",
+    "LLMCall",
 ]
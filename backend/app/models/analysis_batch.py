@@ -0,0 +1,40 @@
+"""
+AnalysisBatch model - Anthropic Message Batches submitted for offline tweet analysis.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, Float, BigInteger, JSON
+from datetime import datetime
+
+from app.database import Base
+
+# Batches whose results have not been stored yet; their tweets are claimed
+OPEN_STATUSES = ("submitted", "ended")
+
+
+class AnalysisBatch(Base):
+    """One Message Batch covering many analyze_tweet_batch prompts."""
+
+    __tablename__ = "analysis_batches"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    batch_id = Column(String(100), unique=True, nullable=False, index=True)  # Anthropic message batch ID
+    # submitted -> ended (API finished) -> completed (results stored), or failed
+    status = Column(String(20), default="submitted", nullable=False, index=True)
+
+    requests = Column(JSON, nullable=False)  # custom_id -> Tweet primary keys, in prompt order
+    request_count = Column(Integer, nullable=False)
+    tweet_count = Column(Integer, nullable=False)
+    max_engagement = Column(Float, nullable=False)  # Normalization used when storing results
+
+    # Filled in as the batch is polled and its results stored
+    succeeded_count = Column(Integer, default=0, nullable=False)
+    errored_count = Column(Integer, default=0, nullable=False)  # Errored, expired or canceled requests
+    processed_count = Column(Integer, default=0, nullable=False)
+    error = Column(String(500), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_polled_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<AnalysisBatch(batch_id='{self.batch_id}', status='{self.status}')>"
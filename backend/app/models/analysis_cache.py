@@ -0,0 +1,30 @@
+"""
+AnalysisCacheEntry model - Claude analysis results keyed by normalized tweet text.
+"""
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, Float, BigInteger, Text, JSON
+from datetime import datetime
+
+from app.database import Base
+
+
+class AnalysisCacheEntry(Base):
+    """Cached analysis of a tweet text, reused for duplicate and cross-posted tweets."""
+
+    __tablename__ = "analysis_cache"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)  # sha256 of prompt version + normalized text
+
+    # Analysis result
+    is_ai_related = Column(Boolean, nullable=False)
+    ai_relevance_score = Column(Float, nullable=True)
+    summary = Column(Text, nullable=True)
+    topics = Column(JSON, nullable=True)
+
+    # Usage
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Entries expire by age
+    last_hit_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<AnalysisCacheEntry(content_hash='{self.content_hash[:12]}', hits={self.hits})>"
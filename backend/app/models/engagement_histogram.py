@@ -0,0 +1,23 @@
+"""
+EngagementHistogramBucket model - Daily engagement score histogram for importance normalization.
+"""
+from sqlalchemy import Column, Date, Integer, BigInteger, UniqueConstraint
+
+from app.database import Base
+
+
+class EngagementHistogramBucket(Base):
+    """Number of tweets created on a day whose engagement score falls in a log-scale bucket."""
+
+    __tablename__ = "engagement_histogram"
+    __table_args__ = (
+        UniqueConstraint("day", "bucket", name="uq_engagement_histogram_day_bucket"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False, index=True)  # Tweet creation date (UTC)
+    bucket = Column(Integer, nullable=False)  # See engagement_normalizer.bucket_for
+    tweet_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<EngagementHistogramBucket(day={self.day}, bucket={self.bucket}, tweet_count={self.tweet_count})>"
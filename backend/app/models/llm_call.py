@@ -0,0 +1,32 @@
+"""
+LLMCall model - One row per Claude call, for token, latency and cost telemetry.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger
+from datetime import datetime
+
+from app.database import Base
+
+
+class LLMCall(Base):
+    """Tokens, latency and retries of a Claude call, by pipeline stage."""
+
+    __tablename__ = "llm_calls"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    stage = Column(String(32), nullable=False, index=True)  # Gateway call site (analysis, report, ...)
+    model = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="ok")  # ok, error
+
+    # Usage as reported by the API
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    cache_creation_input_tokens = Column(Integer, default=0, nullable=False)
+    cache_read_input_tokens = Column(Integer, default=0, nullable=False)
+
+    latency_ms = Column(Integer, nullable=True)  # Including rate-limit waits and retries; None for Message Batches
+    retries = Column(Integer, default=0, nullable=False)
+    error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<LLMCall(stage='{self.stage}', model='{self.model}', status='{self.status}')>"
@@ -1,7 +1,7 @@
 """
 MonitoredAccount model - Twitter accounts to monitor for AI news.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, BigInteger
+from sqlalchemy import Column, String, Boolean, DateTime, BigInteger, Integer, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -19,6 +19,25 @@ class MonitoredAccount(Base):
     display_name = Column(String(200), nullable=True)  # Display name
     is_active = Column(Boolean, default=True, nullable=False, index=True)
     last_tweet_id = Column(String(50), nullable=True)  # Last collected tweet ID
+
+    # Adaptive polling
+    posting_rate = Column(Float, nullable=True)  # Smoothed new tweets per hour
+    poll_yield = Column(Float, nullable=True)  # Smoothed new tweets per poll
+    poll_interval_minutes = Column(Integer, nullable=True)  # Current polling interval
+    last_polled_at = Column(DateTime, nullable=True)
+    next_poll_at = Column(DateTime, nullable=True, index=True)  # Next time the account is due
+
+    # Circuit breaker
+    consecutive_failures = Column(Integer, default=0, server_default="0", nullable=False)
+    breaker_open_until = Column(DateTime, nullable=True, index=True)  # Skipped until this time
+    last_failure_reason = Column(String(500), nullable=True)
+    last_failure_at = Column(DateTime, nullable=True)
+    deactivated_at = Column(DateTime, nullable=True)  # Set when the breaker deactivated the account
+
+    # Collection worker lease
+    lease_owner = Column(String(100), nullable=True)  # Worker currently collecting the account
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -27,6 +27,7 @@ class ProcessedTweet(Base):
     screenshot_generated_at = Column(DateTime, nullable=True)
 
     # Importance scoring
+    ai_relevance_score = Column(Float, nullable=True)  # Claude's 0-10 relevance, kept for re-scoring
     importance_score = Column(Float, default=0.0, nullable=False, index=True)  # Combined engagement + AI relevance
 
     # Processing metadata
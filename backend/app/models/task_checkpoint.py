@@ -0,0 +1,36 @@
+"""
+TaskCheckpoint model - Progress of long-running tasks that resume after a restart.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, Float, BigInteger
+from datetime import datetime
+
+from app.database import Base
+
+
+class TaskCheckpoint(Base):
+    """Keyset cursor and counters of a resumable task (one row per task name)."""
+
+    __tablename__ = "task_checkpoints"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    # running (resumes after a restart) -> completed, or failed
+    status = Column(String(20), default="running", nullable=False)
+
+    # Last (created_at, id) handled; the next chunk starts after it
+    cursor_created_at = Column(DateTime, nullable=True)
+    cursor_id = Column(BigInteger, nullable=True)
+    max_engagement = Column(Float, nullable=True)  # Normalization fixed for the whole run
+
+    chunk_count = Column(Integer, default=0, nullable=False)
+    processed_count = Column(Integer, default=0, nullable=False)
+    ai_related_count = Column(Integer, default=0, nullable=False)
+    skipped_count = Column(Integer, default=0, nullable=False)  # Passed without a result, left unprocessed
+    error = Column(String(500), nullable=True)
+
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<TaskCheckpoint(name='{self.name}', status='{self.status}')>"
@@ -0,0 +1,25 @@
+"""
+TranslationCacheEntry model - Claude translations keyed by tweet text.
+"""
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Text
+from datetime import datetime
+
+from app.database import Base
+
+
+class TranslationCacheEntry(Base):
+    """Cached translation of a tweet text, reused for re-runs and repeated texts."""
+
+    __tablename__ = "translation_cache"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    content_hash = Column(String(64), unique=True, nullable=False, index=True)  # sha256 of prompt version + text
+    translation = Column(Text, nullable=False)
+
+    # Usage
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  # Entries expire by age
+    last_hit_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<TranslationCacheEntry(content_hash='{self.content_hash[:12]}', hits={self.hits})>"
@@ -1,17 +1,23 @@
 """
 Tweet model - Raw tweets collected from Twitter.
 """
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float, BigInteger, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, Float, BigInteger, ForeignKey, JSON, LargeBinary, Index
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
+from typing import Dict
 
 from app.database import Base
+from app.utils.compression import decompress_json
 
 
 class Tweet(Base):
     """Raw tweets collected from monitored accounts."""
 
     __tablename__ = "tweets"
+    __table_args__ = (
+        # Keyset pagination over the unprocessed backlog (see backlog_drain)
+        Index("ix_tweets_processed_created_at_id", "processed", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     tweet_id = Column(String(50), unique=True, nullable=False, index=True)  # Twitter tweet ID
@@ -19,7 +25,9 @@ class Tweet(Base):
     text = Column(Text, nullable=False)
     created_at = Column(DateTime, nullable=False, index=True)  # Tweet creation time
     tweet_url = Column(String(500), nullable=False)
-    tweet_metadata = Column(JSON, nullable=True)  # Additional tweet metadata
+    tweet_metadata = Column(JSON, nullable=True)  # Allow-listed tweet metadata
+    # Rest of the raw payload, compressed; only loaded when accessed
+    raw_metadata = deferred(Column(LargeBinary, nullable=True))
 
     # Engagement metrics
     like_count = Column(Integer, default=0, nullable=False)
@@ -31,10 +39,28 @@ class Tweet(Base):
     # Collection metadata
     collected_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed = Column(Boolean, default=False, nullable=False, index=True)
+    # Message Batch the tweet was last submitted in; claimed while that batch is open
+    analysis_batch_id = Column(BigInteger, ForeignKey("analysis_batches.id"), nullable=True, index=True)
 
     # Relationships
     account = relationship("MonitoredAccount", back_populates="tweets")
     processed_tweet = relationship("ProcessedTweet", back_populates="tweet", uselist=False, cascade="all, delete-orphan")
 
+    def full_metadata(self) -> Dict:
+        """
+        Allow-listed metadata merged with the compressed remainder.
+
+        Accessing raw_metadata issues one extra query unless it was loaded
+        with ``undefer(Tweet.raw_metadata)``.
+        """
+        metadata = dict(self.tweet_metadata or {})
+        if self.raw_metadata:
+            for key, value in decompress_json(self.raw_metadata).items():
+                if isinstance(value, dict) and isinstance(metadata.get(key), dict):
+                    metadata[key] = {**value, **metadata[key]}
+                else:
+                    metadata.setdefault(key, value)
+        return metadata
+
     def __repr__(self):
         return f"<Tweet(tweet_id='{self.tweet_id}', engagement_score={self.engagement_score})>"
@@ -0,0 +1,159 @@
+"""
+Account circuit breaker - Stop polling accounts that keep failing.
+Consecutive failures (or an unavailable account) open the breaker for an
+exponentially growing cool-down; accounts that stay dead are deactivated.
+"""
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+
+
+class AccountCircuitBreaker:
+    """Per-account breaker state persisted on MonitoredAccount."""
+
+    def compute_cooldown(self, consecutive_failures: int) -> int:
+        """
+        Compute how long an account's breaker stays open.
+
+        Args:
+            consecutive_failures: Failures in a row including the latest one
+
+        Returns:
+            Cool-down in minutes (0 while under the failure threshold)
+        """
+        threshold = settings.account_breaker_failure_threshold
+        if consecutive_failures < threshold:
+            return 0
+
+        minutes = settings.account_breaker_base_cooldown_minutes * 2 ** (consecutive_failures - threshold)
+        return int(min(minutes, settings.account_breaker_max_cooldown_minutes))
+
+    def record_success(self, account: MonitoredAccount):
+        """
+        Close the breaker after a successful poll.
+
+        Args:
+            account: MonitoredAccount that was just polled
+        """
+        if account.consecutive_failures or account.breaker_open_until:
+            logger.info(f"@{account.username}: breaker closed after {account.consecutive_failures} failures")
+        account.consecutive_failures = 0
+        account.breaker_open_until = None
+
+    def reset(self, account: MonitoredAccount):
+        """
+        Clear breaker state, e.g. when an account is manually reactivated.
+
+        Args:
+            account: MonitoredAccount to reset
+        """
+        account.consecutive_failures = 0
+        account.breaker_open_until = None
+        account.deactivated_at = None
+
+    def record_failure(
+        self,
+        account: MonitoredAccount,
+        reason: str,
+        unavailable: bool = False,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """
+        Record a failed poll, opening the breaker or deactivating the account.
+
+        Args:
+            account: MonitoredAccount whose poll failed
+            reason: Short failure description
+            unavailable: The API reported the account suspended/unavailable,
+                which opens the breaker immediately
+            now: Failure time (defaults to utcnow)
+
+        Returns:
+            True if the account was deactivated
+        """
+        now = now or datetime.utcnow()
+        failures = (account.consecutive_failures or 0) + 1
+        if unavailable:
+            failures = max(failures, settings.account_breaker_failure_threshold)
+
+        account.consecutive_failures = failures
+        account.last_failure_reason = reason[:500]
+        account.last_failure_at = now
+
+        if failures >= settings.account_breaker_deactivate_after:
+            account.is_active = False
+            account.breaker_open_until = None
+            account.deactivated_at = now
+            logger.warning(
+                f"@{account.username}: deactivated after {failures} consecutive failures "
+                f"(last: {account.last_failure_reason})"
+            )
+            return True
+
+        cooldown = self.compute_cooldown(failures)
+        if cooldown:
+            account.breaker_open_until = now + timedelta(minutes=cooldown)
+            logger.warning(f"@{account.username}: breaker open for {cooldown} min after {failures} failures ({reason})")
+        return False
+
+    def closed_filter(self, now: Optional[datetime] = None):
+        """
+        SQL filter matching accounts whose breaker is closed or has cooled down.
+
+        Args:
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            SQLAlchemy boolean clause
+        """
+        now = now or datetime.utcnow()
+        return or_(
+            MonitoredAccount.breaker_open_until.is_(None),
+            MonitoredAccount.breaker_open_until <= now
+        )
+
+    def get_breaker_status(self, db: Session) -> Dict:
+        """
+        Get failing, open and auto-deactivated accounts.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with open breakers and deactivated accounts
+        """
+        now = datetime.utcnow()
+        failing = db.query(MonitoredAccount).filter(
+            MonitoredAccount.consecutive_failures > 0
+        ).order_by(MonitoredAccount.consecutive_failures.desc()).all()
+
+        def describe(account: MonitoredAccount) -> Dict:
+            return {
+                "username": account.username,
+                "consecutive_failures": account.consecutive_failures,
+                "last_failure_reason": account.last_failure_reason,
+                "last_failure_at": account.last_failure_at.isoformat() if account.last_failure_at else None,
+                "breaker_open_until": account.breaker_open_until.isoformat() if account.breaker_open_until else None,
+                "deactivated_at": account.deactivated_at.isoformat() if account.deactivated_at else None,
+            }
+
+        open_accounts: List[Dict] = [
+            describe(a) for a in failing
+            if a.is_active and a.breaker_open_until and a.breaker_open_until > now
+        ]
+        deactivated: List[Dict] = [describe(a) for a in failing if not a.is_active and a.deactivated_at]
+
+        return {
+            "open": open_accounts,
+            "failing": sum(1 for a in failing if a.is_active),
+            "deactivated": deactivated,
+        }
+
+
+# Global breaker instance
+account_breaker = AccountCircuitBreaker()
@@ -0,0 +1,169 @@
+"""
+Account leases - Hand out due accounts to collection workers.
+Each worker leases a batch of due accounts by stamping lease_owner and
+lease_expires_at; rows locked by another worker are skipped, and a lease that
+was never released (crashed worker) simply expires and becomes leasable again.
+"""
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import select, update, or_, case, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+from app.services.account_breaker import account_breaker
+from app.services.polling_policy import polling_policy
+
+
+class AccountLeaseManager:
+    """Lease due monitored accounts to collection workers."""
+
+    def free_filter(self, now: Optional[datetime] = None):
+        """
+        SQL filter matching accounts no live lease is held on.
+
+        Args:
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            SQLAlchemy boolean clause
+        """
+        now = now or datetime.utcnow()
+        return or_(
+            MonitoredAccount.lease_expires_at.is_(None),
+            MonitoredAccount.lease_expires_at <= now
+        )
+
+    def lease_batch(
+        self,
+        db: Session,
+        worker_id: str,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> List[MonitoredAccount]:
+        """
+        Lease up to batch_size due accounts to a worker.
+
+        A single ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)``
+        claims the rows, so concurrent workers never lease the same account.
+        On PostgreSQL rows another worker is claiming are skipped rather than
+        waited on; SQLite ignores the locking clause and serializes the
+        statement on its database write lock instead.
+
+        Args:
+            db: Database session (committed before returning)
+            worker_id: Identifier stored in lease_owner
+            batch_size: Max accounts to lease (defaults to settings.worker_lease_batch_size)
+            lease_seconds: Lease duration (defaults to settings.worker_lease_seconds)
+            now: Lease time (defaults to utcnow)
+
+        Returns:
+            The leased accounts (empty when nothing is due)
+        """
+        batch_size = batch_size or settings.worker_lease_batch_size
+        lease_seconds = lease_seconds or settings.worker_lease_seconds
+        now = now or datetime.utcnow()
+
+        candidates = (
+            select(MonitoredAccount.id)
+            .where(
+                MonitoredAccount.is_active == True,
+                account_breaker.closed_filter(now),
+                polling_policy.due_filter(now),
+                self.free_filter(now)
+            )
+            .order_by(MonitoredAccount.next_poll_at.asc().nulls_first(), MonitoredAccount.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = db.execute(
+            update(MonitoredAccount)
+            .where(MonitoredAccount.id.in_(candidates), self.free_filter(now))
+            .values(lease_owner=worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            .returning(MonitoredAccount.id)
+            .execution_options(synchronize_session=False)
+        )
+        account_ids = [account_id for (account_id,) in result]
+        db.commit()
+
+        if not account_ids:
+            return []
+
+        logger.debug(f"Worker {worker_id} leased {len(account_ids)} accounts")
+        return db.query(MonitoredAccount).filter(MonitoredAccount.id.in_(account_ids)).all()
+
+    def release(
+        self,
+        db: Session,
+        account_ids: List[int],
+        worker_id: str,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Release a worker's leases once its batch has been collected.
+
+        Accounts that are still due (their poll failed, so next_poll_at was not
+        advanced) are deferred by settings.worker_retry_minutes, so they are
+        not leased again within the same cycle. Leases that already expired
+        and moved to another worker are left alone.
+
+        Args:
+            db: Database session (committed before returning)
+            account_ids: Accounts leased by the worker
+            worker_id: Identifier the accounts were leased to
+            now: Release time (defaults to utcnow)
+
+        Returns:
+            Number of leases released
+        """
+        if not account_ids:
+            return 0
+        now = now or datetime.utcnow()
+
+        result = db.execute(
+            update(MonitoredAccount)
+            .where(MonitoredAccount.id.in_(account_ids), MonitoredAccount.lease_owner == worker_id)
+            .values(
+                lease_owner=None,
+                lease_expires_at=None,
+                next_poll_at=case(
+                    (polling_policy.due_filter(now), now + timedelta(minutes=settings.worker_retry_minutes)),
+                    else_=MonitoredAccount.next_poll_at
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def get_lease_status(self, db: Session) -> Dict:
+        """
+        Get lease counters for the status endpoint.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with live and expired lease counts and per-worker leases
+        """
+        now = datetime.utcnow()
+        held = db.query(MonitoredAccount).filter(MonitoredAccount.lease_owner.isnot(None))
+
+        by_worker = dict(
+            held.filter(MonitoredAccount.lease_expires_at > now)
+            .with_entities(MonitoredAccount.lease_owner, func.count(MonitoredAccount.id))
+            .group_by(MonitoredAccount.lease_owner)
+            .all()
+        )
+        return {
+            "enabled": settings.collection_workers_enabled,
+            "leased_accounts": sum(by_worker.values()),
+            "expired_leases": held.filter(MonitoredAccount.lease_expires_at <= now).count(),
+            "workers": by_worker,
+        }
+
+
+# Global lease manager instance
+account_lease_manager = AccountLeaseManager()
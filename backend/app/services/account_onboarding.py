@@ -0,0 +1,179 @@
+"""
+Account onboarding service - Add monitored accounts in bulk.
+Resolves usernames concurrently (cached), checks existence with one
+set-based query and inserts new accounts in a single statement. Large
+imports run as background jobs with pollable progress.
+"""
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Optional
+from datetime import datetime
+from loguru import logger
+from sqlalchemy import insert, or_, func
+from sqlalchemy.orm import Session
+
+from app.database import get_db_context
+from app.models.monitored_account import MonitoredAccount
+from app.services.twitter_collector import TwitterCollector, twitter_collector
+
+# Finished jobs kept in memory for status polling
+MAX_TRACKED_JOBS = 50
+
+
+class AccountOnboarding:
+    """Service to add many monitored accounts at once."""
+
+    def __init__(self, collector: Optional[TwitterCollector] = None):
+        self.collector = collector or twitter_collector
+        self.jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+    async def onboard(
+        self,
+        db: Session,
+        accounts: List[Dict],
+        job: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Add accounts, resolving missing user IDs from their usernames.
+
+        Args:
+            db: Database session
+            accounts: Dicts with username and optional user_id, display_name, is_active
+            job: Job record whose progress counters are updated in place
+
+        Returns:
+            Dictionary with added/skipped/error counts and details
+        """
+        added: List[str] = []
+        skipped: List[Dict] = []
+        errors: List[Dict] = []
+
+        # Normalize handles and drop duplicates within the request
+        candidates: Dict[str, Dict] = {}
+        for account in accounts:
+            username = account["username"].strip().lstrip("@")
+            key = username.lower()
+            if key in candidates:
+                skipped.append({"username": username, "reason": "Duplicate in request"})
+                continue
+            candidates[key] = {**account, "username": username}
+
+        # Resolve missing user IDs concurrently
+        to_resolve = [a["username"] for a in candidates.values() if not a.get("user_id")]
+
+        def on_resolved(username: str, user_info: Optional[Dict]):
+            if job is not None:
+                job["resolved"] += 1
+
+        resolved = await self.collector.resolve_usernames(to_resolve, on_resolved=on_resolved)
+
+        for key, account in list(candidates.items()):
+            if account.get("user_id"):
+                continue
+            user_info = resolved.get(account["username"])
+            if not user_info or not user_info.get("user_id"):
+                errors.append({"username": account["username"], "error": "Twitter user not found"})
+                del candidates[key]
+                continue
+            account["user_id"] = str(user_info["user_id"])
+            # Also fill display_name if not provided
+            if not account.get("display_name"):
+                account["display_name"] = user_info.get("display_name")
+
+        # One set-based existence check for the whole batch
+        existing_ids, existing_names = set(), set()
+        if candidates:
+            for user_id, username in db.query(MonitoredAccount.user_id, MonitoredAccount.username).filter(
+                or_(
+                    MonitoredAccount.user_id.in_([a["user_id"] for a in candidates.values()]),
+                    func.lower(MonitoredAccount.username).in_(list(candidates))
+                )
+            ):
+                existing_ids.add(user_id)
+                existing_names.add(username.lower())
+
+        rows = []
+        seen_ids = set()
+        for key, account in candidates.items():
+            if key in existing_names or account["user_id"] in existing_ids or account["user_id"] in seen_ids:
+                skipped.append({"username": account["username"], "reason": "Already exists"})
+                continue
+            seen_ids.add(account["user_id"])
+            rows.append({
+                "user_id": account["user_id"],
+                "username": account["username"],
+                "display_name": account.get("display_name"),
+                "is_active": account.get("is_active", True),
+            })
+            added.append(account["username"])
+
+        if rows:
+            db.execute(insert(MonitoredAccount), rows)
+        db.commit()
+
+        logger.info(f"Onboarded {len(added)} accounts ({len(skipped)} skipped, {len(errors)} errors)")
+        return {
+            "added": len(added),
+            "skipped": len(skipped),
+            "errors": len(errors),
+            "details": {
+                "added": added,
+                "skipped": skipped,
+                "errors": errors
+            }
+        }
+
+    def create_job(self, accounts: List[Dict]) -> Dict:
+        """
+        Register a background onboarding job.
+
+        Args:
+            accounts: Accounts to add
+
+        Returns:
+            The job record
+        """
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "pending",
+            "total": len(accounts),
+            "to_resolve": sum(1 for a in accounts if not a.get("user_id")),
+            "resolved": 0,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        self.jobs[job["job_id"]] = job
+        while len(self.jobs) > MAX_TRACKED_JOBS:
+            self.jobs.popitem(last=False)
+        return job
+
+    async def run_job(self, job_id: str, accounts: List[Dict]):
+        """
+        Run a registered job with its own database session.
+
+        Args:
+            job_id: ID returned by create_job
+            accounts: Accounts to add
+        """
+        job = self.jobs[job_id]
+        job["status"] = "running"
+        try:
+            with get_db_context() as db:
+                job["result"] = await self.onboard(db, accounts, job=job)
+            job["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Onboarding job {job_id} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.utcnow().isoformat()
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a job record by ID."""
+        return self.jobs.get(job_id)
+
+
+# Global onboarding instance
+account_onboarding = AccountOnboarding()
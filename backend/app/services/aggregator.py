@@ -7,25 +7,24 @@ from datetime import datetime, date, timedelta
 from loguru import logger
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-import anthropic
 
 from app.config import settings
 from app.models.processed_tweet import ProcessedTweet
 from app.models.daily_summary import DailySummary, SummaryTweet, DisplayType
 from app.services.ai_analyzer import ai_analyzer
+from app.services.llm_gateway import LLMGateway, llm_gateway
 from app.services.screenshot_service import screenshot_service
 
 
 class AggregatorService:
     """Service to create daily summaries of AI news."""
 
-    def __init__(self):
-        # Create Anthropic client with optional base_url for proxy/relay
-        client_kwargs = {"api_key": settings.anthropic_api_key}
-        if settings.anthropic_base_url:
-            client_kwargs["base_url"] = settings.anthropic_base_url
-
-        self.client = anthropic.Anthropic(**client_kwargs)
+    def __init__(self, gateway: Optional[LLMGateway] = None):
+        """
+        Args:
+            gateway: LLM gateway (defaults to the shared pooled one)
+        """
+        self.gateway = gateway or llm_gateway
 
     def generate_url_slug(self, summary_date: date) -> str:
         """
@@ -140,13 +139,7 @@ class AggregatorService:
 5. 不要在开头添加整体摘要段落"""
 
         try:
-            message = self.client.messages.create(
-                model=settings.claude_model,
-                max_tokens=1500,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            summary = message.content[0].text.strip()
+            summary = await self.gateway.complete("summary", prompt)
             logger.info("Generated highlights summary with Claude API")
             return summary
 
@@ -2,43 +2,142 @@
 AI analyzer service - Analyze tweets using Claude API.
 Identifies AI-related content, generates summaries, translations, and calculates importance scores.
 """
+import asyncio
+import json
 import anthropic
-from typing import List, Dict, Optional, Tuple
+from contextlib import contextmanager
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime
 from loguru import logger
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from app.config import settings
+from app.models.analysis_batch import AnalysisBatch, OPEN_STATUSES
 from app.models.tweet import Tweet
 from app.models.processed_tweet import ProcessedTweet
+from app.services.analysis_cache import AnalysisCache, analysis_cache
+from app.services.batch_packer import BatchPacker, batch_packer
+from app.services.engagement_normalizer import EngagementNormalizer, engagement_normalizer
+from app.services.llm_gateway import LLMGateway, llm_gateway
+from app.services.translation_cache import TranslationCache, translation_cache as shared_translation_cache
+from app.utils.json_salvage import salvage_json_array
+
+# Bump whenever the analysis prompt changes, so cached results are not reused
+ANALYSIS_PROMPT_VERSION = "2"
+
+# Tool Claude is made to call with the analysis, so the reply follows a schema
+ANALYSIS_TOOL = {
+    "name": "record_tweet_analysis",
+    "description": "Record the analysis of every tweet in the request.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tweet_id": {"type": "string", "description": "ID given in the tweet header"},
+                        "is_ai_related": {"type": "boolean"},
+                        "ai_relevance_score": {"type": "number", "minimum": 0, "maximum": 10},
+                        "summary": {"type": "string"},
+                        "topics": {"type": "array", "items": {"type": "string"}},
+                    },
+                    "required": ["tweet_id", "is_ai_related", "ai_relevance_score"],
+                },
+            },
+        },
+        "required": ["results"],
+    },
+}
+
+# Bump whenever the translation prompt changes
+TRANSLATION_PROMPT_VERSION = "1"
+
+# Tool Claude is made to call with the translations of a batch of tweets
+TRANSLATION_TOOL = {
+    "name": "record_translations",
+    "description": "Record the translation of every tweet in the request.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tweet_id": {"type": "string", "description": "ID given in the tweet header"},
+                        "translation": {"type": "string"},
+                    },
+                    "required": ["tweet_id", "translation"],
+                },
+            },
+        },
+        "required": ["results"],
+    },
+}
 
 
 class AIAnalyzer:
     """Service to analyze tweets using Claude API."""
 
-    def __init__(self):
-        # Create Anthropic client with optional base_url for proxy/relay
-        client_kwargs = {"api_key": settings.anthropic_api_key}
-        if settings.anthropic_base_url:
-            client_kwargs["base_url"] = settings.anthropic_base_url
-
-        self.client = anthropic.Anthropic(**client_kwargs)
-        self.model = settings.claude_model
-        self.max_tokens = settings.claude_max_tokens
-
-    async def analyze_tweet_batch(self, tweets: List[Tweet]) -> List[Dict]:
+    def __init__(
+        self,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        cache: Optional[AnalysisCache] = None,
+        packer: Optional[BatchPacker] = None,
+        normalizer: Optional[EngagementNormalizer] = None,
+        translation_cache: Optional[TranslationCache] = None,
+        gateway: Optional[LLMGateway] = None
+    ):
         """
-        Analyze a batch of tweets for AI relevance and generate summaries.
+        Args:
+            client: Async Anthropic client (wrapped in a gateway of its own,
+                e.g. a fake API in tests)
+            cache: Analysis cache for duplicate texts (defaults to the global instance)
+            packer: Token-budgeted batch packer (defaults to the global instance)
+            normalizer: Rolling engagement percentiles for importance scores
+                (defaults to the global instance)
+            translation_cache: Translation cache for repeated texts
+                (defaults to the global instance)
+            gateway: LLM gateway (defaults to the shared pooled one)
+        """
+        if gateway is None:
+            gateway = LLMGateway(client) if client is not None else llm_gateway
+        self.gateway = gateway
+
+        profile = gateway.profile("analysis")
+        self.model = profile["model"]
+        self.max_tokens = profile["max_tokens"]
+        self.max_concurrency = settings.claude_max_concurrency
+        self.cache = cache or analysis_cache
+        self.packer = packer or batch_packer
+        self.structured_output = settings.analyzer_structured_output
+        self.normalizer = normalizer or engagement_normalizer
+        self.translation_cache = translation_cache or shared_translation_cache
+        # Primary keys of tweets an analysis run of this process is working on
+        self._in_flight: Set[int] = set()
+
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Anthropic client of the analyzer's gateway."""
+        return self.gateway.client
+
+    async def close(self):
+        """Close the gateway's HTTP connections."""
+        await self.gateway.close()
+
+    def build_analysis_request(self, tweets: List[Tweet]) -> Dict:
+        """
+        Build the Messages API parameters for analyzing a batch of tweets.
 
         Args:
             tweets: List of Tweet objects to analyze
 
         Returns:
-            List of analysis results
+            Keyword arguments for messages.create (also used as Message Batch params)
         """
-        if not tweets:
-            return []
-
         # Prepare batch prompt
         tweets_text = "\n\n".join([
             f"Tweet {i+1} (ID: {tweet.tweet_id}):\n{tweet.text}"
@@ -55,43 +154,297 @@ For each tweet, provide:
 Tweets:
 {tweets_text}
 
-Respond in JSON format as an array of objects, one per tweet in order:
+"""
+
+        if self.structured_output:
+            prompt += f"Record one result per tweet with the {ANALYSIS_TOOL['name']} tool, using the tweet IDs above."
+            return {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "messages": [{"role": "user", "content": prompt}],
+                "tools": [ANALYSIS_TOOL],
+                "tool_choice": {"type": "tool", "name": ANALYSIS_TOOL["name"]},
+            }
+
+        prompt += """Respond in JSON format as an array of objects, one per tweet in order:
 [
-  {{
+  {
     "tweet_id": "123...",
     "is_ai_related": true,
     "ai_relevance_score": 8,
     "summary": "OpenAI announces GPT-5 with significant performance improvements...",
     "topics": ["GPT", "OpenAI", "LLM"]
-  }},
+  },
   ...
 ]"""
 
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}]
-            )
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
 
-            # Parse response
-            response_text = message.content[0].text
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
+    def parse_analysis_response(self, response_text: str) -> List[Dict]:
+        """
+        Parse Claude's analysis reply into per-tweet results.
+
+        Args:
+            response_text: Text content of the reply
+
+        Returns:
+            List of analysis results (every complete element of a truncated
+            or malformed array)
+
+        Raises:
+            ValueError: If no result can be recovered
+        """
+        # Extract JSON from response (handle markdown code blocks)
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
 
-            import json
+        try:
             results = json.loads(response_text)
+            if isinstance(results, list):
+                return results
+        except ValueError:
+            pass
+
+        results = salvage_json_array(response_text)
+        if not results:
+            raise ValueError("no analysis results in Claude's reply")
+        return results
+
+    def parse_analysis_message(self, message, raw_input: Optional[str] = None) -> List[Dict]:
+        """
+        Extract the analysis results from a Claude message.
+
+        Args:
+            message: Messages API response (tool use or text reply)
+            raw_input: Streamed tool input JSON; when the reply was truncated,
+                its complete elements are used instead of the SDK's partial parse
+
+        Returns:
+            List of analysis results (possibly incomplete)
 
-            logger.info(f"Analyzed {len(results)} tweets with Claude API")
+        Raises:
+            ValueError: If a text reply contains no result
+        """
+        results = self._tool_results(message, ANALYSIS_TOOL["name"], raw_input)
+        if results is not None:
             return results
+        for block in message.content:
+            if block.type == "text":
+                return self.parse_analysis_response(block.text)
+        raise ValueError("no analysis results in Claude's reply")
+
+    @staticmethod
+    def _tool_results(message, tool_name: str, raw_input: Optional[str] = None) -> Optional[List[Dict]]:
+        """
+        The "results" array of a tool call, salvaging complete elements of a truncated call.
+
+        Returns:
+            The results, or None if the message has no call to the tool
+        """
+        for block in message.content:
+            if block.type == "tool_use" and block.name == tool_name:
+                if raw_input is not None and message.stop_reason == "max_tokens":
+                    return salvage_json_array(raw_input, key="results")
+                results = block.input.get("results") if isinstance(block.input, dict) else None
+                return results if isinstance(results, list) else []
+        return None
+
+    def match_results(self, tweets: List[Tweet], results: List[Dict]) -> Dict[str, Dict]:
+        """
+        Pair analysis results with tweets by tweet_id rather than position.
+
+        Results without a known tweet_id or an is_ai_related field are
+        dropped; the first result for a tweet wins.
 
+        Args:
+            tweets: Tweets that were analyzed
+            results: Parsed analysis results, in any order
+
+        Returns:
+            Mapping of tweet_id to result for every tweet that got one
+        """
+        wanted = {tweet.tweet_id for tweet in tweets}
+        matched: Dict[str, Dict] = {}
+        for result in results:
+            if not isinstance(result, dict) or "is_ai_related" not in result:
+                continue
+            tweet_id = str(result.get("tweet_id"))
+            if tweet_id in wanted and tweet_id not in matched:
+                matched[tweet_id] = result
+        return matched
+
+    def cached_results(self, tweets: List[Tweet]) -> Tuple[List[str], Dict[str, Dict]]:
+        """
+        Look up cached analysis results for a batch of tweets.
+
+        Cache failures are logged and treated as misses.
+
+        Args:
+            tweets: Tweets to look up
+
+        Returns:
+            Tuple of (cache key per tweet, results for the keys that hit)
+        """
+        keys = [self.cache.key(tweet.text, ANALYSIS_PROMPT_VERSION) for tweet in tweets]
+        try:
+            return keys, self.cache.lookup([(key, tweet.text) for key, tweet in zip(keys, tweets)])
+        except Exception as e:
+            logger.warning(f"Analysis cache lookup failed: {e}")
+            return keys, {}
+
+    def cache_results(self, keys: List[str], results: List[Dict]):
+        """
+        Save fresh results for later duplicates (failures are logged and ignored).
+
+        Args:
+            keys: Cache key per analyzed tweet
+            results: Analysis result per analyzed tweet
+        """
+        try:
+            self.cache.store(zip(keys, results))
         except Exception as e:
-            logger.error(f"Error analyzing tweets with Claude: {e}")
+            logger.warning(f"Analysis cache store failed: {e}")
+
+    async def analyze_tweet_batch(self, tweets: List[Tweet]) -> List[Dict]:
+        """
+        Analyze a batch of tweets for AI relevance and generate summaries.
+
+        Tweets whose normalized text was analyzed before (or repeats earlier
+        in the batch) reuse that result; only the rest are sent to Claude.
+
+        Args:
+            tweets: List of Tweet objects to analyze
+
+        Returns:
+            List of analysis results with tweet_id, in order, for the tweets
+            that got one (the others stay unprocessed for the next run)
+        """
+        if not tweets:
             return []
 
+        keys, cached = self.cached_results(tweets)
+
+        # One prompt entry per distinct uncached text
+        to_send: Dict[str, Tweet] = {}
+        duplicates: List[Tuple[str, Tweet]] = []
+        for key, tweet in zip(keys, tweets):
+            if key in cached:
+                continue
+            if key in to_send:
+                duplicates.append((key, tweet))
+                continue
+            to_send[key] = tweet
+
+        fresh: Dict[str, Dict] = {}
+        if to_send:
+            try:
+                by_id = await self._request_analysis(list(to_send.values()))
+            except Exception as e:
+                logger.error(f"Error analyzing tweets with Claude: {e}")
+                by_id = {}
+
+            fresh = {key: by_id[tweet.tweet_id] for key, tweet in to_send.items() if tweet.tweet_id in by_id}
+            self.cache_results(list(fresh), list(fresh.values()))
+            for key, tweet in duplicates:
+                if key in fresh:
+                    self.cache.record_hit(tweet.text, fresh[key])
+            logger.info(f"Analyzed {len(fresh)} tweets with Claude API")
+
+        if len(to_send) < len(tweets):
+            logger.info(f"Reused cached analysis for {len(tweets) - len(to_send)} of {len(tweets)} tweets")
+
+        results = []
+        for key, tweet in zip(keys, tweets):
+            result = cached.get(key) or fresh.get(key)
+            if result is not None:
+                results.append({**result, "tweet_id": tweet.tweet_id})
+        if len(results) < len(tweets):
+            logger.warning(f"{len(tweets) - len(results)} of {len(tweets)} tweets got no analysis result")
+        return results
+
+    async def _stream_request(self, params: Dict, site: str = "analysis") -> Tuple[object, Optional[str]]:
+        """
+        Stream one Claude call through the gateway, keeping the raw tool input JSON.
+
+        Args:
+            params: Messages API parameters
+            site: Gateway call site (sets the rate-limiter priority)
+
+        Returns:
+            Tuple of (final message, raw tool input JSON or None for a text reply)
+        """
+        return await self.gateway.stream(site, params)
+
+    async def _request_analysis(self, tweets: List[Tweet]) -> Dict[str, Dict]:
+        """
+        Send tweets to Claude and re-request only the tweets left without a result.
+
+        Every complete result of a truncated or malformed reply is kept and
+        matched by tweet_id; the missing tweets are sent again (recursively,
+        so each round makes progress). A truncated reply without a single
+        complete result is retried as two halves.
+
+        Args:
+            tweets: Tweets to analyze (no cache lookups)
+
+        Returns:
+            Mapping of tweet_id to analysis result
+
+        Raises:
+            ValueError: If a single tweet does not fit, or the reply has no
+                usable result
+            anthropic.APIError: If the API call fails
+        """
+        message, raw_input = await self._stream_request(self.build_analysis_request(tweets))
+        truncated = message.stop_reason == "max_tokens"
+        try:
+            results = self.parse_analysis_message(message, raw_input)
+        except ValueError:
+            results = []
+        matched = self.match_results(tweets, results)
+        self.packer.record_call(len(matched), message.usage, truncated)
+
+        missing = [tweet for tweet in tweets if tweet.tweet_id not in matched]
+        if not missing:
+            return matched
+
+        if matched:
+            self.packer.record_requeue(len(missing))
+            logger.warning(
+                f"Analysis reply {'hit max_tokens' if truncated else 'was incomplete'}: "
+                f"kept {len(matched)} results, re-requesting {len(missing)} tweets"
+            )
+            matched.update(await self._request_remaining(missing))
+            return matched
+
+        if not truncated:
+            raise ValueError(f"Claude returned no usable results for {len(tweets)} tweets")
+        if len(tweets) == 1:
+            raise ValueError(f"analysis of tweet {tweets[0].tweet_id} exceeds max_tokens")
+
+        self.packer.record_split()
+        middle = len(tweets) // 2
+        logger.warning(
+            f"Analysis reply hit max_tokens with no complete result, retrying {len(tweets)} tweets as "
+            f"{middle} + {len(tweets) - middle}"
+        )
+        first = await self._request_remaining(tweets[:middle])
+        return {**first, **await self._request_remaining(tweets[middle:])}
+
+    async def _request_remaining(self, tweets: List[Tweet]) -> Dict[str, Dict]:
+        """Retry part of a request; on failure its tweets stay unprocessed for the next run."""
+        try:
+            return await self._request_analysis(tweets)
+        except Exception as e:
+            logger.error(f"Error analyzing {len(tweets)} re-requested tweets: {e}")
+            return {}
+
     async def translate_tweet(self, text: str) -> Optional[str]:
         """
         Translate tweet text to Chinese.
@@ -113,38 +466,135 @@ Tweet:
 Provide only the translation, no explanations."""
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            translation = message.content[0].text.strip()
+            translation = await self.gateway.complete("translation", prompt)
             return translation
 
         except Exception as e:
             logger.error(f"Error translating tweet: {e}")
             return None
 
+    def build_translation_request(self, tweets: List[Tweet]) -> Dict:
+        """
+        Build the Messages API parameters for translating a batch of tweets.
+
+        Args:
+            tweets: Tweets to translate
+
+        Returns:
+            Keyword arguments for messages.stream
+        """
+        tweets_text = "\n\n".join([
+            f"Tweet {i+1} (ID: {tweet.tweet_id}):\n{tweet.text}"
+            for i, tweet in enumerate(tweets)
+        ])
+
+        prompt = f"""Translate the following tweets to Chinese (Simplified). Keep technical terms in English when appropriate.
+
+Tweets:
+{tweets_text}
+
+Record one translation per tweet with the {TRANSLATION_TOOL['name']} tool, using the tweet IDs above. Provide only the translations, no explanations."""
+
+        return self.gateway.request(
+            "translation",
+            [{"role": "user", "content": prompt}],
+            tools=[TRANSLATION_TOOL],
+            tool_choice={"type": "tool", "name": TRANSLATION_TOOL["name"]},
+        )
+
+    async def translate_tweets(self, tweets: List[Tweet]) -> Dict[str, str]:
+        """
+        Translate a batch of tweets to Chinese in one structured call.
+
+        Args:
+            tweets: Tweets to translate
+
+        Returns:
+            Mapping of tweet_id to translation for every tweet the reply covered
+        """
+        message, raw_input = await self._stream_request(self.build_translation_request(tweets), "translation")
+        results = self._tool_results(message, TRANSLATION_TOOL["name"], raw_input) or []
+
+        wanted = {tweet.tweet_id for tweet in tweets}
+        translations: Dict[str, str] = {}
+        for result in results:
+            if not isinstance(result, dict):
+                continue
+            tweet_id = str(result.get("tweet_id"))
+            translation = result.get("translation")
+            if tweet_id in wanted and isinstance(translation, str) and translation.strip():
+                translations.setdefault(tweet_id, translation.strip())
+        return translations
+
+    async def _translate_batches(
+        self,
+        tweets: List[Tweet],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Translate tweets in concurrent batched calls.
+
+        Tweets a batched reply misses fall back to one translate_tweet call each.
+
+        Args:
+            tweets: Tweets to translate (distinct texts)
+            batch_size: Tweets per call (defaults to settings.translation_batch_size)
+            concurrency: Max calls in flight (defaults to settings.claude_max_concurrency)
+
+        Returns:
+            Mapping of tweet_id to translation
+        """
+        batch_size = batch_size or settings.translation_batch_size
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrency))
+
+        async def translate(batch: List[Tweet]) -> Dict[str, str]:
+            async with semaphore:
+                try:
+                    translations = await self.translate_tweets(batch)
+                except Exception as e:
+                    logger.error(f"Error translating a batch of {len(batch)} tweets: {e}")
+                    translations = {}
+                for tweet in batch:
+                    if tweet.tweet_id not in translations:
+                        translation = await self.translate_tweet(tweet.text)
+                        if translation:
+                            translations[tweet.tweet_id] = translation
+                return translations
+
+        batches = [tweets[start:start + batch_size] for start in range(0, len(tweets), batch_size)]
+        translations: Dict[str, str] = {}
+        for batch_translations in await asyncio.gather(*(translate(batch) for batch in batches)):
+            translations.update(batch_translations)
+        return translations
+
     def calculate_importance_score(
         self,
         engagement_score: float,
         ai_relevance_score: float,
-        max_engagement: float
+        max_engagement: Optional[float] = None
     ) -> float:
         """
         Combine engagement and AI relevance into importance score.
 
+        Engagement is scaled by its percentile over the rolling window (see
+        engagement_normalizer), so scores are comparable across batches; until
+        the window has enough tweets it is scaled by max_engagement instead.
+
         Args:
             engagement_score: Raw engagement score
             ai_relevance_score: AI relevance score (0-10)
-            max_engagement: Maximum engagement score in the batch for normalization
+            max_engagement: Maximum engagement score in the batch, the fallback normalization
 
         Returns:
             Importance score (0-10)
         """
         # Normalize engagement score to 0-10 scale
-        normalized_engagement = (engagement_score / max_engagement) * 10 if max_engagement > 0 else 0
+        normalized_engagement = self.normalizer.normalize(engagement_score)
+        if normalized_engagement is None:
+            normalized_engagement = (
+                (engagement_score / max_engagement) * 10 if max_engagement and max_engagement > 0 else 0
+            )
 
         # Weighted combination
         importance = (
@@ -154,26 +604,117 @@ Provide only the translation, no explanations."""
 
         return round(importance, 2)
 
-    async def process_unprocessed_tweets(self, db: Session, batch_size: int = None) -> int:
+    async def analyze_batches(
+        self,
+        batches: List[List[Tweet]],
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[List[Tweet], List[Dict]]]:
+        """
+        Analyze batches concurrently and yield their results in input order.
+
+        Up to ``concurrency`` Claude calls are in flight at once; a slow batch
+        holds back the batches after it only until it finishes, while later
+        calls keep running in the background.
+
+        Args:
+            batches: Tweet batches to analyze
+            concurrency: Max batches in flight (defaults to settings.claude_max_concurrency)
+
+        Yields:
+            Tuples of (batch, analysis results), in the order of ``batches``
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_concurrency))
+
+        async def analyze(batch: List[Tweet]) -> List[Dict]:
+            async with semaphore:
+                return await self.analyze_tweet_batch(batch)
+
+        tasks = [asyncio.ensure_future(analyze(batch)) for batch in batches]
+        try:
+            for batch, task in zip(batches, tasks):
+                yield batch, await task
+        finally:
+            # Consumer stopped early or failed: don't leave calls running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def unprocessed_tweets(self, db: Session):
+        """
+        Query unprocessed tweets that no open Message Batch or running analysis has claimed.
+
+        Every analysis path selects from this, so a tweet submitted as a
+        Message Batch is not analyzed (and paid for) again interactively,
+        and concurrent runs (drain, pipeline, scheduled analysis) never store
+        the same tweet twice.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Tweet query
+        """
+        open_batches = select(AnalysisBatch.id).where(AnalysisBatch.status.in_(OPEN_STATUSES))
+        query = db.query(Tweet).filter(
+            Tweet.processed == False,
+            or_(Tweet.analysis_batch_id.is_(None), Tweet.analysis_batch_id.not_in(open_batches))
+        )
+        if self._in_flight:
+            query = query.filter(~Tweet.id.in_(self._in_flight))
+        return query
+
+    @contextmanager
+    def claim(self, tweets: List[Tweet]) -> Iterator[List[Tweet]]:
+        """
+        Reserve tweets for one analysis run until its results are committed.
+
+        Claim tweets right after selecting them from unprocessed_tweets (with
+        no await in between) and commit before the block exits.
+
+        Args:
+            tweets: Selected tweets
+
+        Yields:
+            The tweets no other run of this process has claimed
+        """
+        claimed = [tweet for tweet in tweets if tweet.id not in self._in_flight]
+        tweet_ids = {tweet.id for tweet in claimed}
+        self._in_flight |= tweet_ids
+        try:
+            yield claimed
+        finally:
+            self._in_flight -= tweet_ids
+
+    async def process_unprocessed_tweets(
+        self,
+        db: Session,
+        batch_size: int = None,
+        concurrency: Optional[int] = None
+    ) -> int:
         """
         Process all unprocessed tweets in batches.
 
+        Batches are analyzed concurrently (see analyze_batches) and committed
+        one at a time in order.
+
         Args:
             db: Database session
-            batch_size: Number of tweets to process per batch
+            batch_size: Number of tweets to process per batch (default: packed by
+                estimated tokens, or settings.batch_size when packing is disabled)
+            concurrency: Max batches analyzed at once
+                (defaults to settings.claude_max_concurrency)
 
         Returns:
             Number of tweets processed
         """
-        if batch_size is None:
-            batch_size = settings.batch_size
+        packed = batch_size is None and settings.analyzer_token_packing
 
         logger.info("Starting AI analysis of unprocessed tweets")
 
         # Get unprocessed tweets
-        unprocessed_tweets = db.query(Tweet).filter(
-            Tweet.processed == False
-        ).order_by(Tweet.created_at.desc()).limit(batch_size * 10).all()
+        unprocessed_tweets = self.unprocessed_tweets(db).order_by(
+            Tweet.created_at.desc()
+        ).limit((batch_size or settings.batch_size) * 10).all()
 
         logger.info(f"Found {len(unprocessed_tweets)} unprocessed tweets")
 
@@ -181,80 +722,196 @@ Provide only the translation, no explanations."""
             logger.info("No unprocessed tweets found")
             return 0
 
-        # Calculate max engagement for normalization
-        max_engagement = max(tweet.engagement_score for tweet in unprocessed_tweets) if unprocessed_tweets else 1.0
-        # Ensure max_engagement is never 0 to avoid division by zero
-        if max_engagement == 0:
-            max_engagement = 1.0
+        # Concurrent runs skip these tweets until their batches are committed
+        with self.claim(unprocessed_tweets) as unprocessed_tweets:
+            # Calculate max engagement for normalization
+            max_engagement = max(tweet.engagement_score for tweet in unprocessed_tweets) if unprocessed_tweets else 1.0
+            # Ensure max_engagement is never 0 to avoid division by zero
+            if max_engagement == 0:
+                max_engagement = 1.0
+
+            # Process in batches
+            total_processed = 0
+            ai_related_count = 0
+
+            if packed:
+                batches = self.packer.pack(unprocessed_tweets, self.max_tokens)
+            else:
+                batch_size = batch_size or settings.batch_size
+                batches = [
+                    unprocessed_tweets[i:i + batch_size]
+                    for i in range(0, len(unprocessed_tweets), batch_size)
+                ]
+            logger.info(f"Analyzing {len(batches)} batches, up to {concurrency or self.max_concurrency} at a time")
+
+            number = 0
+            async for batch, analysis_results in self.analyze_batches(batches, concurrency):
+                number += 1
+                if not analysis_results:
+                    logger.warning(f"No results from analysis for batch {number}")
+                    continue
 
-        # Process in batches
+                processed, ai_related = self.store_batch_results(db, batch, analysis_results, max_engagement)
+                total_processed += processed
+                ai_related_count += ai_related
+
+                db.commit()
+                logger.info(f"Batch {number} complete: {processed} of {len(batch)} tweets processed")
+
+        percentage = (ai_related_count/total_processed*100) if total_processed > 0 else 0
+        logger.info(
+            f"AI analysis complete: {total_processed} tweets processed, "
+            f"{ai_related_count} AI-related ({percentage:.1f}%)"
+        )
+
+        return total_processed
+
+    def store_batch_results(
+        self,
+        db: Session,
+        batch: List[Tweet],
+        analysis_results: List[Dict],
+        max_engagement: float
+    ) -> Tuple[int, int]:
+        """
+        Add ProcessedTweet rows for an analyzed batch and mark its tweets processed.
+
+        Args:
+            db: Database session (not committed)
+            batch: Tweets that were analyzed
+            analysis_results: Results from analyze_tweet_batch, matched to
+                tweets by tweet_id (tweets without one stay unprocessed)
+            max_engagement: Maximum engagement score for normalization
+
+        Returns:
+            Tuple of (tweets processed, AI-related tweets)
+        """
         total_processed = 0
         ai_related_count = 0
 
-        for i in range(0, len(unprocessed_tweets), batch_size):
-            batch = unprocessed_tweets[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}: {len(batch)} tweets")
-
-            # Analyze batch
-            analysis_results = await self.analyze_tweet_batch(batch)
+        self.normalizer.refresh_if_stale(db)
+        by_id = self.match_results(batch, analysis_results)
+        for tweet in batch:
+            result = by_id.get(tweet.tweet_id)
+            if result is None:
+                continue
+            try:
+                is_ai_related = result.get("is_ai_related", False)
+                ai_relevance_score = result.get("ai_relevance_score", 0)
+
+                # Calculate importance score
+                importance_score = self.calculate_importance_score(
+                    tweet.engagement_score,
+                    ai_relevance_score,
+                    max_engagement
+                )
+
+                # Create processed tweet record
+                processed_tweet = ProcessedTweet(
+                    tweet_id=tweet.id,
+                    is_ai_related=is_ai_related,
+                    summary=result.get("summary") if is_ai_related else None,
+                    topics=result.get("topics", []) if is_ai_related else None,
+                    ai_relevance_score=ai_relevance_score,
+                    importance_score=importance_score,
+                    translation=None,  # Translation done later for top 10 only
+                    processed_at=datetime.utcnow()
+                )
+
+                db.add(processed_tweet)
+                tweet.processed = True
+                total_processed += 1
+
+                if is_ai_related:
+                    ai_related_count += 1
 
-            if not analysis_results:
-                logger.warning(f"No results from analysis for batch {i//batch_size + 1}")
+            except Exception as e:
+                logger.error(f"Error processing tweet {tweet.tweet_id}: {e}")
                 continue
 
-            # Process results
-            for tweet, result in zip(batch, analysis_results):
-                try:
-                    is_ai_related = result.get("is_ai_related", False)
-                    ai_relevance_score = result.get("ai_relevance_score", 0)
-
-                    # Calculate importance score
-                    importance_score = self.calculate_importance_score(
-                        tweet.engagement_score,
-                        ai_relevance_score,
-                        max_engagement
-                    )
-
-                    # Create processed tweet record
-                    processed_tweet = ProcessedTweet(
-                        tweet_id=tweet.id,
-                        is_ai_related=is_ai_related,
-                        summary=result.get("summary") if is_ai_related else None,
-                        topics=result.get("topics", []) if is_ai_related else None,
-                        importance_score=importance_score,
-                        translation=None,  # Translation done later for top 10 only
-                        processed_at=datetime.utcnow()
-                    )
-
-                    db.add(processed_tweet)
-                    tweet.processed = True
-                    total_processed += 1
-
-                    if is_ai_related:
-                        ai_related_count += 1
+        return total_processed, ai_related_count
 
-                except Exception as e:
-                    logger.error(f"Error processing tweet {tweet.tweet_id}: {e}")
-                    continue
+    def rescore_importance(
+        self,
+        db: Session,
+        since: Optional[datetime] = None,
+        chunk_size: int = 1000
+    ) -> int:
+        """
+        Recompute importance_score of stored analyses against the current percentiles.
+
+        Walks ProcessedTweet rows by primary key and bulk-updates the scores
+        that changed, committing after each chunk.
+
+        Args:
+            db: Database session
+            since: Only tweets created at or after this time (default: all)
+            chunk_size: Rows loaded and updated per step
+
+        Returns:
+            Number of ProcessedTweet rows whose score changed
+
+        Raises:
+            ValueError: If the rolling window has fewer than engagement_min_samples tweets
+        """
+        self.normalizer.refresh(db)
+        if not self.normalizer.ready:
+            raise ValueError(
+                f"engagement window has {self.normalizer.get_stats()['samples']} tweets, "
+                f"need {self.normalizer.min_samples} (run the histogram backfill first)"
+            )
 
+        updated = 0
+        last_id = 0
+        while True:
+            query = db.query(
+                ProcessedTweet.id,
+                ProcessedTweet.ai_relevance_score,
+                ProcessedTweet.importance_score,
+                Tweet.engagement_score,
+            ).join(Tweet).filter(
+                ProcessedTweet.id > last_id,
+                ProcessedTweet.ai_relevance_score.isnot(None)
+            )
+            if since is not None:
+                query = query.filter(Tweet.created_at >= since)
+            rows = query.order_by(ProcessedTweet.id).limit(chunk_size).all()
+            if not rows:
+                break
+
+            score_updates = []
+            for row in rows:
+                importance_score = self.calculate_importance_score(row.engagement_score, row.ai_relevance_score)
+                if importance_score != row.importance_score:
+                    score_updates.append({"id": row.id, "importance_score": importance_score})
+            if score_updates:
+                db.execute(update(ProcessedTweet), score_updates)
             db.commit()
-            logger.info(f"Batch {i//batch_size + 1} complete: {len(batch)} tweets processed")
 
-        percentage = (ai_related_count/total_processed*100) if total_processed > 0 else 0
-        logger.info(
-            f"AI analysis complete: {total_processed} tweets processed, "
-            f"{ai_related_count} AI-related ({percentage:.1f}%)"
-        )
+            updated += len(score_updates)
+            last_id = rows[-1].id
 
-        return total_processed
+        logger.info(f"Re-scored {updated} processed tweets")
+        return updated
 
-    async def translate_top_tweets(self, db: Session, processed_tweet_ids: List[int]) -> int:
+    async def translate_top_tweets(
+        self,
+        db: Session,
+        processed_tweet_ids: List[int],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> int:
         """
         Translate only the top tweets (for highlights section).
 
+        Rows are loaded with one query; cached translations are reused, and
+        the remaining distinct texts are translated in concurrent batched calls.
+
         Args:
             db: Database session
             processed_tweet_ids: List of ProcessedTweet IDs to translate
+            batch_size: Tweets per Claude call (defaults to settings.translation_batch_size)
+            concurrency: Max calls in flight (defaults to settings.claude_max_concurrency)
 
         Returns:
             Number of tweets translated
@@ -263,33 +920,59 @@ Provide only the translation, no explanations."""
             logger.info("Translation disabled, skipping")
             return 0
 
-        logger.info(f"Translating {len(processed_tweet_ids)} top tweets")
+        rows = db.query(ProcessedTweet).options(joinedload(ProcessedTweet.tweet)).filter(
+            ProcessedTweet.id.in_(processed_tweet_ids),
+            ProcessedTweet.translation.is_(None)
+        ).all()
+        if not rows:
+            return 0
 
-        translated_count = 0
+        logger.info(f"Translating {len(rows)} top tweets")
 
-        for tweet_id in processed_tweet_ids:
+        keys = [self.translation_cache.key(row.tweet.text, TRANSLATION_PROMPT_VERSION) for row in rows]
+        try:
+            cached = self.translation_cache.lookup([(key, row.tweet.text) for key, row in zip(keys, rows)])
+        except Exception as e:
+            logger.warning(f"Translation cache lookup failed: {e}")
+            cached = {}
+
+        # One request entry per distinct uncached text
+        to_send: Dict[str, Tweet] = {}
+        duplicates: List[Tuple[str, Tweet]] = []
+        for key, row in zip(keys, rows):
+            if key in cached:
+                continue
+            if key in to_send:
+                duplicates.append((key, row.tweet))
+                continue
+            to_send[key] = row.tweet
+
+        fresh: Dict[str, Dict] = {}
+        if to_send:
+            translations = await self._translate_batches(list(to_send.values()), batch_size, concurrency)
+            fresh = {
+                key: {"translation": translations[tweet.tweet_id]}
+                for key, tweet in to_send.items() if tweet.tweet_id in translations
+            }
             try:
-                processed_tweet = db.query(ProcessedTweet).filter(
-                    ProcessedTweet.id == tweet_id
-                ).first()
-
-                if not processed_tweet or processed_tweet.translation:
-                    continue
-
-                # Get original tweet text
-                tweet = processed_tweet.tweet
-                translation = await self.translate_tweet(tweet.text)
-
-                if translation:
-                    processed_tweet.translation = translation
-                    translated_count += 1
-
+                self.translation_cache.store(fresh.items())
             except Exception as e:
-                logger.error(f"Error translating tweet {tweet_id}: {e}")
-                continue
+                logger.warning(f"Translation cache store failed: {e}")
+            for key, tweet in duplicates:
+                if key in fresh:
+                    self.translation_cache.record_hit(tweet.text, fresh[key])
+
+        translated_count = 0
+        for key, row in zip(keys, rows):
+            result = cached.get(key) or fresh.get(key)
+            if result:
+                row.translation = result["translation"]
+                translated_count += 1
 
         db.commit()
-        logger.info(f"Translated {translated_count} tweets")
+        logger.info(
+            f"Translated {translated_count} tweets ({len(rows) - len(to_send)} from cache or repeated texts)"
+        )
         return translated_count
 
 
@@ -7,19 +7,22 @@ from datetime import datetime, date, timedelta
 from loguru import logger
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-import anthropic
 
-from app.config import settings
 from app.models.processed_tweet import ProcessedTweet
 from app.models.daily_summary import DailySummary
 from app.models.tweet import Tweet
+from app.services.llm_gateway import LLMGateway, llm_gateway
 
 
 class AIReportEditorService:
     """Service to generate professional AI industry daily reports."""
 
-    def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    def __init__(self, gateway: Optional[LLMGateway] = None):
+        """
+        Args:
+            gateway: LLM gateway (defaults to the shared pooled one)
+        """
+        self.gateway = gateway or llm_gateway
         self.system_prompt = self._load_system_prompt()
 
     def _load_system_prompt(self) -> str:
@@ -295,14 +298,8 @@ AI 初步分析：{processed_tweet.summary}
 开始生成日报："""
 
         try:
-            message = self.client.messages.create(
-                model=settings.claude_model,
-                max_tokens=8000,  # Longer output for detailed report
-                system=self.system_prompt,
-                messages=[{"role": "user", "content": user_prompt}]
-            )
-
-            report = message.content[0].text.strip()
+            # The report profile allows a longer output for the detailed report
+            report = await self.gateway.complete("report", user_prompt, system=self.system_prompt)
             logger.info(f"Generated AI industry daily report for {report_date}")
             return report
 
@@ -0,0 +1,267 @@
+"""
+Analysis cache service - Reuse Claude results for duplicate tweet texts.
+Tweets are keyed by a hash of their normalized text (URLs stripped,
+whitespace collapsed, case-folded) plus the analysis prompt version, so
+cross-posted announcements are analyzed once. Entries live in the
+analysis_cache table, bounded by age and by entry count.
+"""
+import hashlib
+import json
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import insert, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.analysis_cache import AnalysisCacheEntry
+
+_URL = re.compile(r"https?://\S+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Result fields stored per entry
+_RESULT_FIELDS = ("is_ai_related", "ai_relevance_score", "summary", "topics")
+
+# Rough characters per token, for the savings estimate
+_CHARS_PER_TOKEN = 4
+
+# Minimum time between size/age pruning passes
+_PRUNE_INTERVAL = timedelta(hours=1)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize tweet text for duplicate detection.
+
+    Args:
+        text: Raw tweet text
+
+    Returns:
+        Text without URLs, with collapsed whitespace, case-folded
+    """
+    return _WHITESPACE.sub(" ", _URL.sub("", text or "")).strip().casefold()
+
+
+class AnalysisCache:
+    """Database-backed cache of per-tweet analysis results."""
+
+    # Table and result fields; subclasses cache other per-text results
+    model = AnalysisCacheEntry
+    fields = _RESULT_FIELDS
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Args:
+            session_factory: Opens the sessions used for cache reads and writes
+        """
+        self.session_factory = session_factory
+        self.enabled = settings.analysis_cache_enabled
+        self.ttl = timedelta(days=settings.analysis_cache_ttl_days)
+        self.max_entries = settings.analysis_cache_max_entries
+        self._last_pruned: Optional[datetime] = None
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "stores": 0,
+            "input_tokens_saved": 0,
+            "output_tokens_saved": 0,
+        }
+
+    def key(self, text: str, prompt_version: str) -> str:
+        """
+        Cache key for a tweet text.
+
+        Args:
+            text: Raw tweet text
+            prompt_version: Version of the prompt that produces the result
+
+        Returns:
+            Hex sha256 digest
+        """
+        return hashlib.sha256(f"{prompt_version}\n{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def lookup(self, items: List[Tuple[str, str]]) -> Dict[str, Dict]:
+        """
+        Fetch unexpired results for a batch of tweets.
+
+        Args:
+            items: (cache key, tweet text) pairs; the text is only used for
+                the token savings estimate
+
+        Returns:
+            Mapping of cache key to analysis result for every hit
+        """
+        if not self.enabled or not items:
+            return {}
+
+        keys = list({key for key, _ in items})
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            entries = db.query(self.model).filter(
+                self.model.content_hash.in_(keys),
+                self.model.created_at > now - self.ttl
+            ).all()
+            found = {
+                entry.content_hash: {field: getattr(entry, field) for field in self.fields}
+                for entry in entries
+            }
+            if found:
+                db.execute(
+                    update(self.model)
+                    .where(self.model.content_hash.in_(list(found)))
+                    .values(hits=self.model.hits + 1, last_hit_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        finally:
+            db.close()
+
+        self.stats["lookups"] += len(items)
+        for key, text in items:
+            if key in found:
+                self.record_hit(text, found[key])
+        return found
+
+    def record_hit(self, text: str, result: Dict):
+        """
+        Count a tweet answered without sending it to Claude.
+
+        Args:
+            text: Tweet text that was not sent
+            result: Result it reused
+        """
+        self.stats["hits"] += 1
+        # Tweet line in the prompt, and its share of the JSON reply
+        self.stats["input_tokens_saved"] += (len(text) + 30) // _CHARS_PER_TOKEN
+        self.stats["output_tokens_saved"] += len(json.dumps(result)) // _CHARS_PER_TOKEN
+
+    def entry_values(self, result: Dict) -> Optional[Dict]:
+        """
+        Column values stored for a result.
+
+        Args:
+            result: Result to cache
+
+        Returns:
+            Values for the result fields, or None if the result is not cacheable
+        """
+        if not isinstance(result, dict) or "is_ai_related" not in result:
+            return None
+        return {
+            "is_ai_related": bool(result.get("is_ai_related")),
+            "ai_relevance_score": result.get("ai_relevance_score"),
+            "summary": result.get("summary"),
+            "topics": result.get("topics"),
+        }
+
+    def store(self, results: Iterable[Tuple[str, Dict]]):
+        """
+        Save fresh analysis results, replacing expired entries.
+
+        Args:
+            results: (cache key, analysis result) pairs
+        """
+        if not self.enabled:
+            return
+
+        now = datetime.utcnow()
+        rows = {}
+        for key, result in results:
+            values = self.entry_values(result)
+            if values is None:
+                continue
+            rows[key] = {
+                "content_hash": key,
+                **values,
+                "hits": 0,
+                "created_at": now,
+                "last_hit_at": None,
+            }
+        if not rows:
+            return
+
+        db = self.session_factory()
+        try:
+            dialect = db.get_bind().dialect.name
+            values = list(rows.values())
+            if dialect == "postgresql":
+                stmt = pg_insert(self.model).values(values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[self.model.content_hash],
+                    set_={column: stmt.excluded[column] for column in values[0] if column != "content_hash"}
+                )
+            elif dialect == "sqlite":
+                stmt = insert(self.model).values(values).prefix_with("OR REPLACE")
+            else:
+                db.execute(delete(self.model).where(self.model.content_hash.in_(list(rows))))
+                stmt = insert(self.model).values(values)
+            db.execute(stmt)
+            db.commit()
+            self.stats["stores"] += len(rows)
+
+            if self._last_pruned is None or now - self._last_pruned >= _PRUNE_INTERVAL:
+                self.prune(db, now)
+        finally:
+            db.close()
+
+    def prune(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Drop expired entries, then the least recently used beyond max_entries.
+
+        Args:
+            db: Database session (committed before returning)
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            Number of entries deleted
+        """
+        now = now or datetime.utcnow()
+        self._last_pruned = now
+
+        deleted = db.execute(
+            delete(self.model).where(self.model.created_at <= now - self.ttl)
+        ).rowcount
+
+        excess = db.query(func.count(self.model.id)).scalar() - self.max_entries
+        if excess > 0:
+            oldest = (
+                db.query(self.model.id)
+                .order_by(func.coalesce(self.model.last_hit_at, self.model.created_at))
+                .limit(excess)
+                .subquery()
+            )
+            deleted += db.execute(
+                delete(self.model).where(self.model.id.in_(oldest.select()))
+            ).rowcount
+        db.commit()
+
+        if deleted:
+            logger.info(f"Pruned {deleted} {self.model.__tablename__} entries")
+        return deleted
+
+    def get_stats(self, db: Session) -> Dict:
+        """
+        Hit rate and estimated token savings since startup.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with lookup/hit counters, savings estimate and entry count
+        """
+        lookups = self.stats["lookups"]
+        return {
+            "enabled": self.enabled,
+            "entries": db.query(func.count(self.model.id)).scalar(),
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+            "estimated_tokens_saved": self.stats["input_tokens_saved"] + self.stats["output_tokens_saved"],
+        }
+
+
+# Global analysis cache instance
+analysis_cache = AnalysisCache()
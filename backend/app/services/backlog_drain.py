@@ -0,0 +1,292 @@
+"""
+Backlog drain service - Analyze every unprocessed tweet, oldest first.
+Walks processed=False tweets by keyset pagination on (created_at, id), one
+chunk at a time, and commits each chunk's results together with the cursor
+in task_checkpoints, so memory stays bounded and an interrupted drain
+continues where it stopped after a restart.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from loguru import logger
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.task_checkpoint import TaskCheckpoint
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer, ai_analyzer
+
+# Checkpoint row of the drain
+DRAIN_TASK = "analysis_drain"
+
+
+class BacklogDrain:
+    """Resumable, chunked analysis of the whole unprocessed backlog."""
+
+    def __init__(
+        self,
+        analyzer: Optional[AIAnalyzer] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        """
+        Args:
+            analyzer: Analyzer used for each chunk (defaults to the global instance)
+            session_factory: Opens the session of a background drain
+        """
+        self.analyzer = analyzer or ai_analyzer
+        self.session_factory = session_factory
+        self.chunk_size = settings.drain_chunk_size
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a background drain is in progress in this process."""
+        return self._task is not None and not self._task.done()
+
+    def checkpoint(self, db: Session) -> Optional[TaskCheckpoint]:
+        """The drain's checkpoint row, if a drain was ever started."""
+        return db.query(TaskCheckpoint).filter(TaskCheckpoint.name == DRAIN_TASK).first()
+
+    def _backlog(self, db: Session, checkpoint: TaskCheckpoint):
+        """Unprocessed tweets after the checkpoint cursor (not claimed by a Message Batch)."""
+        query = self.analyzer.unprocessed_tweets(db)
+        if checkpoint.cursor_created_at is not None:
+            query = query.filter(
+                tuple_(Tweet.created_at, Tweet.id) > tuple_(checkpoint.cursor_created_at, checkpoint.cursor_id)
+            )
+        return query
+
+    def next_chunk(self, db: Session, checkpoint: TaskCheckpoint, chunk_size: int) -> List[Tweet]:
+        """
+        Load the next chunk of the backlog.
+
+        Args:
+            db: Database session
+            checkpoint: Drain checkpoint holding the cursor
+            chunk_size: Max tweets to load
+
+        Returns:
+            Unprocessed tweets after the cursor, oldest first
+        """
+        return self._backlog(db, checkpoint).order_by(Tweet.created_at, Tweet.id).limit(chunk_size).all()
+
+    def _reset(self, db: Session, checkpoint: TaskCheckpoint):
+        """Start a new run from the oldest unprocessed tweet."""
+        max_engagement = db.query(func.max(Tweet.engagement_score)).filter(Tweet.processed == False).scalar()
+        now = datetime.utcnow()
+        checkpoint.status = "running"
+        checkpoint.cursor_created_at = None
+        checkpoint.cursor_id = None
+        # Ensure max_engagement is never 0 to avoid division by zero
+        checkpoint.max_engagement = max_engagement or 1.0
+        checkpoint.chunk_count = 0
+        checkpoint.processed_count = 0
+        checkpoint.ai_related_count = 0
+        checkpoint.skipped_count = 0
+        checkpoint.error = None
+        checkpoint.started_at = now
+        checkpoint.updated_at = now
+        checkpoint.completed_at = None
+
+    async def _analyze_chunk(
+        self,
+        db: Session,
+        tweets: List[Tweet],
+        max_engagement: float,
+        concurrency: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Analyze one chunk and add its results to the session (not committed)."""
+        if settings.analyzer_token_packing:
+            batches = self.analyzer.packer.pack(tweets, self.analyzer.max_tokens)
+        else:
+            batches = [
+                tweets[start:start + settings.batch_size]
+                for start in range(0, len(tweets), settings.batch_size)
+            ]
+
+        processed = ai_related = 0
+        async for batch, analysis_results in self.analyzer.analyze_batches(batches, concurrency):
+            if analysis_results:
+                batch_processed, batch_ai_related = self.analyzer.store_batch_results(
+                    db, batch, analysis_results, max_engagement
+                )
+                processed += batch_processed
+                ai_related += batch_ai_related
+        return processed, ai_related
+
+    async def drain(
+        self,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        max_chunks: Optional[int] = None,
+        restart: bool = False,
+        concurrency: Optional[int] = None
+    ) -> Dict:
+        """
+        Analyze the backlog chunk by chunk, continuing an interrupted run.
+
+        Each chunk's results and the advanced cursor are committed together.
+        Tweets that got no result are passed over (and picked up by the next
+        regular analysis run); a chunk where nothing could be analyzed stops
+        the drain without moving the cursor, so an API outage does not skip
+        the backlog.
+
+        Args:
+            db: Database session
+            chunk_size: Tweets per chunk (defaults to settings.drain_chunk_size)
+            max_chunks: Stop after this many chunks (default: until the backlog is empty)
+            restart: Start over from the oldest tweet instead of resuming
+            concurrency: Max analysis batches in flight
+                (defaults to settings.claude_max_concurrency)
+
+        Returns:
+            Drain progress (see describe)
+        """
+        chunk_size = chunk_size or self.chunk_size
+
+        checkpoint = self.checkpoint(db)
+        if checkpoint is None:
+            checkpoint = TaskCheckpoint(name=DRAIN_TASK)
+            db.add(checkpoint)
+        if restart or checkpoint.status != "running":
+            self._reset(db, checkpoint)
+        else:
+            logger.info(f"Resuming backlog drain after chunk {checkpoint.chunk_count}")
+        db.commit()
+
+        chunks = 0
+        try:
+            while max_chunks is None or chunks < max_chunks:
+                tweets = self.next_chunk(db, checkpoint, chunk_size)
+                if not tweets:
+                    checkpoint.status = "completed"
+                    checkpoint.completed_at = datetime.utcnow()
+                    db.commit()
+                    logger.info(
+                        f"Backlog drain complete: {checkpoint.processed_count} tweets processed, "
+                        f"{checkpoint.skipped_count} skipped"
+                    )
+                    break
+
+                # Claimed until committed, so a concurrent run does not store these tweets too
+                with self.analyzer.claim(tweets) as tweets:
+                    processed, ai_related = await self._analyze_chunk(
+                        db, tweets, checkpoint.max_engagement, concurrency
+                    )
+                    if not processed:
+                        db.rollback()
+                        checkpoint.error = f"No results for a chunk of {len(tweets)} tweets, drain paused"
+                        db.commit()
+                        logger.warning(checkpoint.error)
+                        break
+
+                    last = tweets[-1]
+                    checkpoint.cursor_created_at = last.created_at
+                    checkpoint.cursor_id = last.id
+                    checkpoint.chunk_count += 1
+                    checkpoint.processed_count += processed
+                    checkpoint.ai_related_count += ai_related
+                    checkpoint.skipped_count += len(tweets) - processed
+                    checkpoint.error = None
+                    checkpoint.updated_at = datetime.utcnow()
+                    db.commit()
+                    chunks += 1
+                logger.info(
+                    f"Backlog drain chunk {checkpoint.chunk_count}: {processed} of {len(tweets)} tweets "
+                    f"processed, up to {last.created_at}"
+                )
+        except Exception as e:
+            db.rollback()
+            checkpoint.error = str(e)[:500]
+            db.commit()
+            raise
+
+        return self.describe(db, checkpoint)
+
+    def start(self, chunk_size: Optional[int] = None, restart: bool = False) -> bool:
+        """
+        Run a drain in the background with its own session.
+
+        Args:
+            chunk_size: Tweets per chunk
+            restart: Start over instead of resuming
+
+        Returns:
+            False if a drain is already running in this process
+        """
+        if self.running:
+            return False
+        self._task = asyncio.get_running_loop().create_task(self._run(chunk_size, restart))
+        return True
+
+    async def _run(self, chunk_size: Optional[int], restart: bool):
+        db = self.session_factory()
+        try:
+            await self.drain(db, chunk_size=chunk_size, restart=restart)
+        except Exception as e:
+            logger.error(f"Backlog drain failed: {e}")
+        finally:
+            db.close()
+
+    def resume_interrupted(self) -> bool:
+        """
+        Continue a drain that was running when the process stopped (called at startup).
+
+        Returns:
+            True if a drain was resumed
+        """
+        db = self.session_factory()
+        try:
+            checkpoint = self.checkpoint(db)
+            interrupted = checkpoint is not None and checkpoint.status == "running"
+        finally:
+            db.close()
+        return interrupted and self.start()
+
+    async def stop(self):
+        """Cancel a background drain; its current chunk is rolled back and redone on resume."""
+        if self.running:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def describe(self, db: Session, checkpoint: Optional[TaskCheckpoint] = None) -> Dict:
+        """
+        Summarize drain progress for the task API.
+
+        Args:
+            db: Database session
+            checkpoint: Checkpoint to describe (defaults to the stored one)
+
+        Returns:
+            Dictionary with status, cursor, counters and remaining tweets
+        """
+        checkpoint = checkpoint or self.checkpoint(db)
+        if checkpoint is None:
+            return {"status": "never_run", "running": self.running}
+
+        remaining = (
+            self._backlog(db, checkpoint).count() if checkpoint.status == "running" else 0
+        )
+        return {
+            "status": checkpoint.status,
+            "running": self.running,
+            "cursor": {
+                "created_at": checkpoint.cursor_created_at.isoformat() if checkpoint.cursor_created_at else None,
+                "id": checkpoint.cursor_id,
+            },
+            "chunks": checkpoint.chunk_count,
+            "processed": checkpoint.processed_count,
+            "ai_related": checkpoint.ai_related_count,
+            "skipped": checkpoint.skipped_count,
+            "remaining": remaining,
+            "error": checkpoint.error,
+            "started_at": checkpoint.started_at.isoformat() if checkpoint.started_at else None,
+            "updated_at": checkpoint.updated_at.isoformat() if checkpoint.updated_at else None,
+            "completed_at": checkpoint.completed_at.isoformat() if checkpoint.completed_at else None,
+        }
+
+
+# Global backlog drain instance
+backlog_drain = BacklogDrain()
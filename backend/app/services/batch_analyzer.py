@@ -0,0 +1,329 @@
+"""
+Batch analyzer service - Offline tweet analysis through Anthropic Message Batches.
+All pending analyze_tweet_batch prompts are submitted as one Message Batch
+(half the price of interactive calls, results within 24 hours). The batch ID
+is persisted in analysis_batches, so polling resumes after a restart and
+ProcessedTweet rows are written once the results arrive. A batch the API no
+longer has, or whose results are past retention, is marked failed so its
+tweets become eligible for analysis again.
+"""
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+import anthropic
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.analysis_batch import AnalysisBatch, OPEN_STATUSES
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer, ai_analyzer, ANALYSIS_PROMPT_VERSION
+from app.services.llm_telemetry import BATCH_STAGE
+
+# Message Batch results can be downloaded for 29 days after creation
+RESULTS_RETENTION = timedelta(days=29)
+
+
+class BatchAnalyzer:
+    """Submit, poll and store Message Batches of tweet analysis prompts."""
+
+    def __init__(self, analyzer: Optional[AIAnalyzer] = None):
+        """
+        Args:
+            analyzer: Analyzer providing the client, prompt and result handling
+                (defaults to the global instance)
+        """
+        self.analyzer = analyzer or ai_analyzer
+
+    def open_batches(self, db: Session) -> List[AnalysisBatch]:
+        """Batches submitted but not yet stored, oldest first."""
+        return db.query(AnalysisBatch).filter(
+            AnalysisBatch.status.in_(OPEN_STATUSES)
+        ).order_by(AnalysisBatch.created_at).all()
+
+    async def submit(
+        self,
+        db: Session,
+        batch_size: Optional[int] = None,
+        max_tweets: Optional[int] = None
+    ) -> Optional[AnalysisBatch]:
+        """
+        Submit every unprocessed tweet not already in an open batch.
+
+        Tweets with a cached analysis are stored right away instead.
+
+        Args:
+            db: Database session
+            batch_size: Tweets per prompt (default: packed by estimated tokens,
+                or settings.batch_size when packing is disabled)
+            max_tweets: Max tweets in one Message Batch
+                (defaults to settings.message_batch_max_tweets)
+
+        Returns:
+            The persisted AnalysisBatch, or None if nothing needed Claude
+        """
+        max_tweets = max_tweets or settings.message_batch_max_tweets
+
+        tweets = self.analyzer.unprocessed_tweets(db).order_by(Tweet.created_at.desc()).limit(max_tweets).all()
+
+        if not tweets:
+            logger.info("No unprocessed tweets to submit as a message batch")
+            return None
+
+        # Ensure max_engagement is never 0 to avoid division by zero
+        max_engagement = max(tweet.engagement_score for tweet in tweets) or 1.0
+
+        keys, cached = self.analyzer.cached_results(tweets)
+        if cached:
+            hits = [
+                (tweet, {**cached[key], "tweet_id": tweet.tweet_id})
+                for key, tweet in zip(keys, tweets) if key in cached
+            ]
+            processed, _ = self.analyzer.store_batch_results(
+                db, [tweet for tweet, _ in hits], [result for _, result in hits], max_engagement
+            )
+            db.commit()
+            logger.info(f"Stored cached analysis for {processed} tweets")
+            tweets = [tweet for key, tweet in zip(keys, tweets) if key not in cached]
+            if not tweets:
+                return None
+
+        # Claimed until the batch row is committed, which claims them from then on
+        with self.analyzer.claim(tweets) as tweets:
+            if batch_size is None and settings.analyzer_token_packing:
+                chunks = self.analyzer.packer.pack(tweets, self.analyzer.max_tokens)
+            else:
+                batch_size = batch_size or settings.batch_size
+                chunks = [tweets[start:start + batch_size] for start in range(0, len(tweets), batch_size)]
+
+            requests = []
+            tweet_map: Dict[str, List[int]] = {}
+            for number, chunk in enumerate(chunks):
+                custom_id = f"tweets-{number}"
+                requests.append({"custom_id": custom_id, "params": self.analyzer.build_analysis_request(chunk)})
+                tweet_map[custom_id] = [tweet.id for tweet in chunk]
+
+            message_batch = await self.analyzer.client.messages.batches.create(requests=requests)
+            logger.info(
+                f"Submitted message batch {message_batch.id}: "
+                f"{len(tweets)} tweets in {len(requests)} requests"
+            )
+
+            analysis_batch = AnalysisBatch(
+                batch_id=message_batch.id,
+                status="submitted",
+                requests=tweet_map,
+                request_count=len(requests),
+                tweet_count=len(tweets),
+                max_engagement=max_engagement,
+            )
+            db.add(analysis_batch)
+            db.flush()
+            for tweet in tweets:
+                tweet.analysis_batch_id = analysis_batch.id
+            db.commit()
+        return analysis_batch
+
+    async def poll(self, db: Session, analysis_batch: AnalysisBatch) -> AnalysisBatch:
+        """
+        Check a batch and store its results once it has ended.
+
+        Args:
+            db: Database session
+            analysis_batch: Batch to check
+
+        Returns:
+            The updated batch
+        """
+        message_batch = await self.analyzer.client.messages.batches.retrieve(analysis_batch.batch_id)
+        analysis_batch.last_polled_at = datetime.utcnow()
+
+        if message_batch.processing_status != "ended":
+            db.commit()
+            logger.debug(f"Message batch {analysis_batch.batch_id} is {message_batch.processing_status}")
+            return analysis_batch
+
+        counts = message_batch.request_counts
+        analysis_batch.status = "ended"
+        analysis_batch.ended_at = analysis_batch.ended_at or datetime.utcnow()
+        analysis_batch.succeeded_count = counts.succeeded
+        analysis_batch.errored_count = counts.errored + counts.expired + counts.canceled
+        db.commit()
+
+        await self._store_results(db, analysis_batch)
+        return analysis_batch
+
+    async def _store_results(self, db: Session, analysis_batch: AnalysisBatch):
+        """
+        Write ProcessedTweet rows for every succeeded request.
+
+        Commits after each request, so an interrupted run can read the results
+        again: tweets already marked processed are skipped. Results are matched
+        to tweets by tweet_id; tweets of errored requests, or missing from a
+        truncated reply, stay unprocessed and go into the next submission.
+        """
+        processed_count = 0
+        results = await self.analyzer.client.messages.batches.results(analysis_batch.batch_id)
+
+        async for item in results:
+            tweet_ids = analysis_batch.requests.get(item.custom_id)
+            if not tweet_ids:
+                continue
+            if item.result.type != "succeeded":
+                logger.warning(
+                    f"Message batch {analysis_batch.batch_id} request {item.custom_id} {item.result.type}"
+                )
+                continue
+
+            message = item.result.message
+            try:
+                analysis_results = self.analyzer.parse_analysis_message(message)
+            except ValueError as e:
+                logger.error(f"Unparseable result for {item.custom_id} in {analysis_batch.batch_id}: {e}")
+                analysis_results = []
+
+            tweets = db.query(Tweet).filter(Tweet.id.in_(tweet_ids)).all()
+            telemetry = self.analyzer.gateway.telemetry
+            if telemetry is not None and not any(tweet.processed for tweet in tweets):
+                # Not read before by an interrupted run (committed with the results below)
+                telemetry.record(BATCH_STAGE, message.model, message.usage, db=db)
+            matched = self.analyzer.match_results(tweets, analysis_results)
+            self.analyzer.packer.record_call(len(matched), message.usage, message.stop_reason == "max_tokens")
+            known = [(tweet, matched[tweet.tweet_id]) for tweet in tweets if tweet.tweet_id in matched]
+            self.analyzer.cache_results(
+                [self.analyzer.cache.key(tweet.text, ANALYSIS_PROMPT_VERSION) for tweet, _ in known],
+                [result for _, result in known]
+            )
+
+            pairs = [(tweet, result) for tweet, result in known if not tweet.processed]
+            if not pairs:
+                continue
+
+            processed, _ = self.analyzer.store_batch_results(
+                db,
+                [tweet for tweet, _ in pairs],
+                [result for _, result in pairs],
+                analysis_batch.max_engagement
+            )
+            processed_count += processed
+            analysis_batch.processed_count += processed
+            db.commit()
+
+        analysis_batch.status = "completed"
+        analysis_batch.completed_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Message batch {analysis_batch.batch_id} stored: {processed_count} tweets processed")
+
+    def fail(self, db: Session, analysis_batch: AnalysisBatch, error: str):
+        """
+        Give up on a batch; its unprocessed tweets are no longer claimed.
+
+        Args:
+            db: Database session
+            analysis_batch: Batch to mark failed
+            error: Reason, kept on the batch
+        """
+        analysis_batch.status = "failed"
+        analysis_batch.error = error[:500]
+        analysis_batch.completed_at = datetime.utcnow()
+        db.commit()
+        logger.warning(f"Message batch {analysis_batch.batch_id} failed: {error}")
+
+    async def cancel(self, db: Session, analysis_batch: AnalysisBatch) -> AnalysisBatch:
+        """
+        Cancel a batch still being processed by the API and abandon it.
+
+        Args:
+            db: Database session
+            analysis_batch: Open batch to abandon
+
+        Returns:
+            The failed batch
+
+        Raises:
+            ValueError: If the batch is not open
+        """
+        if analysis_batch.status not in OPEN_STATUSES:
+            raise ValueError(f"message batch {analysis_batch.batch_id} is {analysis_batch.status}")
+        if analysis_batch.status == "submitted":
+            try:
+                await self.analyzer.client.messages.batches.cancel(analysis_batch.batch_id)
+            except anthropic.NotFoundError:
+                pass  # Already gone; abandoning it is all that is left
+        self.fail(db, analysis_batch, "cancelled")
+        return analysis_batch
+
+    async def resume(self, db: Session) -> List[AnalysisBatch]:
+        """
+        Poll every open batch (e.g. after a restart).
+
+        Batches the API no longer knows, or older than the results retention,
+        are marked failed; other errors are kept on the batch and retried on
+        the next poll.
+
+        Args:
+            db: Database session
+
+        Returns:
+            The batches that were polled
+        """
+        batches = self.open_batches(db)
+        for analysis_batch in batches:
+            if datetime.utcnow() - analysis_batch.created_at > RESULTS_RETENTION:
+                self.fail(db, analysis_batch, "results past the API retention period")
+                continue
+            try:
+                await self.poll(db, analysis_batch)
+            except anthropic.NotFoundError as e:
+                db.rollback()
+                self.fail(db, analysis_batch, f"not found: {e}")
+            except Exception as e:
+                db.rollback()
+                analysis_batch.error = str(e)[:500]
+                db.commit()
+                logger.error(f"Failed to poll message batch {analysis_batch.batch_id}: {e}")
+        return batches
+
+    async def run(self, db: Session, batch_size: Optional[int] = None) -> Dict:
+        """
+        Poll open batches, then submit everything still pending.
+
+        Args:
+            db: Database session
+            batch_size: Tweets per prompt (default: packed by estimated tokens)
+
+        Returns:
+            Dictionary describing the polled and the newly submitted batch
+        """
+        polled = await self.resume(db)
+        submitted = await self.submit(db, batch_size=batch_size)
+        return {
+            "polled": [self.describe(batch) for batch in polled],
+            "submitted": self.describe(submitted) if submitted else None,
+        }
+
+    def describe(self, analysis_batch: AnalysisBatch) -> Dict:
+        """
+        Summarize a batch for API responses.
+
+        Args:
+            analysis_batch: Batch to describe
+
+        Returns:
+            Dictionary with the batch ID, status and counts
+        """
+        return {
+            "batch_id": analysis_batch.batch_id,
+            "status": analysis_batch.status,
+            "requests": analysis_batch.request_count,
+            "tweets": analysis_batch.tweet_count,
+            "succeeded": analysis_batch.succeeded_count,
+            "errored": analysis_batch.errored_count,
+            "processed": analysis_batch.processed_count,
+            "error": analysis_batch.error,
+            "created_at": analysis_batch.created_at.isoformat() if analysis_batch.created_at else None,
+            "completed_at": analysis_batch.completed_at.isoformat() if analysis_batch.completed_at else None,
+        }
+
+
+# Global batch analyzer instance
+batch_analyzer = BatchAnalyzer()
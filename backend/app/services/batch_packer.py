@@ -0,0 +1,150 @@
+"""
+Batch packer - Size analyzer prompts by estimated tokens instead of tweet count.
+Packs as many tweets per Claude call as fit an input token budget and the
+expected output (one JSON result per tweet) within claude_max_tokens, and
+tracks achieved tweets per call and tokens per tweet.
+"""
+from typing import List, Dict, Optional
+from loguru import logger
+
+from app.config import settings
+from app.models.tweet import Tweet
+
+# Characters per token for ASCII text; other characters count as one token each
+_CHARS_PER_TOKEN = 4
+
+# "Tweet N (ID: ...):" header and separators around each tweet in the prompt
+_TWEET_OVERHEAD_TOKENS = 12
+
+
+class BatchPacker:
+    """Token-budgeted packing of tweets into analysis requests."""
+
+    def __init__(self):
+        self.input_budget = settings.analyzer_input_token_budget
+        self.max_tweets = settings.analyzer_max_tweets_per_call
+        self.output_headroom = settings.analyzer_output_headroom
+        # Learned from responses (EWMA), seeded from settings
+        self.output_tokens_per_tweet = float(settings.analyzer_output_tokens_per_tweet)
+        self.stats = {
+            "calls": 0,
+            "tweets": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "truncated": 0,
+            "splits": 0,
+            "requeued": 0,
+        }
+
+    def estimate_input_tokens(self, tweet: Tweet) -> int:
+        """
+        Estimate the prompt tokens one tweet adds.
+
+        Args:
+            tweet: Tweet to estimate
+
+        Returns:
+            Estimated input tokens
+        """
+        text = tweet.text or ""
+        ascii_chars = sum(1 for ch in text if ch.isascii())
+        return _TWEET_OVERHEAD_TOKENS + ascii_chars // _CHARS_PER_TOKEN + (len(text) - ascii_chars)
+
+    def estimate_output_tokens(self, tweet: Tweet) -> int:
+        """
+        Estimate the reply tokens one tweet's JSON result takes.
+
+        Args:
+            tweet: Tweet to estimate
+
+        Returns:
+            Estimated output tokens
+        """
+        return int(self.output_tokens_per_tweet) + 1
+
+    def pack(self, tweets: List[Tweet], max_tokens: Optional[int] = None) -> List[List[Tweet]]:
+        """
+        Split tweets into requests that fit the token budgets, keeping order.
+
+        Args:
+            tweets: Tweets to analyze
+            max_tokens: Output token limit per call (defaults to settings.claude_max_tokens)
+
+        Returns:
+            List of batches (a tweet larger than the budget gets a batch of its own)
+        """
+        output_budget = (max_tokens or settings.claude_max_tokens) * self.output_headroom
+
+        batches: List[List[Tweet]] = []
+        current: List[Tweet] = []
+        input_tokens = output_tokens = 0
+        for tweet in tweets:
+            tweet_input = self.estimate_input_tokens(tweet)
+            tweet_output = self.estimate_output_tokens(tweet)
+            if current and (
+                len(current) >= self.max_tweets
+                or input_tokens + tweet_input > self.input_budget
+                or output_tokens + tweet_output > output_budget
+            ):
+                batches.append(current)
+                current, input_tokens, output_tokens = [], 0, 0
+            current.append(tweet)
+            input_tokens += tweet_input
+            output_tokens += tweet_output
+        if current:
+            batches.append(current)
+
+        logger.debug(f"Packed {len(tweets)} tweets into {len(batches)} requests")
+        return batches
+
+    def record_call(self, tweet_count: int, usage, truncated: bool = False):
+        """
+        Record a completed analysis call.
+
+        Args:
+            tweet_count: Tweets that got a result from the reply
+            usage: Response usage (input_tokens, output_tokens), may be None
+            truncated: Whether the reply hit max_tokens
+        """
+        self.stats["calls"] += 1
+        self.stats["tweets"] += tweet_count
+        if truncated:
+            self.stats["truncated"] += 1
+        if usage is None:
+            return
+
+        self.stats["input_tokens"] += usage.input_tokens
+        self.stats["output_tokens"] += usage.output_tokens
+        if not truncated and tweet_count:
+            alpha = settings.analyzer_output_estimate_smoothing
+            observed = usage.output_tokens / tweet_count
+            self.output_tokens_per_tweet = alpha * observed + (1 - alpha) * self.output_tokens_per_tweet
+
+    def record_split(self):
+        """Record a truncated request being split in two."""
+        self.stats["splits"] += 1
+
+    def record_requeue(self, tweet_count: int):
+        """Record tweets re-requested because a reply left them without a result."""
+        self.stats["requeued"] += tweet_count
+
+    def get_stats(self) -> Dict:
+        """
+        Get packing efficiency counters since startup.
+
+        Returns:
+            Dictionary with call/tweet/token totals, tweets per call and tokens per tweet
+        """
+        calls = self.stats["calls"]
+        tweets = self.stats["tweets"]
+        return {
+            **self.stats,
+            "tweets_per_call": round(tweets / calls, 2) if calls else None,
+            "input_tokens_per_tweet": round(self.stats["input_tokens"] / tweets, 1) if tweets else None,
+            "output_tokens_per_tweet": round(self.stats["output_tokens"] / tweets, 1) if tweets else None,
+            "output_estimate_per_tweet": round(self.output_tokens_per_tweet, 1),
+        }
+
+
+# Global batch packer instance
+batch_packer = BatchPacker()
@@ -0,0 +1,354 @@
+"""
+Engagement normalizer - Score engagement against rolling percentiles.
+Keeps a daily histogram of engagement scores in log-scale buckets
+(engagement_histogram), updated as tweets are inserted. The buckets of the
+last engagement_window_days are summed in memory, so a tweet's engagement
+percentile is a constant-time lookup and importance scores are comparable
+no matter which batch a tweet was analyzed in. When the metric refresh
+rewrites a tweet's engagement score, its count moves to the new bucket, so
+the window reflects mature engagement rather than scores at insert time.
+"""
+import math
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from loguru import logger
+from sqlalchemy import case, event, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.engagement_histogram import EngagementHistogramBucket
+from app.models.tweet import Tweet
+
+# Four buckets per doubling of (1 + engagement), up to 2**32
+BUCKETS_PER_OCTAVE = 4
+BUCKET_COUNT = 128
+
+# Reload the window from the database (other processes' tweets, days aging out)
+_REFRESH_INTERVAL = timedelta(minutes=10)
+
+# Session.info key of increments applied to the loaded window once the session commits
+_PENDING_KEY = "engagement_histogram_pending"
+
+
+def _apply_pending(session: Session):
+    """after_commit listener: apply the session's increments to the loaded windows."""
+    pending = session.info.pop(_PENDING_KEY, [])
+    for normalizer, increments in pending:
+        normalizer._apply(increments)
+
+
+def _discard_pending(session: Session):
+    """after_rollback listener: the increments never reached the database."""
+    session.info.pop(_PENDING_KEY, None)
+
+
+def bucket_position(engagement_score: float) -> float:
+    """Fractional bucket of an engagement score on the log scale."""
+    return math.log2(1 + max(engagement_score or 0.0, 0.0)) * BUCKETS_PER_OCTAVE
+
+
+def bucket_for(engagement_score: float) -> int:
+    """
+    Histogram bucket of an engagement score.
+
+    Args:
+        engagement_score: Tweet engagement score
+
+    Returns:
+        Bucket index in [0, BUCKET_COUNT)
+    """
+    return min(BUCKET_COUNT - 1, int(bucket_position(engagement_score)))
+
+
+class EngagementNormalizer:
+    """Rolling engagement histogram and percentile lookups."""
+
+    def __init__(self):
+        self.enabled = settings.engagement_normalization_enabled
+        self.window_days = settings.engagement_window_days
+        self.min_samples = settings.engagement_min_samples
+        self._counts: List[int] = [0] * BUCKET_COUNT
+        self._below: Optional[List[int]] = None  # Tweets in lower buckets, rebuilt lazily
+        self._total = 0
+        self._loaded_at: Optional[datetime] = None
+
+    def _window_start(self, now: Optional[datetime] = None) -> date:
+        return (now or datetime.utcnow()).date() - timedelta(days=self.window_days - 1)
+
+    def record(self, db: Session, tweets: Iterable[Tuple[datetime, float]]):
+        """
+        Add newly inserted tweets to the histogram.
+
+        Args:
+            db: Database session (not committed)
+            tweets: (created_at, engagement_score) of each new tweet
+        """
+        if not self.enabled:
+            return
+        self._add(db, self._bucket_counts(tweets))
+
+    def move(self, db: Session, changes: Iterable[Tuple[datetime, float, float]]) -> int:
+        """
+        Move re-scored tweets from their old bucket to their new one.
+
+        Args:
+            db: Database session (not committed)
+            changes: (created_at, old engagement_score, new engagement_score)
+                of each tweet whose score changed
+
+        Returns:
+            Number of tweets that changed bucket
+        """
+        if not self.enabled:
+            return 0
+        increments: Dict[Tuple[date, int], int] = {}
+        moved = 0
+        for created_at, old_score, new_score in changes:
+            old_bucket, new_bucket = bucket_for(old_score), bucket_for(new_score)
+            if old_bucket == new_bucket:
+                continue
+            day = created_at.date()
+            increments[(day, old_bucket)] = increments.get((day, old_bucket), 0) - 1
+            increments[(day, new_bucket)] = increments.get((day, new_bucket), 0) + 1
+            moved += 1
+        self._add(db, {key: count for key, count in increments.items() if count})
+        return moved
+
+    @staticmethod
+    def _bucket_counts(tweets: Iterable[Tuple[datetime, float]]) -> Dict[Tuple[date, int], int]:
+        counts: Dict[Tuple[date, int], int] = {}
+        for created_at, engagement_score in tweets:
+            key = (created_at.date(), bucket_for(engagement_score))
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def _add(self, db: Session, increments: Dict[Tuple[date, int], int]):
+        """
+        Apply (day, bucket) increments in the database; the loaded window
+        follows once the session commits.
+        """
+        if not increments:
+            return
+
+        rows = [
+            {"day": day, "bucket": bucket, "tweet_count": count}
+            for (day, bucket), count in increments.items() if count > 0
+        ]
+        dialect = db.get_bind().dialect.name
+        if rows and dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(EngagementHistogramBucket).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EngagementHistogramBucket.day, EngagementHistogramBucket.bucket],
+                set_={"tweet_count": EngagementHistogramBucket.tweet_count + stmt.excluded.tweet_count}
+            )
+            db.execute(stmt)
+        else:
+            for row in rows:
+                updated = db.query(EngagementHistogramBucket).filter(
+                    EngagementHistogramBucket.day == row["day"],
+                    EngagementHistogramBucket.bucket == row["bucket"]
+                ).update(
+                    {"tweet_count": EngagementHistogramBucket.tweet_count + row["tweet_count"]},
+                    synchronize_session=False
+                )
+                if not updated:
+                    db.add(EngagementHistogramBucket(**row))
+
+        # Decrements (moved tweets) never create rows or go below zero
+        for (day, bucket), count in increments.items():
+            if count < 0:
+                db.query(EngagementHistogramBucket).filter(
+                    EngagementHistogramBucket.day == day,
+                    EngagementHistogramBucket.bucket == bucket
+                ).update(
+                    {"tweet_count": case(
+                        (EngagementHistogramBucket.tweet_count > -count, EngagementHistogramBucket.tweet_count + count),
+                        else_=0
+                    )},
+                    synchronize_session=False
+                )
+
+        # Keep the loaded window current without waiting for the next refresh,
+        # but only once the changes are committed
+        if self._loaded_at is not None:
+            if not event.contains(db, "after_commit", _apply_pending):
+                event.listen(db, "after_commit", _apply_pending)
+                event.listen(db, "after_rollback", _discard_pending)
+            db.info.setdefault(_PENDING_KEY, []).append((self, increments))
+
+    def _apply(self, increments: Dict[Tuple[date, int], int]):
+        """Apply committed increments to the loaded window."""
+        if self._loaded_at is None:
+            return
+        start = self._window_start()
+        for (day, bucket), count in increments.items():
+            if day >= start:
+                count = max(count, -self._counts[bucket])
+                self._counts[bucket] += count
+                self._total += count
+        self._below = None
+
+    def refresh(self, db: Session, now: Optional[datetime] = None):
+        """
+        Reload the window's bucket totals and drop days that left it.
+
+        Args:
+            db: Database session (not committed)
+            now: Reference time (defaults to utcnow)
+        """
+        now = now or datetime.utcnow()
+        start = self._window_start(now)
+
+        counts = [0] * BUCKET_COUNT
+        rows = db.query(
+            EngagementHistogramBucket.bucket,
+            func.sum(EngagementHistogramBucket.tweet_count)
+        ).filter(EngagementHistogramBucket.day >= start).group_by(EngagementHistogramBucket.bucket)
+        for bucket, count in rows:
+            counts[bucket] = int(count or 0)
+
+        self._counts = counts
+        self._total = sum(counts)
+        self._below = None
+        self._loaded_at = now
+        # The reload already includes this session's uncommitted increments
+        if db.info.get(_PENDING_KEY):
+            db.info[_PENDING_KEY] = [pending for pending in db.info[_PENDING_KEY] if pending[0] is not self]
+
+        db.query(EngagementHistogramBucket).filter(
+            EngagementHistogramBucket.day < start
+        ).delete(synchronize_session=False)
+
+    def refresh_if_stale(self, db: Session):
+        """
+        Refresh the window if it was never loaded or is older than the refresh interval.
+
+        Failures are logged; scoring then falls back to the batch maximum.
+
+        Args:
+            db: Database session
+        """
+        if not self.enabled:
+            return
+        if self._loaded_at is not None and datetime.utcnow() - self._loaded_at < _REFRESH_INTERVAL:
+            return
+        try:
+            self.refresh(db)
+        except Exception as e:
+            logger.warning(f"Engagement histogram refresh failed: {e}")
+
+    @property
+    def ready(self) -> bool:
+        """Whether the window holds enough tweets for percentiles."""
+        return self.enabled and self._total >= self.min_samples
+
+    def percentile(self, engagement_score: float) -> Optional[float]:
+        """
+        Share of tweets in the window with lower engagement.
+
+        Args:
+            engagement_score: Tweet engagement score
+
+        Returns:
+            Percentile in [0, 1], or None until the window has min_samples tweets
+        """
+        if not self.ready:
+            return None
+        if self._below is None:
+            self._below = [0] + list(accumulate(self._counts))[:-1]
+
+        position = bucket_position(engagement_score)
+        bucket = min(BUCKET_COUNT - 1, int(position))
+        within = min(1.0, position - bucket)
+        return (self._below[bucket] + self._counts[bucket] * within) / self._total
+
+    def normalize(self, engagement_score: float) -> Optional[float]:
+        """
+        Engagement on the 0-10 scale used by the importance score.
+
+        Args:
+            engagement_score: Tweet engagement score
+
+        Returns:
+            Percentile * 10, or None until the window has min_samples tweets
+        """
+        percentile = self.percentile(engagement_score)
+        return None if percentile is None else percentile * 10
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Engagement score at a quantile of the window (inverse of percentile).
+
+        Args:
+            q: Quantile in [0, 1]
+
+        Returns:
+            Estimated engagement score, or None if the window is empty
+        """
+        if not self._total:
+            return None
+        target = q * self._total
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            if count and seen + count >= target:
+                position = bucket + (target - seen) / count
+                return round(2 ** (position / BUCKETS_PER_OCTAVE) - 1, 1)
+            seen += count
+        return round(2 ** (BUCKET_COUNT / BUCKETS_PER_OCTAVE) - 1, 1)
+
+    def backfill(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Rebuild the histogram from the tweets created inside the window.
+
+        Used when normalization is first enabled, or after bulk imports.
+
+        Args:
+            db: Database session (committed before returning)
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            Number of tweets counted
+        """
+        now = now or datetime.utcnow()
+        start = self._window_start(now)
+        rows = db.query(Tweet.created_at, Tweet.engagement_score).filter(
+            Tweet.created_at >= datetime.combine(start, datetime.min.time())
+        ).execution_options(yield_per=5000)
+        increments = self._bucket_counts(rows)
+        counted = sum(increments.values())
+
+        db.query(EngagementHistogramBucket).delete(synchronize_session=False)
+        self._loaded_at = None  # Don't add the rebuilt counts to the old window
+        self._add(db, increments)
+
+        self.refresh(db, now)
+        db.commit()
+        logger.info(f"Engagement histogram rebuilt from {counted} tweets")
+        return counted
+
+    def get_stats(self) -> Dict:
+        """
+        Describe the loaded window.
+
+        Returns:
+            Dictionary with sample count, readiness and engagement quantiles
+        """
+        return {
+            "enabled": self.enabled,
+            "window_days": self.window_days,
+            "samples": self._total,
+            "min_samples": self.min_samples,
+            "ready": self.ready,
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "quantiles": {
+                f"p{int(q * 100)}": self.quantile(q) for q in (0.5, 0.9, 0.99)
+            },
+        }
+
+
+# Global engagement normalizer instance
+engagement_normalizer = EngagementNormalizer()
@@ -0,0 +1,252 @@
+"""
+LLM gateway - One pooled Anthropic client for every Claude call site.
+The analyzer, aggregator and report editor share a single AsyncAnthropic
+client whose connection pool, timeout and retry policy come from settings,
+so keep-alive connections are reused across services and the proxy
+base_url is honoured everywhere. Each call site has a profile with its
+model, max_tokens and rate-limiter priority; every call passes through the
+process-wide LLMRateLimiter, which also owns retries, and is recorded by
+LLMTelemetry with the call site as its stage.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from loguru import logger
+import anthropic
+import httpx
+
+from app.config import settings
+from app.services.llm_rate_limiter import BULK, INTERACTIVE, LLMRateLimiter, estimate_request_tokens
+from app.services.llm_telemetry import LLMTelemetry, llm_telemetry
+
+
+def _default_profiles() -> Dict[str, Dict]:
+    """Model, max_tokens and priority of each call site, with per-site overrides from settings."""
+    return {
+        "analysis": {"model": settings.claude_model, "max_tokens": settings.claude_max_tokens, "priority": BULK},
+        "translation": {
+            "model": settings.llm_translation_model or settings.claude_model,
+            "max_tokens": settings.llm_translation_max_tokens,
+            "priority": BULK,
+        },
+        "summary": {
+            "model": settings.llm_summary_model or settings.claude_model,
+            "max_tokens": settings.llm_summary_max_tokens,
+            "priority": INTERACTIVE,
+        },
+        "report": {
+            "model": settings.llm_report_model or settings.claude_model,
+            "max_tokens": settings.llm_report_max_tokens,
+            "priority": INTERACTIVE,
+        },
+        "health_check": {"model": settings.claude_model, "max_tokens": 100, "priority": INTERACTIVE},
+    }
+
+
+class LLMGateway:
+    """Shared Anthropic client and per-call-site request defaults."""
+
+    def __init__(
+        self,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        limiter: Optional[LLMRateLimiter] = None,
+        telemetry: Optional[LLMTelemetry] = None
+    ):
+        """
+        Args:
+            client: Async Anthropic client to use instead of the pooled one
+                built from settings (e.g. FakeMessagesAPI.client() in tests)
+            limiter: Rate limiter for this gateway's calls (defaults to one
+                built from settings)
+            telemetry: Recorder for this gateway's calls (none by default;
+                the global gateway records to llm_telemetry)
+        """
+        self._client = client
+        self.limiter = limiter or LLMRateLimiter()
+        self.telemetry = telemetry
+        self.profiles = _default_profiles()
+
+    def _build_client(self) -> anthropic.AsyncAnthropic:
+        """Create the pooled client used for all Claude calls."""
+        client_kwargs = {
+            "api_key": settings.anthropic_api_key,
+            "timeout": settings.llm_timeout,
+            # The rate limiter retries, so the SDK only does when it is disabled
+            "max_retries": 0 if self.limiter.enabled else settings.llm_max_retries,
+            "http_client": httpx.AsyncClient(
+                timeout=settings.llm_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_keepalive_connections,
+                    keepalive_expiry=settings.llm_keepalive_expiry,
+                ),
+            ),
+        }
+        # Optional base_url for proxy/relay
+        if settings.anthropic_base_url:
+            client_kwargs["base_url"] = settings.anthropic_base_url
+        return anthropic.AsyncAnthropic(**client_kwargs)
+
+    @property
+    def client(self) -> anthropic.AsyncAnthropic:
+        """Shared client, created on first use."""
+        if self._client is None or self._client.is_closed():
+            self._client = self._build_client()
+        return self._client
+
+    def use_client(self, client: Optional[anthropic.AsyncAnthropic]):
+        """
+        Swap the backend, e.g. for a fake API; None rebuilds from settings on next use.
+
+        Args:
+            client: Async Anthropic client
+        """
+        self._client = client
+
+    def profile(self, site: str) -> Dict:
+        """
+        Request defaults of a call site.
+
+        Args:
+            site: Call site name (analysis, translation, summary, report, health_check)
+
+        Returns:
+            Dictionary with model and max_tokens
+
+        Raises:
+            KeyError: For an unknown call site
+        """
+        profile = self.profiles[site]
+        return {"model": profile["model"], "max_tokens": profile["max_tokens"]}
+
+    def request(self, site: str, messages: List[Dict], **params) -> Dict:
+        """
+        Build Messages API parameters from a call site's profile.
+
+        Args:
+            site: Call site name
+            messages: Conversation messages
+            **params: Extra or overriding parameters (system, tools, max_tokens, ...)
+
+        Returns:
+            Keyword arguments for messages.create / messages.stream
+        """
+        return {**self.profile(site), "messages": messages, **params}
+
+    async def create(self, site: str, messages: List[Dict], **params):
+        """
+        Send one Messages API request for a call site.
+
+        Args:
+            site: Call site name
+            messages: Conversation messages
+            **params: Extra or overriding parameters
+
+        Returns:
+            anthropic Message
+        """
+        request = self.request(site, messages, **params)
+
+        async def send():
+            response = await self.client.messages.with_raw_response.create(**request)
+            self.limiter.observe(response.headers)
+            return response.parse()
+
+        return await self._call(site, request, send)
+
+    async def stream(self, site: str, params: Dict) -> Tuple[object, Optional[str]]:
+        """
+        Stream one Messages API request for a call site, keeping the raw tool input JSON.
+
+        Args:
+            site: Call site name (for its priority and telemetry stage)
+            params: Complete Messages API parameters
+
+        Returns:
+            Tuple of (final message, raw tool input JSON or None for a text reply)
+        """
+        raw_input: List[str] = []
+
+        async def send():
+            raw_input.clear()
+            async with self.client.messages.stream(**params) as stream:
+                self.limiter.observe(stream.response.headers)
+                async for event in stream:
+                    if event.type == "input_json":
+                        raw_input.append(event.partial_json)
+                return await stream.get_final_message()
+
+        message = await self._call(site, params, send)
+        return message, "".join(raw_input) if raw_input else None
+
+    async def _call(self, site: str, params: Dict, send: Callable[[], Awaitable]):
+        """
+        Make a call through the rate limiter and record its telemetry.
+
+        Args:
+            site: Call site name
+            params: Messages API parameters (for the token estimate and model)
+            send: Zero-argument coroutine factory making one attempt
+
+        Returns:
+            anthropic Message
+        """
+        reserved = estimate_request_tokens(params)
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            message = await send()
+            self.limiter.settle(reserved, message.usage)
+            return message
+
+        started = time.monotonic()
+        try:
+            message = await self.limiter.run(attempt, reserved, self.profiles[site]["priority"])
+        except Exception as e:
+            self._record(site, params, None, started, attempts, f"{type(e).__name__}: {e}")
+            raise
+        self._record(site, params, message.usage, started, attempts)
+        return message
+
+    def _record(self, site: str, params: Dict, usage, started: float, attempts: int, error: Optional[str] = None):
+        if self.telemetry is None:
+            return
+        self.telemetry.record(
+            stage=site,
+            model=params.get("model"),
+            usage=usage,
+            latency_ms=int((time.monotonic() - started) * 1000),
+            retries=max(attempts - 1, 0),
+            error=error,
+        )
+
+    async def complete(self, site: str, prompt: str, system: Optional[str] = None) -> str:
+        """
+        Send a single user prompt and return the reply text.
+
+        Args:
+            site: Call site name
+            prompt: User prompt
+            system: Optional system prompt
+
+        Returns:
+            Stripped text of the first content block
+        """
+        params = {"system": system} if system else {}
+        message = await self.create(site, [{"role": "user", "content": prompt}], **params)
+        return message.content[0].text.strip()
+
+    async def close(self):
+        """Close the shared client's HTTP connections and write buffered telemetry (called from the FastAPI lifespan)."""
+        if self._client is not None and not self._client.is_closed():
+            await self._client.close()
+            logger.info("LLM client closed")
+        self._client = None
+        if self.telemetry is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.telemetry.flush)
+
+
+# Global LLM gateway instance
+llm_gateway = LLMGateway(telemetry=llm_telemetry)
@@ -0,0 +1,279 @@
+"""
+LLM rate limiter - Keep all Claude calls of the process within the API limits.
+Requests-per-minute and tokens-per-minute token buckets, adapted from the
+anthropic-ratelimit-* response headers. Waiting calls are served by priority
+(interactive work such as report generation before bulk analysis), and
+rate-limited or transiently failed calls are retried with backoff instead of
+being dropped.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, TypeVar
+
+import anthropic
+from loguru import logger
+
+from app.config import settings
+from app.services.request_engine import TokenBucket, parse_retry_after
+
+# Call priorities (lower is served first)
+INTERACTIVE = 0
+BULK = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+# Rate limiting, server errors and Anthropic's "overloaded"
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 529})
+
+# Characters per token for ASCII text; other characters count as one token each
+_CHARS_PER_TOKEN = 4
+
+T = TypeVar("T")
+
+
+def estimate_request_tokens(params: Dict) -> int:
+    """
+    Estimate the input tokens of a Messages API request.
+
+    Args:
+        params: Messages API parameters
+
+    Returns:
+        Estimated input tokens of the system prompt, messages and tools
+    """
+    parts = [params.get("system") or ""]
+    for message in params.get("messages", []):
+        content = message.get("content", "")
+        parts.append(content if isinstance(content, str) else json.dumps(content, ensure_ascii=False))
+    if params.get("tools"):
+        parts.append(json.dumps(params["tools"]))
+    text = "".join(str(part) for part in parts)
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return ascii_chars // _CHARS_PER_TOKEN + (len(text) - ascii_chars) + 1
+
+
+def _seconds_until(reset: str) -> Optional[float]:
+    """Seconds until an RFC 3339 reset time, or None if it does not parse."""
+    try:
+        when = datetime.fromisoformat(reset.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class LLMRateLimiter:
+    """Priority-ordered RPM/TPM limiter with retries for Claude calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Args:
+            requests_per_minute: Starting request limit (defaults to settings;
+                replaced by the API's rate-limit headers)
+            tokens_per_minute: Starting token limit (defaults to settings)
+            max_retries: Retries for 429/5xx/connection errors
+            backoff_base: Seconds, doubled per attempt (with jitter)
+            backoff_max: Maximum backoff in seconds
+            enabled: Whether calls are throttled and retried here
+        """
+        rpm = requests_per_minute or settings.llm_requests_per_minute
+        tpm = tokens_per_minute or settings.llm_tokens_per_minute
+        self.requests = TokenBucket(rpm / 60, rpm)
+        self.tokens = TokenBucket(tpm / 60, tpm)
+        self.max_retries = settings.llm_max_retries if max_retries is None else max_retries
+        self.backoff_base = settings.llm_backoff_base if backoff_base is None else backoff_base
+        self.backoff_max = settings.llm_backoff_max if backoff_max is None else backoff_max
+        self.enabled = settings.llm_rate_limit_enabled if enabled is None else enabled
+
+        # Waiting calls as [priority, sequence, wake-up future]; the head may take capacity
+        self._waiters: List[List] = []
+        self._sequence = itertools.count()
+
+        self.stats = {
+            "calls": 0,
+            "retries": 0,
+            "retries_by_reason": {},
+            "gave_up": 0,
+            "throttled": {name: 0 for name in PRIORITY_NAMES.values()},
+            "wait_seconds": {name: 0.0 for name in PRIORITY_NAMES.values()},
+        }
+
+    def _wake_head(self):
+        if self._waiters:
+            future = self._waiters[0][2]
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    async def acquire(self, tokens: int, priority: int = BULK) -> float:
+        """
+        Wait for one request and ``tokens`` tokens, behind any higher-priority call.
+
+        Args:
+            tokens: Estimated tokens of the call
+            priority: INTERACTIVE or BULK
+
+        Returns:
+            Seconds spent waiting
+        """
+        # A call larger than the whole minute's budget waits for a full bucket
+        tokens = min(tokens, self.tokens.capacity)
+        entry = [priority, next(self._sequence), None]
+        heapq.heappush(self._waiters, entry)
+        self._wake_head()  # A previous head that is now behind this call re-queues itself
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            while True:
+                timeout = None
+                if self._waiters[0] is entry:
+                    timeout = max(self.requests.delay(1), self.tokens.delay(tokens))
+                    if timeout == 0:
+                        break
+                entry[2] = loop.create_future()
+                await asyncio.wait([entry[2]], timeout=timeout)
+        finally:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._wake_head()
+
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+        waited = time.monotonic() - started
+        name = PRIORITY_NAMES.get(priority, "bulk")
+        if waited > 0.001:
+            self.stats["throttled"][name] += 1
+            self.stats["wait_seconds"][name] += waited
+        return waited
+
+    def observe(self, headers: Mapping[str, str]):
+        """
+        Adapt the buckets to the anthropic-ratelimit-* headers of a response.
+
+        Args:
+            headers: Response headers
+        """
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = headers.get(f"anthropic-ratelimit-{kind}-limit")
+            remaining = headers.get(f"anthropic-ratelimit-{kind}-remaining")
+            reset = headers.get(f"anthropic-ratelimit-{kind}-reset")
+            try:
+                if limit and float(limit) != bucket.capacity:
+                    bucket.set_limit(float(limit) / 60, float(limit))
+                    logger.info(f"Claude {kind} limit is {limit} per minute")
+                if remaining is not None:
+                    bucket.cap_available(float(remaining))
+                    if float(remaining) <= 0 and reset:
+                        delay = _seconds_until(reset)
+                        if delay:
+                            bucket.pause_until(time.monotonic() + delay)
+            except ValueError:
+                continue
+
+    def settle(self, reserved: int, usage) -> None:
+        """
+        Replace a call's token estimate with its actual usage.
+
+        Args:
+            reserved: Tokens taken in acquire()
+            usage: Message usage (input_tokens, output_tokens), or None
+        """
+        if usage is None:
+            return
+        used = (usage.input_tokens or 0) + (usage.output_tokens or 0)
+        if used > reserved:
+            self.tokens.take(used - reserved)
+        else:
+            self.tokens.give_back(reserved - used)
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def run(self, send: Callable[[], Awaitable[T]], tokens: int, priority: int = BULK) -> T:
+        """
+        Make a Claude call within the limits, retrying rate limits and transient errors.
+
+        Args:
+            send: Zero-argument coroutine factory making the call
+            tokens: Estimated tokens of the call
+            priority: INTERACTIVE or BULK
+
+        Returns:
+            Result of ``send``
+
+        Raises:
+            anthropic.APIError: The last error once retries are exhausted, or
+                any non-retryable error
+        """
+        if not self.enabled:
+            return await send()
+
+        self.stats["calls"] += 1
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(tokens, priority)
+
+            delay = None
+            try:
+                return await send()
+            except anthropic.APIStatusError as e:
+                if e.status_code not in RETRYABLE_STATUS_CODES:
+                    raise
+                if attempt == self.max_retries:
+                    self.stats["gave_up"] += 1
+                    raise
+                reason = str(e.status_code)
+                self.observe(e.response.headers)
+                delay = parse_retry_after(e.response)
+                if e.status_code == 429:
+                    # The call was not served, and everyone waiting should hold off
+                    self.tokens.give_back(tokens)
+                    if delay:
+                        self.requests.pause_until(time.monotonic() + delay)
+            except anthropic.APIConnectionError as e:
+                if attempt == self.max_retries:
+                    self.stats["gave_up"] += 1
+                    raise
+                reason = type(e).__name__
+
+            delay = max(delay or 0.0, self._backoff(attempt))
+            self.stats["retries"] += 1
+            self.stats["retries_by_reason"][reason] = self.stats["retries_by_reason"].get(reason, 0) + 1
+            logger.warning(f"Retrying Claude call in {delay:.1f}s after {reason} (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict:
+        """
+        Get limiter state and retry counts.
+
+        Returns:
+            Dictionary with current limits, waiting calls and retries
+        """
+        waiting = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, _ in self._waiters:
+            waiting[PRIORITY_NAMES.get(priority, "bulk")] += 1
+        return {
+            "enabled": self.enabled,
+            "limits_per_minute": {"requests": self.requests.capacity, "tokens": self.tokens.capacity},
+            "available": {
+                "requests": self.requests.get_stats()["available_tokens"],
+                "tokens": self.tokens.get_stats()["available_tokens"],
+            },
+            "waiting": waiting,
+            **self.stats,
+            "wait_seconds": {name: round(value, 3) for name, value in self.stats["wait_seconds"].items()},
+        }
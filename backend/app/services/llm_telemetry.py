@@ -0,0 +1,295 @@
+"""
+LLM telemetry - Record every Claude call and roll usage up by day and stage.
+The gateway records model, input/output/cache tokens, latency and retries
+of each call into llm_calls; Message Batch results are recorded as the
+analysis_batch stage. Daily rollups add an estimated cost from list prices,
+so token budgets and the effect of batching and caching can be measured.
+Gateway calls are buffered and written in bulk from an executor thread, so
+recording never blocks the event loop on the database.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import func, case, insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.llm_call import LLMCall
+
+# List prices in USD per million input/output tokens, matched by model name
+# prefix. Listed per model (most specific prefix first) rather than per family,
+# since prices change between generations; unknown models get no estimate.
+MODEL_PRICES = (
+    ("claude-opus-4-5", 5.0, 25.0),
+    ("claude-opus-4-1", 15.0, 75.0),
+    ("claude-opus-4", 15.0, 75.0),
+    ("claude-sonnet-4-5", 3.0, 15.0),
+    ("claude-sonnet-4", 3.0, 15.0),
+    ("claude-haiku-4-5", 1.0, 5.0),
+    ("claude-3-7-sonnet", 3.0, 15.0),
+    ("claude-3-5-sonnet", 3.0, 15.0),
+    ("claude-3-5-haiku", 0.8, 4.0),
+    ("claude-3-opus", 15.0, 75.0),
+    ("claude-3-haiku", 0.25, 1.25),
+)
+
+# Prompt caching: writes cost 1.25x the input price, reads 0.1x
+_CACHE_WRITE_FACTOR = 1.25
+_CACHE_READ_FACTOR = 0.1
+
+# Message Batches are billed at half price
+_BATCH_DISCOUNT = 0.5
+BATCH_STAGE = "analysis_batch"
+
+# Minimum time between retention pruning passes
+_PRUNE_INTERVAL = timedelta(hours=1)
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_creation_input_tokens: int = 0,
+    cache_read_input_tokens: int = 0,
+    batch: bool = False
+) -> Optional[float]:
+    """
+    Estimate the cost of Claude usage from list prices.
+
+    Args:
+        model: Model name
+        input_tokens: Uncached input tokens
+        output_tokens: Output tokens
+        cache_creation_input_tokens: Input tokens written to the prompt cache
+        cache_read_input_tokens: Input tokens read from the prompt cache
+        batch: Whether the usage was billed through Message Batches
+
+    Returns:
+        Cost in USD, or None for a model without a known price
+    """
+    for prefix, input_price, output_price in MODEL_PRICES:
+        if model.startswith(prefix):
+            break
+    else:
+        return None
+
+    cost = (
+        input_tokens * input_price
+        + cache_creation_input_tokens * input_price * _CACHE_WRITE_FACTOR
+        + cache_read_input_tokens * input_price * _CACHE_READ_FACTOR
+        + output_tokens * output_price
+    ) / 1_000_000
+    return cost * _BATCH_DISCOUNT if batch else cost
+
+
+class LLMTelemetry:
+    """Per-call Claude telemetry in the llm_calls table."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        """
+        Args:
+            session_factory: Opens the sessions used to write calls
+        """
+        self.session_factory = session_factory
+        self.enabled = settings.llm_telemetry_enabled
+        self.retention = timedelta(days=settings.llm_telemetry_retention_days)
+        self.flush_size = settings.llm_telemetry_flush_size
+        self.flush_interval = settings.llm_telemetry_flush_interval
+        self._last_pruned: Optional[datetime] = None
+
+        # Calls waiting to be written, swapped out under the lock by flush()
+        self._buffer: List[Dict] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_future: Optional[asyncio.Future] = None
+
+    def record(
+        self,
+        stage: str,
+        model: str,
+        usage=None,
+        latency_ms: Optional[int] = None,
+        retries: int = 0,
+        error: Optional[str] = None,
+        db: Optional[Session] = None
+    ):
+        """
+        Record one Claude call. Failures are logged, never raised.
+
+        Without ``db`` the call is buffered; a full or old buffer is flushed
+        in the event loop's default executor (or right away outside a loop).
+
+        Args:
+            stage: Calling stage (gateway call site)
+            model: Requested model
+            usage: Message usage, or None if the call failed
+            latency_ms: Wall time including rate-limit waits and retries
+            retries: Attempts after the first
+            error: Error of a failed call
+            db: Session to add the row to (the caller commits); buffered
+                and written with a session of its own when omitted
+        """
+        if not self.enabled:
+            return
+
+        call = dict(
+            stage=stage,
+            model=model or "unknown",
+            status="error" if error else "ok",
+            input_tokens=getattr(usage, "input_tokens", None) or 0,
+            output_tokens=getattr(usage, "output_tokens", None) or 0,
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", None) or 0,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", None) or 0,
+            latency_ms=latency_ms,
+            retries=retries,
+            error=error[:255] if error else None,
+            created_at=datetime.utcnow(),
+        )
+        if db is not None:
+            db.add(LLMCall(**call))
+            return
+
+        with self._buffer_lock:
+            self._buffer.append(call)
+            due = len(self._buffer) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval
+        if not due:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_future is None or self._flush_future.done():
+            self._flush_future = loop.run_in_executor(None, self.flush)
+
+    def flush(self) -> int:
+        """
+        Write buffered calls in one bulk insert (blocking; also called at shutdown).
+
+        Returns:
+            Number of calls written
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                calls, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if not calls:
+                return 0
+
+            db = self.session_factory()
+            try:
+                db.execute(insert(LLMCall), calls)
+                self._prune_if_due(db)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Failed to record {len(calls)} LLM calls of telemetry: {e}")
+                return 0
+            finally:
+                db.close()
+            return len(calls)
+
+    def _prune_if_due(self, db: Session):
+        """Delete calls older than the retention period, at most once per interval."""
+        now = datetime.utcnow()
+        if self._last_pruned is not None and now - self._last_pruned < _PRUNE_INTERVAL:
+            return
+        self._last_pruned = now
+        db.query(LLMCall).filter(LLMCall.created_at < now - self.retention).delete(synchronize_session=False)
+
+    def daily_rollups(self, db: Session, days: int = 7, stage: Optional[str] = None) -> List[Dict]:
+        """
+        Aggregate calls per day, stage and model.
+
+        Args:
+            db: Database session
+            days: Number of days back, including today (UTC)
+            stage: Only this stage
+
+        Returns:
+            List of rollups, newest day first
+        """
+        start = datetime.combine(datetime.utcnow().date() - timedelta(days=days - 1), datetime.min.time())
+        day = func.date(LLMCall.created_at)
+        query = db.query(
+            day.label("day"),
+            LLMCall.stage,
+            LLMCall.model,
+            func.count(LLMCall.id),
+            func.sum(case((LLMCall.status == "error", 1), else_=0)),
+            func.sum(LLMCall.retries),
+            func.sum(LLMCall.input_tokens),
+            func.sum(LLMCall.output_tokens),
+            func.sum(LLMCall.cache_creation_input_tokens),
+            func.sum(LLMCall.cache_read_input_tokens),
+            func.avg(LLMCall.latency_ms),
+            func.max(LLMCall.latency_ms),
+        ).filter(LLMCall.created_at >= start)
+        if stage:
+            query = query.filter(LLMCall.stage == stage)
+        rows = query.group_by(day, LLMCall.stage, LLMCall.model).order_by(day.desc(), LLMCall.stage)
+
+        rollups = []
+        for (row_day, row_stage, model, calls, errors, retries,
+             input_tokens, output_tokens, cache_write, cache_read, avg_latency, max_latency) in rows:
+            cost = estimate_cost(
+                model, input_tokens or 0, output_tokens or 0, cache_write or 0, cache_read or 0,
+                batch=row_stage == BATCH_STAGE
+            )
+            rollups.append({
+                "day": str(row_day),
+                "stage": row_stage,
+                "model": model,
+                "calls": calls,
+                "errors": int(errors or 0),
+                "retries": int(retries or 0),
+                "input_tokens": int(input_tokens or 0),
+                "output_tokens": int(output_tokens or 0),
+                "cache_creation_input_tokens": int(cache_write or 0),
+                "cache_read_input_tokens": int(cache_read or 0),
+                "avg_latency_ms": round(float(avg_latency)) if avg_latency is not None else None,
+                "max_latency_ms": max_latency,
+                "estimated_cost_usd": round(cost, 4) if cost is not None else None,
+            })
+        return rollups
+
+    def get_stats(self, db: Session, days: int = 7, stage: Optional[str] = None) -> Dict:
+        """
+        Daily rollups with per-stage totals over the period.
+
+        Args:
+            db: Database session
+            days: Number of days back, including today (UTC)
+            stage: Only this stage
+
+        Returns:
+            Dictionary with rollups and totals by stage
+        """
+        rollups = self.daily_rollups(db, days, stage)
+        totals: Dict[str, Dict] = {}
+        for rollup in rollups:
+            total = totals.setdefault(rollup["stage"], {
+                "calls": 0, "errors": 0, "retries": 0, "input_tokens": 0, "output_tokens": 0,
+                "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0, "estimated_cost_usd": 0.0,
+            })
+            for field in total:
+                total[field] += rollup[field] or 0
+        for total in totals.values():
+            total["estimated_cost_usd"] = round(total["estimated_cost_usd"], 4)
+        return {
+            "enabled": self.enabled,
+            "days": days,
+            "buffered": len(self._buffer),  # Recorded calls not written yet
+            "totals_by_stage": totals,
+            "daily": rollups,
+        }
+
+
+# Global LLM telemetry instance
+llm_telemetry = LLMTelemetry()
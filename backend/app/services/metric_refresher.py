@@ -0,0 +1,166 @@
+"""
+Metric refresher service - Re-fetch engagement metrics for recent tweets.
+Keeps like/retweet/reply/bookmark counts, engagement_score and importance_score
+current while tweets are still accumulating engagement, and moves re-scored
+tweets within the engagement histogram used for percentiles.
+"""
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import update, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.tweet import Tweet
+from app.models.processed_tweet import ProcessedTweet
+from app.services.twitter_collector import TwitterCollector, twitter_collector
+from app.services.ai_analyzer import ai_analyzer
+
+# Columns compared to decide whether a tweet's metrics changed
+METRIC_COLUMNS = ("like_count", "retweet_count", "reply_count", "bookmark_count")
+
+
+class MetricRefresher:
+    """Service to refresh engagement metrics inside a freshness window."""
+
+    def __init__(self, collector: Optional[TwitterCollector] = None):
+        self.collector = collector or twitter_collector
+
+    async def refresh_recent_metrics(
+        self,
+        db: Session,
+        window_hours: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Refresh metrics for tweets created within the freshness window.
+
+        Tweet IDs are fetched in batches of settings.metric_refresh_batch_size.
+        Counts and engagement_score are bulk-updated only for tweets whose
+        counts changed, and importance_score is recomputed only for their
+        ProcessedTweet rows.
+
+        Args:
+            db: Database session
+            window_hours: Freshness window (defaults to settings.metric_refresh_window_hours)
+
+        Returns:
+            Dictionary with refresh statistics
+        """
+        if window_hours is None:
+            window_hours = settings.metric_refresh_window_hours
+
+        cutoff = datetime.utcnow() - timedelta(hours=window_hours)
+        rows = db.query(
+            Tweet.id,
+            Tweet.tweet_id,
+            Tweet.like_count,
+            Tweet.retweet_count,
+            Tweet.reply_count,
+            Tweet.bookmark_count,
+            Tweet.engagement_score,
+            Tweet.created_at,
+        ).filter(Tweet.created_at >= cutoff).all()
+
+        stats = {"candidates": len(rows), "api_calls": 0, "fetched": 0, "tweets_updated": 0, "scores_updated": 0}
+        if not rows:
+            logger.info("No tweets inside the metric refresh window")
+            return stats
+
+        logger.info(f"Refreshing metrics for {len(rows)} tweets from the last {window_hours}h")
+        current = {row.tweet_id: row for row in rows}
+
+        # Fetch fresh metrics in as few API calls as the batch size allows
+        tweet_ids = list(current)
+        batch_size = settings.metric_refresh_batch_size
+        updates: List[Dict] = []
+
+        for i in range(0, len(tweet_ids), batch_size):
+            batch = tweet_ids[i:i + batch_size]
+            try:
+                fetched = await self.collector.fetch_tweets_by_ids(batch)
+            except Exception as e:
+                logger.error(f"Failed to refresh metrics for batch {i // batch_size + 1}: {e}")
+                continue
+            stats["api_calls"] += 1
+            stats["fetched"] += len(fetched)
+
+            for tweet_data in fetched:
+                row = current.get(str(tweet_data.get("id")))
+                if row is None:
+                    continue
+                metrics = self.collector.extract_metrics(tweet_data)
+                if all(metrics[column] == getattr(row, column) for column in METRIC_COLUMNS):
+                    continue
+                updates.append({"id": row.id, **metrics})
+
+        if not updates:
+            logger.info("Metric refresh complete: no changes")
+            return stats
+
+        # Bulk UPDATE by primary key
+        db.execute(update(Tweet), updates)
+        stats["tweets_updated"] = len(updates)
+
+        # Percentiles follow the mature scores, not the ones recorded at insert time
+        rows_by_pk = {row.id: row for row in rows}
+        ai_analyzer.normalizer.move(db, [
+            (rows_by_pk[u["id"]].created_at, rows_by_pk[u["id"]].engagement_score, u["engagement_score"])
+            for u in updates
+        ])
+
+        stats["scores_updated"] = self.rescore_processed_tweets(db, [u["id"] for u in updates], cutoff)
+        db.commit()
+
+        logger.info(
+            f"Metric refresh complete: {stats['tweets_updated']} tweets and "
+            f"{stats['scores_updated']} importance scores updated in {stats['api_calls']} API calls"
+        )
+        return stats
+
+    def rescore_processed_tweets(self, db: Session, tweet_ids: List[int], cutoff: datetime) -> int:
+        """
+        Recompute importance_score for the ProcessedTweet rows of changed tweets.
+
+        Args:
+            db: Database session
+            tweet_ids: Tweet primary keys whose engagement changed
+            cutoff: Start of the freshness window (for the fallback normalization)
+
+        Returns:
+            Number of ProcessedTweet rows whose score changed
+        """
+        if not tweet_ids:
+            return 0
+
+        ai_analyzer.normalizer.refresh_if_stale(db)
+        max_engagement = db.query(func.max(Tweet.engagement_score)).filter(
+            Tweet.created_at >= cutoff
+        ).scalar() or 1.0
+
+        score_updates = []
+        rows = db.query(
+            ProcessedTweet.id,
+            ProcessedTweet.ai_relevance_score,
+            ProcessedTweet.importance_score,
+            Tweet.engagement_score,
+        ).join(Tweet).filter(
+            ProcessedTweet.tweet_id.in_(tweet_ids),
+            ProcessedTweet.ai_relevance_score.isnot(None)
+        ).all()
+
+        for row in rows:
+            importance_score = ai_analyzer.calculate_importance_score(
+                row.engagement_score,
+                row.ai_relevance_score,
+                max_engagement
+            )
+            if importance_score != row.importance_score:
+                score_updates.append({"id": row.id, "importance_score": importance_score})
+
+        if score_updates:
+            db.execute(update(ProcessedTweet), score_updates)
+        return len(score_updates)
+
+
+# Global refresher instance
+metric_refresher = MetricRefresher()
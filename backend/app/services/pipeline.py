@@ -0,0 +1,224 @@
+"""
+Pipeline service - Stream newly collected tweets into AI analysis.
+Collection pushes new tweet IDs onto a bounded queue while analyzer workers
+pull full batches, so a run takes roughly max(collect, analyze) instead of
+collect + analyze. Tweets the run leaves unprocessed (failed batches, an
+earlier backlog) are analyzed by a bounded catch-up pass at the end.
+"""
+import asyncio
+import time
+from typing import Callable, List, Dict, Optional, Tuple
+from loguru import logger
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.monitored_account import MonitoredAccount
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer, ai_analyzer
+from app.services.twitter_collector import TwitterCollector, twitter_collector
+
+# Queue marker telling a worker that collection has finished
+_DONE = object()
+
+
+class CollectAnalyzePipeline:
+    """Overlap tweet collection with batched AI analysis."""
+
+    def __init__(
+        self,
+        collector: Optional[TwitterCollector] = None,
+        analyzer: Optional[AIAnalyzer] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.collector = collector or twitter_collector
+        self.analyzer = analyzer or ai_analyzer
+        self.session_factory = session_factory
+
+    async def run(
+        self,
+        db: Session,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict:
+        """
+        Collect from all due accounts and analyze new tweets as they arrive.
+
+        Args:
+            db: Database session used by collection (workers open their own)
+            batch_size: Tweets per analysis call (default: each worker batch is
+                packed by estimated tokens, or settings.batch_size when packing
+                is disabled)
+            queue_size: Max tweet IDs waiting for analysis before collection
+                blocks (defaults to settings.pipeline_queue_size)
+            workers: Concurrent analyzer workers (defaults to settings.pipeline_analyzer_workers)
+
+        Returns:
+            Dictionary with collection stats, analysis counts and per-stage timings
+        """
+        packed = batch_size is None and settings.analyzer_token_packing
+        batch_size = batch_size or (settings.analyzer_max_tweets_per_call if packed else settings.batch_size)
+        queue_size = queue_size or settings.pipeline_queue_size
+        workers = max(1, workers or settings.pipeline_analyzer_workers)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        started = time.perf_counter()
+        timings = {
+            "collect_seconds": 0.0,
+            "collect_blocked_seconds": 0.0,  # Time collection waited on a full queue
+            "analyze_seconds": 0.0,  # Summed time inside analyzer calls
+            "first_batch_seconds": None,  # Run start to first analyzed batch
+        }
+        analysis = {"batches": 0, "processed": 0, "ai_related": 0, "failed_batches": 0, "catch_up_processed": 0}
+
+        # Normalize against the busiest recent tweet, raised as new batches arrive
+        max_engagement = [
+            db.query(func.max(Tweet.engagement_score)).filter(Tweet.processed == False).scalar() or 1.0
+        ]
+
+        async def on_stored(account: MonitoredAccount, tweet_ids: List[str]):
+            new_ids = [
+                tweet_pk for (tweet_pk,) in db.query(Tweet.id).filter(
+                    Tweet.tweet_id.in_(tweet_ids),
+                    Tweet.processed == False
+                )
+            ]
+            for tweet_pk in new_ids:
+                if queue.full():
+                    blocked = time.perf_counter()
+                    await queue.put(tweet_pk)
+                    timings["collect_blocked_seconds"] += time.perf_counter() - blocked
+                else:
+                    queue.put_nowait(tweet_pk)
+
+        async def collect() -> Dict:
+            collect_started = time.perf_counter()
+            try:
+                return await self.collector.collect_all_tweets(db, on_stored=on_stored)
+            finally:
+                timings["collect_seconds"] = time.perf_counter() - collect_started
+                # Clean drain: every worker flushes its partial batch and exits
+                for _ in range(workers):
+                    await queue.put(_DONE)
+
+        async def next_batch() -> Tuple[List[int], bool]:
+            """
+            Block for the first ID, then fill up to batch_size.
+
+            Returns the batch and whether this worker's done marker was seen
+            (each worker consumes exactly one marker).
+            """
+            batch: List[int] = []
+            while len(batch) < batch_size:
+                try:
+                    if batch:
+                        item = await asyncio.wait_for(queue.get(), timeout=settings.pipeline_flush_seconds)
+                    else:
+                        item = await queue.get()
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    return batch, True
+                batch.append(item)
+            return batch, False
+
+        async def analyze_worker(worker_id: int):
+            worker_db = self.session_factory()
+            try:
+                done = False
+                while not done:
+                    batch_ids, done = await next_batch()
+                    if not batch_ids:
+                        continue
+                    try:
+                        await self._analyze_batch(worker_db, batch_ids, max_engagement, timings, analysis, packed)
+                        if timings["first_batch_seconds"] is None:
+                            timings["first_batch_seconds"] = time.perf_counter() - started
+                    except Exception as e:
+                        worker_db.rollback()
+                        analysis["failed_batches"] += 1
+                        logger.error(f"Analyzer worker {worker_id} failed on a batch of {len(batch_ids)}: {e}")
+            finally:
+                worker_db.close()
+
+        worker_tasks = [asyncio.ensure_future(analyze_worker(i)) for i in range(workers)]
+        try:
+            collection_stats = await collect()
+            await asyncio.gather(*worker_tasks)
+        except BaseException:
+            for task in worker_tasks:
+                task.cancel()
+            await asyncio.gather(*worker_tasks, return_exceptions=True)
+            raise
+
+        # Tweets of failed batches, and unprocessed tweets from before this run
+        try:
+            analysis["catch_up_processed"] = await self.analyzer.process_unprocessed_tweets(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Pipeline catch-up analysis failed: {e}")
+
+        timings["total_seconds"] = time.perf_counter() - started
+        # Time the analyzer stage ran after collection had finished
+        timings["analyze_tail_seconds"] = timings["total_seconds"] - timings["collect_seconds"]
+        timings = {k: round(v, 3) if v is not None else None for k, v in timings.items()}
+
+        logger.info(
+            f"Pipeline run complete: {collection_stats.get('total_tweets', 0)} collected, "
+            f"{analysis['processed']} analyzed (+{analysis['catch_up_processed']} catch-up); collect {timings['collect_seconds']}s, "
+            f"analyze {timings['analyze_seconds']}s, total {timings['total_seconds']}s"
+        )
+        return {"collection": collection_stats, "analysis": analysis, "timings": timings}
+
+    async def _analyze_batch(
+        self,
+        db: Session,
+        batch_ids: List[int],
+        max_engagement: List[float],
+        timings: Dict,
+        analysis: Dict,
+        packed: bool = False
+    ):
+        """Analyze and store one batch of tweet primary keys (packed by estimated tokens if ``packed``)."""
+        batch = self.analyzer.unprocessed_tweets(db).filter(
+            Tweet.id.in_(batch_ids)
+        ).order_by(Tweet.created_at.desc()).all()
+        if not batch:
+            return
+
+        max_engagement[0] = max(max_engagement[0], max(tweet.engagement_score for tweet in batch))
+
+        with self.analyzer.claim(batch) as batch:
+            chunks = self.analyzer.packer.pack(batch, self.analyzer.max_tokens) if packed else [batch]
+            for chunk in chunks:
+                await self._analyze_chunk(db, chunk, max_engagement, timings, analysis)
+
+    async def _analyze_chunk(
+        self,
+        db: Session,
+        batch: List[Tweet],
+        max_engagement: List[float],
+        timings: Dict,
+        analysis: Dict
+    ):
+        """Analyze and store tweets that fit one analysis call."""
+        analyze_started = time.perf_counter()
+        results = await self.analyzer.analyze_tweet_batch(batch)
+        timings["analyze_seconds"] += time.perf_counter() - analyze_started
+
+        if not results:
+            analysis["failed_batches"] += 1
+            logger.warning(f"No results from analysis for a batch of {len(batch)} tweets")
+            return
+
+        processed, ai_related = self.analyzer.store_batch_results(db, batch, results, max_engagement[0])
+        db.commit()
+        analysis["batches"] += 1
+        analysis["processed"] += processed
+        analysis["ai_related"] += ai_related
+
+
+# Global pipeline instance
+collect_analyze_pipeline = CollectAnalyzePipeline()
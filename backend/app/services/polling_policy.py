@@ -0,0 +1,136 @@
+"""
+Adaptive polling policy - Decide how often each monitored account is polled.
+Tracks each account's posting rate and yield of new tweets, and spaces polls
+so a typical poll finds a handful of new tweets.
+"""
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from loguru import logger
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+
+
+class AdaptivePollingPolicy:
+    """Per-account polling intervals derived from observed posting rates."""
+
+    def compute_interval(self, posting_rate: Optional[float]) -> int:
+        """
+        Compute the polling interval for a posting rate.
+
+        Args:
+            posting_rate: Smoothed new tweets per hour (None if unknown)
+
+        Returns:
+            Interval in minutes, clamped to the configured bounds
+        """
+        min_minutes = settings.adaptive_poll_min_minutes
+        max_minutes = settings.adaptive_poll_max_minutes
+
+        if posting_rate is None:
+            return min_minutes
+        if posting_rate <= 0:
+            return max_minutes
+
+        minutes = settings.adaptive_poll_target_tweets / posting_rate * 60
+        return int(min(max(minutes, min_minutes), max_minutes))
+
+    def record_poll(
+        self,
+        account: MonitoredAccount,
+        new_tweets: int,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Update an account's polling stats after a successful poll.
+
+        Args:
+            account: MonitoredAccount that was just polled
+            new_tweets: Number of new tweets the poll inserted
+            now: Poll time (defaults to utcnow)
+
+        Returns:
+            The new polling interval in minutes
+        """
+        now = now or datetime.utcnow()
+        alpha = settings.adaptive_poll_smoothing
+
+        if account.last_polled_at:
+            elapsed_hours = (now - account.last_polled_at).total_seconds() / 3600
+        else:
+            elapsed_hours = (account.poll_interval_minutes or settings.adaptive_poll_min_minutes) / 60
+        observed_rate = new_tweets / max(elapsed_hours, 1 / 60)
+
+        if account.posting_rate is None:
+            account.posting_rate = observed_rate
+            account.poll_yield = float(new_tweets)
+        else:
+            account.posting_rate = alpha * observed_rate + (1 - alpha) * account.posting_rate
+            account.poll_yield = alpha * new_tweets + (1 - alpha) * (account.poll_yield or 0.0)
+
+        interval = self.compute_interval(account.posting_rate)
+        account.poll_interval_minutes = interval
+        account.last_polled_at = now
+        account.next_poll_at = now + timedelta(minutes=interval)
+
+        logger.debug(
+            f"@{account.username}: {account.posting_rate:.3f} tweets/h, "
+            f"next poll in {interval} min"
+        )
+        return interval
+
+    def due_filter(self, now: Optional[datetime] = None):
+        """
+        SQL filter matching accounts that are due for a poll.
+
+        Args:
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            SQLAlchemy boolean clause
+        """
+        now = now or datetime.utcnow()
+        return or_(
+            MonitoredAccount.next_poll_at.is_(None),
+            MonitoredAccount.next_poll_at <= now
+        )
+
+    def get_polling_status(self, db: Session) -> Dict:
+        """
+        Get per-account polling intervals for active accounts.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with adaptive polling mode and account intervals
+        """
+        accounts = db.query(MonitoredAccount).filter(
+            MonitoredAccount.is_active == True
+        ).order_by(MonitoredAccount.next_poll_at.asc()).all()
+
+        now = datetime.utcnow()
+        account_status: List[Dict] = [
+            {
+                "username": account.username,
+                "posting_rate_per_hour": round(account.posting_rate, 3) if account.posting_rate is not None else None,
+                "poll_yield": round(account.poll_yield, 2) if account.poll_yield is not None else None,
+                "poll_interval_minutes": account.poll_interval_minutes,
+                "last_polled_at": account.last_polled_at.isoformat() if account.last_polled_at else None,
+                "next_poll_at": account.next_poll_at.isoformat() if account.next_poll_at else None,
+                "due": account.next_poll_at is None or account.next_poll_at <= now,
+            }
+            for account in accounts
+        ]
+
+        return {
+            "enabled": settings.adaptive_polling_enabled,
+            "due_accounts": sum(1 for a in account_status if a["due"]),
+            "accounts": account_status,
+        }
+
+
+# Global policy instance
+polling_policy = AdaptivePollingPolicy()
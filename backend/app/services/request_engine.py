@@ -0,0 +1,296 @@
+"""
+Request engine - Rate-limited, retrying HTTP requests for external APIs.
+Token-bucket throttling, exponential backoff with jitter, Retry-After and
+rate-limit header support, and a per-run deadline.
+"""
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Iterator, Optional
+
+import httpx
+from loguru import logger
+
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Absolute (monotonic) deadline for the current run, set by request_deadline()
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class RequestEngineError(Exception):
+    """A request could not be completed after retries."""
+
+
+class DeadlineExceeded(RequestEngineError):
+    """The run's total deadline passed before the request could complete."""
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound every engine request made inside the block (including in tasks
+    spawned from it) by a shared deadline.
+
+    Args:
+        seconds: Time budget for the whole block (None or <= 0 for no deadline)
+    """
+    deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class TokenBucket:
+    """Async token bucket limiter with saturation counters."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.acquired = 0
+        self.throttled = 0  # Acquisitions that had to wait
+        self.wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause_until(self, until: float):
+        """Stop handing out tokens until the given monotonic time."""
+        self._paused_until = max(self._paused_until, until)
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` can be taken (0 if available now)."""
+        now = time.monotonic()
+        self._refill(now)
+        paused = self._paused_until - now
+        if paused > 0:
+            return paused
+        if self._tokens >= tokens:
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def take(self, tokens: float = 1.0):
+        """Take tokens without waiting; the balance may go negative (debt)."""
+        self._refill(time.monotonic())
+        self._tokens -= tokens
+
+    def give_back(self, tokens: float):
+        """Return tokens that were taken but not used, up to capacity."""
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def set_limit(self, rate: float, capacity: float):
+        """Change the refill rate and burst size, e.g. from server-reported limits."""
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = min(self._tokens, capacity)
+
+    def cap_available(self, tokens: float):
+        """Lower the available tokens to a server-reported remaining count."""
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, tokens)
+
+    async def acquire(self, tokens: float = 1.0, deadline: Optional[float] = None) -> float:
+        """
+        Wait until ``tokens`` are available and take them.
+
+        Args:
+            tokens: Number of tokens to take
+            deadline: Monotonic time after which waiting is pointless
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            DeadlineExceeded: If the wait would run past the deadline
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self.delay(tokens)
+                if delay == 0.0:
+                    self.take(tokens)
+                    break
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise DeadlineExceeded("rate limiter wait would exceed the run deadline")
+                await asyncio.sleep(delay)
+                waited += delay
+
+        self.acquired += 1
+        if waited > 0:
+            self.throttled += 1
+            self.wait_seconds += waited
+        return waited
+
+    def get_stats(self) -> Dict:
+        """Limiter counters; saturation is the share of acquisitions that waited."""
+        self._refill(time.monotonic())
+        return {
+            "rate_per_second": self.rate,
+            "capacity": self.capacity,
+            "available_tokens": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "saturation": round(self.throttled / self.acquired, 3) if self.acquired else 0.0,
+            "wait_seconds_total": round(self.wait_seconds, 3),
+        }
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Get the server-requested delay from Retry-After or rate-limit headers.
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Delay in seconds, or None if the response does not specify one
+    """
+    retry_after = response.headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+
+    remaining = response.headers.get("x-ratelimit-remaining")
+    reset = response.headers.get("x-ratelimit-reset")
+    if reset and (remaining is None or remaining.strip() == "0"):
+        try:
+            reset_value = float(reset)
+        except ValueError:
+            return None
+        # Large values are epoch timestamps, small ones are relative seconds
+        if reset_value > 1_000_000_000:
+            return max(reset_value - time.time(), 0.0)
+        return max(reset_value, 0.0)
+
+    return None
+
+
+class RequestEngine:
+    """Send requests through a token bucket, retrying rate limits and transient errors."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.retries = 0
+        self.retries_by_reason: Dict[str, int] = {}
+        self.gave_up = 0
+        self.deadline_exceeded = 0
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _observe(self, response: httpx.Response):
+        """Pause the limiter until the reset when any response reports an exhausted window."""
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining is None or remaining.strip() != "0":
+            return
+        delay = parse_retry_after(response)
+        if delay:
+            self.limiter.pause_until(time.monotonic() + delay)
+
+    async def request(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Send a request, retrying retryable failures.
+
+        Args:
+            send: Zero-argument coroutine factory issuing the HTTP request
+
+        Returns:
+            The first non-retryable response (status is not checked)
+
+        Raises:
+            DeadlineExceeded: If the run deadline passes
+            RequestEngineError: If retries are exhausted
+        """
+        deadline = _deadline.get()
+        last_error = ""
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self.limiter.acquire(deadline=deadline)
+
+                delay = None
+                try:
+                    response = await send()
+                except httpx.TransportError as e:
+                    reason = type(e).__name__
+                    last_error = f"{reason}: {e}"
+                else:
+                    self._observe(response)
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        return response
+                    reason = str(response.status_code)
+                    last_error = f"HTTP {response.status_code}"
+                    delay = parse_retry_after(response)
+                    if response.status_code == 429 and delay:
+                        # Everyone sharing the limiter should hold off, not just this request
+                        self.limiter.pause_until(time.monotonic() + delay)
+
+                if attempt == self.max_retries:
+                    break
+
+                delay = max(delay or 0.0, self._backoff(attempt))
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise DeadlineExceeded(f"retry after {last_error} would exceed the run deadline")
+
+                self.retries += 1
+                self.retries_by_reason[reason] = self.retries_by_reason.get(reason, 0) + 1
+                logger.warning(f"Retrying request in {delay:.1f}s after {last_error} (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+        except DeadlineExceeded:
+            self.deadline_exceeded += 1
+            raise
+
+        self.gave_up += 1
+        raise RequestEngineError(f"giving up after {self.max_retries + 1} attempts: {last_error}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get limiter and retry metrics.
+
+        Returns:
+            Dictionary with limiter saturation and retry counts
+        """
+        return {
+            "limiter": self.limiter.get_stats(),
+            "retries": self.retries,
+            "retries_by_reason": dict(self.retries_by_reason),
+            "gave_up": self.gave_up,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
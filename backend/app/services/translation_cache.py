@@ -0,0 +1,51 @@
+"""
+Translation cache service - Reuse translations for re-runs and repeated tweet texts.
+Stored in the translation_cache table with the same age and size bounds as
+the analysis cache (analysis_cache_* settings). Keys hash the exact text
+rather than the normalized one, so links and casing in a translation always
+match its tweet.
+"""
+import hashlib
+from typing import Dict, Optional
+
+from app.models.translation_cache import TranslationCacheEntry
+from app.services.analysis_cache import AnalysisCache
+
+
+class TranslationCache(AnalysisCache):
+    """Database-backed cache of tweet translations."""
+
+    model = TranslationCacheEntry
+    fields = ("translation",)
+
+    def key(self, text: str, prompt_version: str) -> str:
+        """
+        Cache key for a tweet text.
+
+        Args:
+            text: Raw tweet text
+            prompt_version: Version of the prompt that produces the translation
+
+        Returns:
+            Hex sha256 digest
+        """
+        return hashlib.sha256(f"{prompt_version}\n{(text or '').strip()}".encode("utf-8")).hexdigest()
+
+    def entry_values(self, result: Dict) -> Optional[Dict]:
+        """
+        Column values stored for a translation.
+
+        Args:
+            result: Dictionary with a "translation" string
+
+        Returns:
+            Values for the translation column, or None if it is empty
+        """
+        translation = result.get("translation") if isinstance(result, dict) else None
+        if not isinstance(translation, str) or not translation.strip():
+            return None
+        return {"translation": translation.strip()}
+
+
+# Global translation cache instance
+translation_cache = TranslationCache()
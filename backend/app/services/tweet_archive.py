@@ -0,0 +1,163 @@
+"""
+Tweet archive service - Keep raw twitterapi.io responses for offline replay.
+Responses are appended to gzip-compressed JSONL files partitioned by UTC date,
+and ReplayTransport serves them back to an httpx client without the network.
+"""
+import gzip
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+
+def _request_key(path: str, params) -> Tuple[str, Tuple]:
+    """Identify a request by path and sorted query parameters."""
+    return path, tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+class ResponseArchive:
+    """Date-partitioned archive of raw API responses (archive_dir/YYYY/MM/YYYY-MM-DD.jsonl.gz)."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.records_written = 0
+
+    def path_for(self, day: date) -> Path:
+        """Archive file holding responses received on ``day``."""
+        return self.root / f"{day:%Y}" / f"{day:%m}" / f"{day:%Y-%m-%d}.jsonl.gz"
+
+    def record(self, response: httpx.Response, received_at: Optional[datetime] = None):
+        """
+        Append one response to the archive.
+
+        Args:
+            response: Final response of a request (after retries)
+            received_at: Receive time (defaults to utcnow)
+        """
+        received_at = received_at or datetime.utcnow()
+        entry = {
+            "received_at": received_at.isoformat(),
+            "method": response.request.method,
+            "path": response.request.url.path,
+            "params": dict(response.request.url.params),
+            "status": response.status_code,
+        }
+        try:
+            entry["json"] = response.json()
+        except ValueError:
+            entry["text"] = response.text
+
+        path = self.path_for(received_at.date())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Each append becomes its own gzip member; gzip readers concatenate them
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.records_written += 1
+
+    def files(self, start: Optional[date] = None, end: Optional[date] = None) -> List[Path]:
+        """
+        List archive files in date order.
+
+        Args:
+            start: First day to include (inclusive)
+            end: Last day to include (inclusive)
+
+        Returns:
+            Paths of the matching daily files
+        """
+        if not self.root.exists():
+            return []
+
+        selected = []
+        for path in sorted(self.root.glob("*/*/*.jsonl.gz")):
+            try:
+                day = date.fromisoformat(path.name[:-len(".jsonl.gz")])
+            except ValueError:
+                continue
+            if (start and day < start) or (end and day > end):
+                continue
+            selected.append(path)
+        return selected
+
+    def iter_records(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[Dict]:
+        """
+        Iterate archived responses in the order they were received.
+
+        Args:
+            start: First day to include (inclusive)
+            end: Last day to include (inclusive)
+
+        Yields:
+            Archived response dictionaries
+        """
+        for path in self.files(start, end):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def iter_tweets(self, start: Optional[date] = None, end: Optional[date] = None) -> Iterator[Dict]:
+        """
+        Iterate raw tweet objects from archived successful responses.
+
+        Args:
+            start: First day to include (inclusive)
+            end: Last day to include (inclusive)
+
+        Yields:
+            Raw tweet dictionaries as returned by twitterapi.io
+        """
+        for record in self.iter_records(start, end):
+            body = record.get("json")
+            if record.get("status") != 200 or not isinstance(body, dict):
+                continue
+            yield from body.get("tweets") or (body.get("data") or {}).get("tweets", [])
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport answering requests from a ResponseArchive.
+
+    Requests are matched on path and query parameters. Repeated requests for
+    the same key get the archived responses in order, then the last one again.
+    Requests that were never archived get a 503, which TwitterCollector turns
+    into a RequestEngineError like any retryable status it replays, so a gap
+    in the archive reads as a transient API failure rather than a missing
+    account.
+    """
+
+    def __init__(self, archive: ResponseArchive, start: Optional[date] = None, end: Optional[date] = None):
+        self._responses: Dict[Tuple, List[Dict]] = defaultdict(list)
+        self._served: Dict[Tuple, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+
+        for record in archive.iter_records(start, end):
+            self._responses[_request_key(record["path"], record.get("params", {}))].append(record)
+        logger.info(f"Replay transport loaded {sum(map(len, self._responses.values()))} archived responses")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _request_key(request.url.path, request.url.params)
+        records = self._responses.get(key)
+        if not records:
+            self.misses += 1
+            return httpx.Response(503, json={"status": "error", "msg": "not in archive"}, request=request)
+
+        index = min(self._served[key], len(records) - 1)
+        self._served[key] += 1
+        self.hits += 1
+
+        record = records[index]
+        if "json" in record:
+            return httpx.Response(record["status"], json=record["json"], request=request)
+        return httpx.Response(record["status"], text=record.get("text", ""), request=request)
+
+
+def replay_window(days: int) -> Tuple[date, date]:
+    """(start, end) dates covering the last ``days`` days including today."""
+    end = datetime.utcnow().date()
+    return end - timedelta(days=days - 1), end
@@ -2,27 +2,294 @@
 Twitter collector service - Fetch tweets from monitored accounts.
 Extracts engagement metrics and calculates engagement scores.
 """
+import asyncio
 import httpx
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.models.tweet import Tweet
 from app.models.monitored_account import MonitoredAccount
+from app.services.account_breaker import account_breaker
+from app.services.engagement_normalizer import engagement_normalizer
+from app.services.polling_policy import polling_policy
+from app.services.request_engine import (
+    RETRYABLE_STATUS_CODES, RequestEngine, RequestEngineError, request_deadline,
+)
+from app.services.tweet_archive import ResponseArchive, ReplayTransport
+from app.utils.compression import ZSTD_AVAILABLE, compress_json, split_fields
+from app.utils.ttl_cache import TTLCache
+
+# Columns accepted by the bulk insert path (parse_tweet also returns extras)
+TWEET_COLUMNS = frozenset(column.name for column in Tweet.__table__.columns)
+
+# Payload fields already stored in their own columns (never kept as metadata)
+COLUMN_PAYLOAD_FIELDS = (
+    "id", "text", "createdAt", "created_at", "url",
+    "likeCount", "retweetCount", "replyCount", "bookmarkCount", "public_metrics",
+)
+
+# Rows per INSERT statement, well below SQLite's bound-parameter limit
+INSERT_CHUNK_SIZE = 500
+
+# HTTP/2 support is optional (requires the "h2" package)
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+# Faster JSON decoding is optional (requires the "orjson" package)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# twitterapi.io createdAt format: "Tue Feb 10 00:43:37 +0000 2026"
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+_MONTHS = {
+    name: number for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1
+    )
+}
+
+
+def parse_twitter_date(value: str) -> Optional[datetime]:
+    """
+    Parse a twitterapi.io createdAt string.
+
+    The fixed-width English format is sliced directly, which is several times
+    faster than strptime and independent of the process locale. Other
+    layouts fall back to strptime, then ISO 8601 (API v2 ``created_at``).
+
+    Args:
+        value: Date string
+
+    Returns:
+        Timezone-aware datetime, or None if the value cannot be parsed
+    """
+    if not value:
+        return None
+
+    if len(value) == 30 and value[3] == " " and value[19] == " " and value[25] == " ":
+        month = _MONTHS.get(value[4:7])
+        offset = value[20:25]
+        if month and offset[0] in "+-":
+            try:
+                if offset == "+0000":
+                    tz = timezone.utc
+                else:
+                    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+                    tz = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+                return datetime(
+                    int(value[26:30]), month, int(value[8:10]),
+                    int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                    tzinfo=tz
+                )
+            except ValueError:
+                pass
+
+    try:
+        return datetime.strptime(value, TWITTER_DATE_FORMAT)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class AccountUnavailableError(Exception):
+    """The API reports the account as suspended, protected or nonexistent."""
+
+
+class AccountFetchError(Exception):
+    """The API answered an account's timeline request with an error."""
 
 
 class TwitterCollector:
     """Service to collect tweets from Twitter API."""
 
-    def __init__(self):
+    def __init__(self, archive_dir: Optional[str] = None, replay_dir: Optional[str] = None):
+        """
+        Args:
+            archive_dir: Write every API response here (defaults to settings.twitter_archive_dir)
+            replay_dir: Serve API calls from this archive instead of the network
+                (defaults to settings.twitter_replay_dir)
+        """
         self.api_key = settings.twitter_api_key
         self.base_url = settings.twitter_api_base_url
         self.headers = {
             "x-api-key": self.api_key,
             "Content-Type": "application/json"
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2_enabled = False
+        self.request_engine = RequestEngine(
+            rate=settings.twitter_rate_limit_per_second,
+            burst=settings.twitter_rate_limit_burst,
+            max_retries=settings.twitter_max_retries,
+            backoff_base=settings.twitter_backoff_base,
+            backoff_max=settings.twitter_backoff_max,
+        )
+        self.http_stats = {
+            "requests": 0,
+            "connections_opened": 0,
+        }
+
+        # Resolved username -> user info (handles rarely change owners)
+        self.user_cache = TTLCache(ttl=settings.username_cache_ttl_seconds)
+
+        # Compact metadata: allow-listed fields as JSON, the rest compressed
+        self.metadata_fields = [f.strip() for f in settings.tweet_metadata_fields.split(",") if f.strip()]
+        self.metadata_codec = settings.tweet_metadata_codec
+        if self.metadata_codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("TWEET_METADATA_CODEC is zstd but 'zstandard' is not installed, using gzip")
+            self.metadata_codec = "gzip"
+
+        replay_dir = replay_dir or settings.twitter_replay_dir
+        archive_dir = archive_dir or settings.twitter_archive_dir
+        self.replay: Optional[ResponseArchive] = ResponseArchive(replay_dir) if replay_dir else None
+        # Replayed responses are already archived
+        self.archive: Optional[ResponseArchive] = (
+            ResponseArchive(archive_dir) if archive_dir and not self.replay else None
+        )
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client used for all twitterapi.io calls."""
+        http2 = settings.twitter_http2
+        if http2 and not H2_AVAILABLE:
+            logger.warning("TWITTER_HTTP2 is enabled but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2_enabled = http2
+
+        if self.replay:
+            logger.info(f"Replaying Twitter API responses from {self.replay.root}")
+            return httpx.AsyncClient(
+                headers=self.headers,
+                transport=ReplayTransport(self.replay),
+            )
+
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=settings.twitter_http_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.twitter_http_max_connections,
+                max_keepalive_connections=settings.twitter_http_max_keepalive_connections,
+                keepalive_expiry=settings.twitter_http_keepalive_expiry,
+            ),
+            http2=http2,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled client, created on first use if start() was not called."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self):
+        """Open the pooled HTTP client (called from the FastAPI lifespan)."""
+        _ = self.client
+        logger.info("Twitter HTTP client started")
+
+    async def close(self):
+        """Close the pooled HTTP client and release its connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Twitter HTTP client closed")
+        self._client = None
+
+    async def __aenter__(self) -> "TwitterCollector":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _trace_connection(self, event_name: str, info: dict):
+        """httpcore trace hook: count every new TCP connection the pool opens."""
+        if event_name == "connection.connect_tcp.complete":
+            self.http_stats["connections_opened"] += 1
+
+    async def _get(self, path: str, params: Dict) -> httpx.Response:
+        """
+        Issue a GET against twitterapi.io through the pooled client.
+
+        Requests are rate limited and 429/5xx/transport errors are retried by
+        the request engine. In replay mode the archive answers directly; in
+        archive mode the final response is written to the archive from a
+        worker thread.
+
+        Args:
+            path: Endpoint path relative to the API base URL
+            params: Query parameters
+
+        Returns:
+            httpx.Response (status already checked)
+
+        Raises:
+            RequestEngineError: If retries or the run deadline are exhausted,
+                or a replayed response has a retryable status
+            httpx.HTTPStatusError: For non-retryable error statuses
+        """
+        async def send() -> httpx.Response:
+            self.http_stats["requests"] += 1
+            return await self.client.get(
+                f"{self.base_url}{path}",
+                params=params,
+                extensions={"trace": self._trace_connection}
+            )
+
+        if self.replay:
+            response = await send()
+            # Archived responses are final, so a retryable status (including a
+            # request missing from the archive) is one whose retries ran out
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                raise RequestEngineError(f"Replayed HTTP {response.status_code} for {path}")
+        else:
+            response = await self.request_engine.request(send)
+            if self.archive:
+                # gzip append is blocking file I/O, keep it off the event loop
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(None, self.archive.record, response)
+                except OSError as e:
+                    logger.error(f"Failed to archive response for {path}: {e}")
+
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _json(response: httpx.Response):
+        """Decode a response body, with orjson when it is installed."""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def get_http_stats(self) -> Dict:
+        """
+        Get connection pool counters.
+
+        Returns:
+            Dictionary with request and connection counts; a reuse ratio close
+            to 1.0 means keep-alive connections are being reused.
+        """
+        requests = self.http_stats["requests"]
+        opened = self.http_stats["connections_opened"]
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "connections_reused": max(requests - opened, 0),
+            "reuse_ratio": round(1 - opened / requests, 3) if requests else None,
+            "http2": self.http2_enabled,
+        }
 
     def calculate_engagement_score(self, tweet_data: dict) -> float:
         """
@@ -52,47 +319,86 @@ class TwitterCollector:
         """
         Fetch user information by username.
 
+        Successful lookups are cached for settings.username_cache_ttl_seconds.
+
         Args:
             username: Twitter username (without @)
 
         Returns:
             Dictionary with user_id, username, and display_name, or None if not found
         """
+        key = username.lower()
+        user_info = self.user_cache.get(key)
+        if user_info is not None:
+            return user_info
+
+        user_info = await self._lookup_user(username)
+        if user_info and user_info.get("user_id"):
+            self.user_cache.set(key, user_info)
+        return user_info
+
+    async def resolve_usernames(
+        self,
+        usernames: List[str],
+        concurrency: Optional[int] = None,
+        on_resolved: Optional[Callable[[str, Optional[Dict]], None]] = None
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Resolve many usernames concurrently (bounded), using the cache.
+
+        Args:
+            usernames: Twitter usernames (without @)
+            concurrency: Max lookups in flight (defaults to settings.collection_concurrency)
+            on_resolved: Called with (username, user info or None) as each lookup finishes
+
+        Returns:
+            Dictionary of username -> user info (None if not found)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or settings.collection_concurrency))
+
+        async def resolve(username: str) -> Tuple[str, Optional[Dict]]:
+            async with semaphore:
+                user_info = await self.fetch_user_by_username(username)
+            if on_resolved:
+                on_resolved(username, user_info)
+            return username, user_info
+
+        return dict(await asyncio.gather(*(resolve(u) for u in dict.fromkeys(usernames))))
+
+    async def _lookup_user(self, username: str) -> Optional[Dict]:
+        """Uncached user lookup via the last_tweets endpoint."""
         try:
             # Use the twitter/user/last_tweets endpoint to get user info
             # This endpoint works with userName parameter (note the capital N)
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/twitter/user/last_tweets",
-                    headers=self.headers,
-                    params={"userName": username}  # Note: userName with capital N
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Check if request was successful
-                if data.get("status") != "success":
-                    logger.error(f"API returned non-success status for user {username}")
-                    return None
-
-                # Check if user is unavailable (suspended, etc.)
-                if data.get("data", {}).get("unavailable"):
-                    reason = data.get("data", {}).get("unavailableReason", "Unknown")
-                    logger.warning(f"User {username} is unavailable: {reason}")
-                    return None
-
-                # Extract user info from the first tweet's author
-                tweets = data.get("data", {}).get("tweets", [])
-                if not tweets:
-                    logger.warning(f"No tweets found for user {username}")
-                    return None
-
-                author = tweets[0].get("author", {})
-                return {
-                    "user_id": author.get("id"),
-                    "username": author.get("userName"),
-                    "display_name": author.get("name"),
-                }
+            response = await self._get(
+                "/twitter/user/last_tweets",
+                params={"userName": username}  # Note: userName with capital N
+            )
+            data = self._json(response)
+
+            # Check if request was successful
+            if data.get("status") != "success":
+                logger.error(f"API returned non-success status for user {username}")
+                return None
+
+            # Check if user is unavailable (suspended, etc.)
+            if data.get("data", {}).get("unavailable"):
+                reason = data.get("data", {}).get("unavailableReason", "Unknown")
+                logger.warning(f"User {username} is unavailable: {reason}")
+                return None
+
+            # Extract user info from the first tweet's author
+            tweets = data.get("data", {}).get("tweets", [])
+            if not tweets:
+                logger.warning(f"No tweets found for user {username}")
+                return None
+
+            author = tweets[0].get("author", {})
+            return {
+                "user_id": author.get("id"),
+                "username": author.get("userName"),
+                "display_name": author.get("name"),
+            }
         except httpx.HTTPError as e:
             logger.error(f"HTTP error fetching user {username}: {e}")
             return None
@@ -104,74 +410,153 @@ class TwitterCollector:
         self,
         username: str,
         since_id: Optional[str] = None,
-        max_results: int = 100
+        max_results: Optional[int] = None,
+        max_pages: Optional[int] = None
     ) -> List[Dict]:
         """
         Fetch tweets from a specific user.
 
+        Follows ``next_cursor`` pages (newest first) until a page reaches
+        ``since_id``, the API has no more pages, or the page/tweet caps are hit.
+
         Args:
             username: Twitter username (without @)
             since_id: Only return tweets after this ID
-            max_results: Maximum number of tweets to fetch
+            max_results: Maximum number of tweets to return
+                (defaults to settings.twitter_max_tweets_per_account)
+            max_pages: Maximum number of pages to request
+                (defaults to settings.twitter_max_pages_per_account)
 
         Returns:
             List of tweet dictionaries
+
+        Raises:
+            RequestEngineError: If the API stayed rate limited or unavailable,
+                so the account is reported as failed rather than empty
+            AccountUnavailableError: If the account is suspended or does not exist
+            AccountFetchError: For any other error status or unreadable
+                response, so it counts against the account's circuit breaker
         """
+        if max_results is None:
+            max_results = settings.twitter_max_tweets_per_account
+        if max_pages is None:
+            max_pages = settings.twitter_max_pages_per_account
+        since = int(since_id) if since_id else None
+
+        original_tweets = []
+        cursor = None
+        pages = 0
+        reached_since_id = False
+        capped = False  # Stopped by max_pages/max_results rather than since_id or the last page
+
         try:
-            # Use the correct twitterapi.io endpoint
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/twitter/user/last_tweets",
-                    headers=self.headers,
-                    params={"userName": username}
-                )
-                response.raise_for_status()
-                data = response.json()
+            while pages < max_pages and len(original_tweets) < max_results:
+                # Use the correct twitterapi.io endpoint
+                params = {"userName": username}
+                if cursor:
+                    params["cursor"] = cursor
+                response = await self._get("/twitter/user/last_tweets", params=params)
+                data = self._json(response)
+                pages += 1
 
                 # Check if request was successful
                 if data.get("status") != "success":
-                    logger.error(f"API returned non-success status for user @{username}")
-                    return []
+                    if pages == 1:
+                        raise AccountFetchError(f"API returned status {data.get('status')!r}: {data.get('msg', '')}")
+                    logger.error(f"API returned non-success status for user @{username}, keeping earlier pages")
+                    break
+
+                payload = data.get("data") or {}
 
                 # Check if user is unavailable
-                if data.get("data", {}).get("unavailable"):
-                    reason = data.get("data", {}).get("unavailableReason", "Unknown")
+                if payload.get("unavailable"):
+                    reason = payload.get("unavailableReason", "Unknown")
                     logger.warning(f"User @{username} is unavailable: {reason}")
-                    return []
+                    raise AccountUnavailableError(f"unavailable: {reason}")
 
                 # Extract tweets from response
-                tweets = data.get("data", {}).get("tweets", [])
+                tweets = payload.get("tweets", [])
+
+                # Keep original tweets newer than since_id (no retweets or replies)
+                for t in tweets:
+                    if since is not None and int(t.get("id", 0)) <= since:
+                        reached_since_id = True
+                        continue
+                    if t.get("type") == "tweet" and not t.get("isReply", False):
+                        original_tweets.append(t)
+
+                # Stop as soon as this page overlaps what we already have
+                if reached_since_id or not tweets:
+                    break
+
+                has_next_page = data.get("has_next_page", payload.get("has_next_page"))
+                cursor = data.get("next_cursor") or payload.get("next_cursor")
+                if not has_next_page or not cursor:
+                    break
+            else:
+                capped = True
+
+            # Limit results; tweets past the cap are the oldest ones
+            dropped = len(original_tweets) - max_results
+            original_tweets = original_tweets[:max_results]
+
+            # last_tweet_id moves to the newest kept tweet, so nothing older is fetched again
+            if since is not None and (capped or dropped > 0):
+                logger.warning(
+                    f"@{username}: stopped at the cap of {max_pages} pages / {max_results} tweets "
+                    f"before reaching since_id {since_id}, older tweets in between are skipped"
+                )
 
-                # Filter out retweets and replies
-                original_tweets = [
-                    t for t in tweets
-                    if t.get("type") == "tweet" and not t.get("isReply", False)
-                ]
+            logger.info(f"Fetched {len(original_tweets)} tweets from @{username} ({pages} pages)")
+            return original_tweets
 
-                # Filter by since_id if provided
-                if since_id:
-                    original_tweets = [
-                        t for t in original_tweets
-                        if int(t.get("id", 0)) > int(since_id)
-                    ]
+        except (RequestEngineError, AccountUnavailableError, AccountFetchError):
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                raise AccountUnavailableError("not found (HTTP 404)") from e
+            raise AccountFetchError(f"HTTP {e.response.status_code}") from e
+        except httpx.HTTPError as e:
+            raise AccountFetchError(f"{type(e).__name__}: {e}") from e
+        except Exception as e:
+            raise AccountFetchError(f"unreadable response: {e}") from e
 
-                # Limit results
-                original_tweets = original_tweets[:max_results]
+    async def fetch_tweets_by_ids(self, tweet_ids: List[str]) -> List[Dict]:
+        """
+        Fetch current tweet objects for a batch of tweet IDs.
 
-                logger.info(f"Fetched {len(original_tweets)} tweets from @{username}")
-                return original_tweets
+        Args:
+            tweet_ids: Twitter tweet IDs (at most settings.metric_refresh_batch_size)
 
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error fetching tweets for @{username}: {e}")
+        Returns:
+            List of raw tweet dictionaries (deleted tweets are omitted)
+
+        Raises:
+            RequestEngineError: If the API stayed rate limited or unavailable
+        """
+        if not tweet_ids:
             return []
-        except Exception as e:
-            logger.error(f"Error fetching tweets for @{username}: {e}")
+
+        response = await self._get(
+            "/twitter/tweets",
+            params={"tweet_ids": ",".join(tweet_ids)}
+        )
+        data = self._json(response)
+
+        if data.get("status") != "success":
+            logger.error(f"API returned non-success status for {len(tweet_ids)} tweet IDs")
             return []
 
+        return data.get("tweets") or (data.get("data") or {}).get("tweets", [])
+
     def parse_tweet(self, tweet_data: dict, account_id: int) -> Dict:
         """
         Parse raw tweet data into database format.
 
+        Reads each field once, parses the fixed createdAt format without
+        strptime and computes the engagement score inline. Metadata is
+        stored compactly (see compact_metadata).
+
         Args:
             tweet_data: Raw tweet data from twitterapi.io API
             account_id: Database ID of the monitored account
@@ -179,51 +564,102 @@ class TwitterCollector:
         Returns:
             Dictionary ready for database insertion
         """
-        tweet_id = tweet_data.get("id")
-        text = tweet_data.get("text", "")
+        get = tweet_data.get
+        tweet_id = get("id")
 
         # Parse created_at from twitterapi.io format
         # Format: "Tue Feb 10 00:43:37 +0000 2026"
-        created_at_str = tweet_data.get("createdAt", "")
-        try:
-            created_at = datetime.strptime(created_at_str, "%a %b %d %H:%M:%S %z %Y")
-        except (ValueError, TypeError):
+        created_at_str = get("createdAt") or get("created_at") or ""
+        created_at = parse_twitter_date(created_at_str)
+        if created_at is None:
             # Fallback to current time if parsing fails
             created_at = datetime.utcnow()
             logger.warning(f"Failed to parse created_at: {created_at_str}, using current time")
 
-        # Extract engagement metrics from twitterapi.io format
-        like_count = tweet_data.get("likeCount", 0)
-        retweet_count = tweet_data.get("retweetCount", 0)
-        reply_count = tweet_data.get("replyCount", 0)
-        bookmark_count = tweet_data.get("bookmarkCount", 0)
-
-        # Calculate engagement score
-        engagement_score = self.calculate_engagement_score({
-            "like_count": like_count,
-            "retweet_count": retweet_count,
-            "reply_count": reply_count,
-            "bookmark_count": bookmark_count
-        })
-
-        # Use the URL from API response
-        tweet_url = tweet_data.get("url", f"https://twitter.com/i/status/{tweet_id}")
+        likes, retweets, replies, bookmarks = self._metric_counts(tweet_data)
+        tweet_metadata, raw_metadata = self.compact_metadata(tweet_data)
 
         return {
             "tweet_id": tweet_id,
             "user_id": account_id,
-            "text": text,
+            "text": get("text", ""),
             "created_at": created_at,
-            "tweet_url": tweet_url,
-            "like_count": like_count,
-            "retweet_count": retweet_count,
-            "reply_count": reply_count,
-            "bookmark_count": bookmark_count,
-            "engagement_score": engagement_score,
-            "metadata": tweet_data,
+            # Use the URL from API response
+            "tweet_url": get("url") or f"https://twitter.com/i/status/{tweet_id}",
+            "like_count": likes,
+            "retweet_count": retweets,
+            "reply_count": replies,
+            "bookmark_count": bookmarks,
+            "engagement_score": float(
+                likes * settings.engagement_weight_likes +
+                retweets * settings.engagement_weight_retweets +
+                replies * settings.engagement_weight_replies +
+                bookmarks * settings.engagement_weight_bookmarks
+            ),
+            "tweet_metadata": tweet_metadata,
+            "raw_metadata": raw_metadata,
             "processed": False
         }
 
+    def compact_metadata(self, tweet_data: dict) -> Tuple[Optional[Dict], Optional[bytes]]:
+        """
+        Split a raw tweet into allow-listed metadata and a compressed remainder.
+
+        Fields already stored as columns are dropped. The remainder is only
+        kept when settings.tweet_metadata_keep_raw is on.
+
+        Args:
+            tweet_data: Raw tweet data from twitterapi.io API
+
+        Returns:
+            Tuple of (metadata dict or None, compressed remainder or None)
+        """
+        kept, rest = split_fields(tweet_data, self.metadata_fields, drop=COLUMN_PAYLOAD_FIELDS)
+        raw = compress_json(rest, self.metadata_codec) if rest and settings.tweet_metadata_keep_raw else None
+        return kept or None, raw
+
+    @staticmethod
+    def _metric_counts(tweet_data: dict) -> Tuple[int, int, int, int]:
+        """Like/retweet/reply/bookmark counts (twitterapi.io fields, else API v2 public_metrics)."""
+        get = tweet_data.get
+        likes = get("likeCount")
+        if likes is None and "public_metrics" in tweet_data:
+            public = tweet_data["public_metrics"] or {}
+            return (
+                public.get("like_count", 0),
+                public.get("retweet_count", 0),
+                public.get("reply_count", 0),
+                public.get("bookmark_count", 0),
+            )
+        return (
+            likes or 0,
+            get("retweetCount", 0),
+            get("replyCount", 0),
+            get("bookmarkCount", 0),
+        )
+
+    def extract_metrics(self, tweet_data: dict) -> Dict:
+        """
+        Extract engagement counts and engagement score from a raw tweet.
+
+        Args:
+            tweet_data: Raw tweet data from twitterapi.io API
+
+        Returns:
+            Dictionary with like/retweet/reply/bookmark counts and engagement_score
+        """
+        likes, retweets, replies, bookmarks = self._metric_counts(tweet_data)
+        metrics = {
+            "like_count": likes,
+            "retweet_count": retweets,
+            "reply_count": replies,
+            "bookmark_count": bookmarks,
+        }
+
+        # Calculate engagement score
+        metrics["engagement_score"] = self.calculate_engagement_score(metrics)
+        return metrics
+
     async def collect_tweets_for_account(
         self,
         db: Session,
@@ -247,30 +683,44 @@ class TwitterCollector:
             since_id=account.last_tweet_id
         )
 
-        if not tweets_data:
-            logger.info(f"No new tweets for @{account.username}")
-            return 0
+        return self.store_account_tweets(db, account, tweets_data)
 
-        # Parse and store tweets
-        new_tweets_count = 0
-        latest_tweet_id = account.last_tweet_id
+    def store_account_tweets(
+        self,
+        db: Session,
+        account: MonitoredAccount,
+        tweets_data: List[Dict]
+    ) -> int:
+        """
+        Store fetched tweets for an account, advance its last_tweet_id,
+        update its adaptive polling stats and close its circuit breaker.
 
-        for tweet_data in tweets_data:
-            tweet_id = tweet_data.get("id")
+        This is synchronous on purpose: it never yields to the event loop, so
+        concurrent fetches can share one session without interleaving writes.
 
-            # Check if tweet already exists (deduplication)
-            existing = db.query(Tweet).filter(Tweet.tweet_id == tweet_id).first()
-            if existing:
-                logger.debug(f"Tweet {tweet_id} already exists, skipping")
-                continue
+        Args:
+            db: Database session
+            account: MonitoredAccount instance
+            tweets_data: Raw tweets returned by fetch_user_tweets
+
+        Returns:
+            Number of new tweets collected
+        """
+        if not tweets_data:
+            logger.info(f"No new tweets for @{account.username}")
+            polling_policy.record_poll(account, 0)
+            account_breaker.record_success(account)
+            db.commit()
+            return 0
 
-            # Parse and create tweet
-            parsed_tweet = self.parse_tweet(tweet_data, account.id)
-            tweet = Tweet(**parsed_tweet)
-            db.add(tweet)
-            new_tweets_count += 1
+        # Parse the whole page, then insert it set-based (deduplicated by tweet_id)
+        rows = [self.parse_tweet(tweet_data, account.id) for tweet_data in tweets_data]
+        new_tweets_count = self.insert_tweets(db, rows)
 
-            # Track latest tweet ID
+        # Track latest tweet ID
+        latest_tweet_id = account.last_tweet_id
+        for row in rows:
+            tweet_id = row["tweet_id"]
             if not latest_tweet_id or int(tweet_id) > int(latest_tweet_id):
                 latest_tweet_id = tweet_id
 
@@ -279,53 +729,250 @@ class TwitterCollector:
             account.last_tweet_id = latest_tweet_id
             account.updated_at = datetime.utcnow()
 
+        polling_policy.record_poll(account, new_tweets_count)
+        account_breaker.record_success(account)
         db.commit()
         logger.info(f"Collected {new_tweets_count} new tweets for @{account.username}")
         return new_tweets_count
 
-    async def collect_all_tweets(self, db: Session) -> Dict[str, int]:
+    def insert_tweets(self, db: Session, rows: List[Dict]) -> int:
+        """
+        Insert parsed tweets in bulk, skipping tweet_ids that already exist.
+
+        Uses ``INSERT ... ON CONFLICT DO NOTHING`` on PostgreSQL and
+        ``INSERT OR IGNORE`` on SQLite, so overlapping collection runs cannot
+        collide on the unique constraint. Other databases fall back to one
+        ``IN`` query for the page followed by a plain multi-row insert. New
+        tweets are added to the rolling engagement histogram.
+
+        Args:
+            db: Database session
+            rows: Dictionaries returned by parse_tweet
+
+        Returns:
+            Number of rows actually inserted
+        """
+        # Drop non-column keys and duplicates within the page
+        unique_rows = {}
+        for row in rows:
+            unique_rows.setdefault(
+                row["tweet_id"],
+                {key: value for key, value in row.items() if key in TWEET_COLUMNS}
+            )
+        rows = list(unique_rows.values())
+        if not rows:
+            return 0
+
+        dialect = db.get_bind().dialect.name
+        inserted = 0
+
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[i:i + INSERT_CHUNK_SIZE]
+
+            if dialect == "postgresql":
+                stmt = pg_insert(Tweet).values(chunk).on_conflict_do_nothing(
+                    index_elements=[Tweet.tweet_id]
+                )
+            elif dialect == "sqlite":
+                stmt = insert(Tweet).values(chunk).prefix_with("OR IGNORE")
+            else:
+                chunk_ids = [row["tweet_id"] for row in chunk]
+                existing = {
+                    tweet_id for (tweet_id,) in
+                    db.query(Tweet.tweet_id).filter(Tweet.tweet_id.in_(chunk_ids))
+                }
+                chunk = [row for row in chunk if row["tweet_id"] not in existing]
+                if not chunk:
+                    continue
+                stmt = insert(Tweet).values(chunk)
+
+            if dialect in ("postgresql", "sqlite"):
+                # Only the rows actually inserted come back
+                new_tweets = db.execute(stmt.returning(Tweet.created_at, Tweet.engagement_score)).all()
+            else:
+                db.execute(stmt)
+                new_tweets = [(row["created_at"], row["engagement_score"]) for row in chunk]
+            inserted += len(new_tweets)
+            engagement_normalizer.record(db, new_tweets)
+
+        skipped = len(rows) - inserted
+        if skipped:
+            logger.debug(f"Skipped {skipped} tweets that already exist")
+        return inserted
+
+    async def _fetch_for_account(
+        self,
+        semaphore: asyncio.Semaphore,
+        account: MonitoredAccount,
+        username: str,
+        since_id: Optional[str],
+        timeout: float
+    ) -> Tuple[MonitoredAccount, Optional[List[Dict]], Optional[Exception]]:
+        """
+        Fetch one account's tweets under the concurrency limit and timeout.
+
+        Errors are returned rather than raised so one slow or failing account
+        never cancels the rest of the pass.
+        """
+        async with semaphore:
+            try:
+                tweets_data = await asyncio.wait_for(
+                    self.fetch_user_tweets(username=username, since_id=since_id),
+                    timeout=timeout
+                )
+                return account, tweets_data, None
+            except asyncio.TimeoutError:
+                return account, None, TimeoutError(f"fetch timed out after {timeout:.0f}s")
+            except Exception as e:
+                return account, None, e
+
+    async def collect_all_tweets(
+        self,
+        db: Session,
+        concurrency: Optional[int] = None,
+        due_only: Optional[bool] = None,
+        on_stored: Optional[Callable[[MonitoredAccount, List[str]], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
         """
         Collect tweets from all active monitored accounts.
 
+        Accounts are fetched concurrently (bounded by ``concurrency``), and each
+        account's tweets are written to the session as soon as its fetch
+        completes, one account at a time. Accounts with an open circuit breaker
+        are skipped; per-account failures feed the breaker, while API-wide
+        failures (rate limiting, outages, the run deadline) do not.
+
         Args:
             db: Database session
+            concurrency: Max accounts fetched in parallel
+                (defaults to settings.collection_concurrency)
+            due_only: Only poll accounts whose adaptive next_poll_at has passed
+                (defaults to settings.adaptive_polling_enabled)
+            on_stored: Awaited with (account, tweet IDs of the page) after an
+                account's new tweets are committed; it may block to apply
+                backpressure (used by the streaming pipeline)
 
         Returns:
             Dictionary with collection statistics
         """
+        if concurrency is None:
+            concurrency = settings.collection_concurrency
+        if due_only is None:
+            due_only = settings.adaptive_polling_enabled
+
         logger.info("Starting tweet collection for all accounts")
 
-        # Get all active accounts
-        accounts = db.query(MonitoredAccount).filter(
-            MonitoredAccount.is_active == True
-        ).all()
+        # Get all active accounts with a closed breaker (only the due ones in adaptive mode)
+        query = db.query(MonitoredAccount).filter(
+            MonitoredAccount.is_active == True,
+            account_breaker.closed_filter()
+        )
+        if due_only:
+            query = query.filter(polling_policy.due_filter())
+        accounts = query.all()
 
         if not accounts:
-            logger.warning("No active accounts to monitor")
+            if due_only:
+                logger.info("No accounts due for polling")
+            else:
+                logger.warning("No active accounts to monitor")
             return {"total_accounts": 0, "total_tweets": 0}
 
+        return await self.collect_accounts(db, accounts, concurrency=concurrency, on_stored=on_stored)
+
+    async def collect_accounts(
+        self,
+        db: Session,
+        accounts: List[MonitoredAccount],
+        concurrency: Optional[int] = None,
+        on_stored: Optional[Callable[[MonitoredAccount, List[str]], Awaitable[None]]] = None
+    ) -> Dict[str, int]:
+        """
+        Fetch and store tweets for a given list of accounts.
+
+        Shared by collect_all_tweets and the collection workers (which pass
+        the accounts they leased).
+
+        Args:
+            db: Database session
+            accounts: Accounts to poll
+            concurrency: Max accounts fetched in parallel
+                (defaults to settings.collection_concurrency)
+            on_stored: See collect_all_tweets
+
+        Returns:
+            Dictionary with collection statistics
+        """
+        if concurrency is None:
+            concurrency = settings.collection_concurrency
+
         total_tweets = 0
         successful_accounts = 0
         failed_accounts = 0
+        deactivated: List[str] = []
+
+        # Snapshot fetch arguments up front: commits below expire ORM
+        # attributes, and reloading them mid-fan-out would hit the session.
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        # Every request in this run shares one deadline (inherited by the fetch tasks)
+        with request_deadline(settings.collection_run_deadline):
+            fetches = [
+                asyncio.ensure_future(self._fetch_for_account(
+                    semaphore,
+                    account,
+                    account.username,
+                    account.last_tweet_id,
+                    settings.collection_account_timeout
+                ))
+                for account in accounts
+            ]
+
+        for next_done in asyncio.as_completed(fetches):
+            account, tweets_data, error = await next_done
+
+            if error is not None:
+                logger.error(f"Failed to collect tweets for @{account.username}: {error}")
+                failed_accounts += 1
+                if not isinstance(error, RequestEngineError):
+                    try:
+                        if account_breaker.record_failure(
+                            account,
+                            str(error) or type(error).__name__,
+                            unavailable=isinstance(error, AccountUnavailableError)
+                        ):
+                            deactivated.append(account.username)
+                        db.commit()
+                    except Exception as e:
+                        db.rollback()
+                        logger.error(f"Failed to record breaker state for @{account.username}: {e}")
+                continue
 
-        for account in accounts:
             try:
-                count = await self.collect_tweets_for_account(db, account)
+                count = self.store_account_tweets(db, account, tweets_data)
                 total_tweets += count
                 successful_accounts += 1
             except Exception as e:
-                logger.error(f"Failed to collect tweets for @{account.username}: {e}")
+                db.rollback()
+                logger.error(f"Failed to store tweets for @{account.username}: {e}")
                 failed_accounts += 1
+                continue
+
+            if on_stored and count:
+                await on_stored(account, [str(t.get("id")) for t in tweets_data])
 
         logger.info(
             f"Collection complete: {total_tweets} tweets from "
             f"{successful_accounts}/{len(accounts)} accounts"
         )
+        if deactivated:
+            logger.warning(f"Deactivated {len(deactivated)} dead accounts: {', '.join('@' + u for u in deactivated)}")
 
         return {
             "total_accounts": len(accounts),
             "successful_accounts": successful_accounts,
             "failed_accounts": failed_accounts,
+            "deactivated_accounts": len(deactivated),
             "total_tweets": total_tweets
         }
 
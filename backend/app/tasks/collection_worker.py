@@ -0,0 +1,93 @@
+"""
+Collection worker - Collect tweets outside the scheduler process.
+Any number of workers (processes or nodes sharing the database) lease batches
+of due accounts, collect them and release the leases, so each due account is
+polled by exactly one worker per cycle. Start one with
+``python scripts/collection_worker.py``.
+"""
+import asyncio
+import os
+import socket
+from typing import Callable, Dict, Optional
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.account_leases import account_lease_manager
+from app.services.twitter_collector import TwitterCollector, twitter_collector
+
+
+def default_worker_id() -> str:
+    """Host and PID, unique across the processes sharing the database."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_worker(
+    worker_id: Optional[str] = None,
+    once: bool = False,
+    collector: Optional[TwitterCollector] = None,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> Dict:
+    """
+    Lease and collect due accounts until stopped.
+
+    Args:
+        worker_id: Lease owner name (defaults to host:pid)
+        once: Exit as soon as no account is due instead of sleeping
+        collector: Collector to use (defaults to the global instance)
+        session_factory: Session factory for the worker's database session
+
+    Returns:
+        Dictionary with batch, account and tweet totals for this worker
+    """
+    worker_id = worker_id or default_worker_id()
+    collector = collector or twitter_collector
+    totals = {"worker_id": worker_id, "batches": 0, "accounts": 0, "failed_accounts": 0, "tweets": 0}
+
+    logger.info(f"Collection worker {worker_id} started")
+    db = session_factory()
+    try:
+        while True:
+            accounts = account_lease_manager.lease_batch(db, worker_id)
+            if not accounts:
+                if once:
+                    break
+                await asyncio.sleep(settings.worker_idle_seconds)
+                continue
+
+            # Commits during collection expire the ORM objects; keep plain IDs
+            account_ids = [account.id for account in accounts]
+            try:
+                stats = await collector.collect_accounts(db, accounts)
+            finally:
+                db.rollback()
+                account_lease_manager.release(db, account_ids, worker_id)
+
+            totals["batches"] += 1
+            totals["accounts"] += stats.get("total_accounts", 0)
+            totals["failed_accounts"] += stats.get("failed_accounts", 0)
+            totals["tweets"] += stats.get("total_tweets", 0)
+    finally:
+        db.close()
+        await collector.close()
+
+    logger.info(
+        f"Collection worker {worker_id} stopped: {totals['tweets']} tweets from "
+        f"{totals['accounts']} accounts in {totals['batches']} batches"
+    )
+    return totals
+
+
+def run_worker_process(worker_id: Optional[str] = None, once: bool = False) -> Dict:
+    """
+    Blocking entry point for a worker process.
+
+    Args:
+        worker_id: Lease owner name (defaults to host:pid)
+        once: Exit as soon as no account is due
+
+    Returns:
+        Worker totals (see run_worker)
+    """
+    return asyncio.run(run_worker(worker_id=worker_id, once=once))
@@ -12,6 +12,9 @@ from app.services.twitter_collector import twitter_collector
 from app.services.ai_analyzer import ai_analyzer
 from app.services.aggregator import aggregator_service
 from app.services.email_service_v2 import email_service
+from app.services.metric_refresher import metric_refresher
+from app.services.batch_analyzer import batch_analyzer
+from app.services.pipeline import collect_analyze_pipeline
 
 
 # Global scheduler instance
@@ -27,6 +30,18 @@ async def collect_tweets_task():
 
     try:
         with get_db_context() as db:
+            if settings.collection_workers_enabled:
+                # Collection workers poll the accounts; only analyze what they stored
+                processed_count = await ai_analyzer.process_unprocessed_tweets(db)
+                logger.info(f"Processed {processed_count} tweets collected by workers")
+                return
+
+            if settings.pipeline_enabled:
+                # Analyze tweets while collection is still running
+                stats = await collect_analyze_pipeline.run(db)
+                logger.info(f"Pipeline run complete: {stats}")
+                return
+
             # Collect tweets
             stats = await twitter_collector.collect_all_tweets(db)
             logger.info(f"Tweet collection complete: {stats}")
@@ -40,6 +55,38 @@ async def collect_tweets_task():
         logger.error(f"Error in tweet collection task: {e}")
 
 
+async def refresh_metrics_task():
+    """
+    Scheduled task to refresh engagement metrics of recent tweets.
+    Runs every 3 hours by default.
+    """
+    logger.info("Starting scheduled metric refresh task")
+
+    try:
+        with get_db_context() as db:
+            stats = await metric_refresher.refresh_recent_metrics(db)
+            logger.info(f"Metric refresh complete: {stats}")
+
+    except Exception as e:
+        logger.error(f"Error in metric refresh task: {e}")
+
+
+async def poll_analysis_batches_task():
+    """
+    Scheduled task to poll open analysis Message Batches and store finished results.
+    Runs every 10 minutes by default; also picks up batches submitted before a restart.
+    """
+    try:
+        with get_db_context() as db:
+            if not batch_analyzer.open_batches(db):
+                return
+            polled = await batch_analyzer.resume(db)
+            logger.info(f"Polled {len(polled)} analysis message batches")
+
+    except Exception as e:
+        logger.error(f"Error in analysis batch poll task: {e}")
+
+
 async def daily_summary_task():
     """
     Scheduled task to create daily summary and send email.
@@ -83,15 +130,42 @@ def start_scheduler():
     """Initialize and start the scheduler with all tasks."""
     logger.info("Initializing scheduler")
 
-    # Add tweet collection task (every 2 hours)
+    # Add tweet collection task (every 2 hours, or a frequent due-account
+    # check when adaptive polling decides per-account intervals)
+    collection_cron = (
+        settings.schedule_adaptive_collection_cron
+        if settings.adaptive_polling_enabled
+        else settings.schedule_tweet_collection_cron
+    )
     scheduler.add_job(
         collect_tweets_task,
-        trigger=CronTrigger.from_crontab(settings.schedule_tweet_collection_cron),
+        trigger=CronTrigger.from_crontab(collection_cron),
         id="collect_tweets",
         name="Collect tweets from monitored accounts",
         replace_existing=True
     )
-    logger.info(f"Scheduled tweet collection: {settings.schedule_tweet_collection_cron}")
+    logger.info(f"Scheduled tweet collection: {collection_cron}")
+
+    # Add engagement metric refresh task (every 3 hours)
+    if settings.enable_metric_refresh:
+        scheduler.add_job(
+            refresh_metrics_task,
+            trigger=CronTrigger.from_crontab(settings.schedule_metric_refresh_cron),
+            id="refresh_metrics",
+            name="Refresh engagement metrics of recent tweets",
+            replace_existing=True
+        )
+        logger.info(f"Scheduled metric refresh: {settings.schedule_metric_refresh_cron}")
+
+    # Poll Message Batches submitted in offline analysis mode (no-op when none are open)
+    scheduler.add_job(
+        poll_analysis_batches_task,
+        trigger=CronTrigger.from_crontab(settings.schedule_analysis_batch_poll_cron),
+        id="poll_analysis_batches",
+        name="Store results of finished analysis message batches",
+        replace_existing=True
+    )
+    logger.info(f"Scheduled analysis batch polling: {settings.schedule_analysis_batch_poll_cron}")
 
     # Add daily summary task (daily at 8 AM)
     scheduler.add_job(
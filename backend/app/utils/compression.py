@@ -0,0 +1,100 @@
+"""
+Compact JSON blobs for rarely read payloads.
+
+Blobs start with a one-byte codec marker (b"Z" zstd, b"G" gzip) so either
+codec can be read back regardless of the current setting.
+"""
+import gzip
+import json
+from typing import Any, Dict, Iterable, Tuple
+
+# zstd is optional (requires the "zstandard" package), gzip is the fallback
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+_ZSTD = b"Z"
+_GZIP = b"G"
+
+
+def compress_json(data: Any, codec: str = "zstd", level: int = 3) -> bytes:
+    """
+    Serialize and compress a JSON-compatible value.
+
+    Args:
+        data: Value to store
+        codec: "zstd" or "gzip" (zstd falls back to gzip when not installed)
+        level: Compression level
+
+    Returns:
+        Codec marker followed by the compressed bytes
+    """
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if codec == "zstd" and ZSTD_AVAILABLE:
+        return _ZSTD + zstandard.ZstdCompressor(level=level).compress(raw)
+    return _GZIP + gzip.compress(raw, compresslevel=min(max(level, 1), 9), mtime=0)
+
+
+def decompress_json(blob: bytes) -> Any:
+    """
+    Decompress a blob written by compress_json.
+
+    Args:
+        blob: Stored bytes
+
+    Returns:
+        The original value
+    """
+    marker, payload = bytes(blob[:1]), bytes(blob[1:])
+    if marker == _ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("blob is zstd-compressed but 'zstandard' is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(payload)
+    elif marker == _GZIP:
+        raw = gzip.decompress(payload)
+    else:
+        raise ValueError(f"unknown compression marker {marker!r}")
+    return json.loads(raw)
+
+
+def split_fields(data: Dict, keep: Iterable[str], drop: Iterable[str] = ()) -> Tuple[Dict, Dict]:
+    """
+    Split a dict into allow-listed fields and the remainder.
+
+    Dotted names ("author.userName") select a field one level down.
+
+    Args:
+        data: Source dictionary (not modified)
+        keep: Field names to keep
+        drop: Field names to discard entirely (e.g. values stored elsewhere)
+
+    Returns:
+        Tuple of (kept fields, remaining fields)
+    """
+    rest = dict(data)
+    for name in drop:
+        rest.pop(name, None)
+
+    kept: Dict = {}
+    for name in keep:
+        head, _, tail = name.partition(".")
+        if head not in rest:
+            continue
+        if not tail:
+            kept[head] = rest.pop(head)
+            continue
+
+        nested = rest[head]
+        if not isinstance(nested, dict) or tail not in nested:
+            continue
+        nested = dict(nested)
+        kept.setdefault(head, {})[tail] = nested.pop(tail)
+        if nested:
+            rest[head] = nested
+        else:
+            del rest[head]
+
+    return kept, rest
+
@@ -0,0 +1,55 @@
+"""
+Recover the complete elements of a truncated or malformed JSON array.
+"""
+import json
+import re
+from typing import Any, List, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+def salvage_json_array(text: str, key: Optional[str] = None) -> List[Any]:
+    """
+    Decode a JSON array element by element, keeping every element that parses.
+
+    Handles replies cut off mid-element (e.g. at max_tokens), markdown code
+    fences, trailing commas, and an unparseable element in the middle, which
+    is skipped up to the next object.
+
+    Args:
+        text: Raw reply text or tool input JSON
+        key: Only look for the array after this object key
+            (e.g. "results" in '{"results": [...')
+
+    Returns:
+        The elements that decoded completely, in order
+    """
+    start = 0
+    if key is not None:
+        start = text.find(json.dumps(key))
+        if start < 0:
+            return []
+    start = text.find("[", start)
+    if start < 0:
+        return []
+
+    elements: List[Any] = []
+    pos = start + 1
+    while pos < len(text):
+        pos = _WHITESPACE.match(text, pos).end()
+        if pos >= len(text) or text[pos] == "]":
+            break
+        if text[pos] == ",":
+            pos += 1
+            continue
+        try:
+            element, pos = _DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # Resynchronize on the next object, or stop if the text ends here
+            pos = text.find("{", pos + 1)
+            if pos < 0:
+                break
+            continue
+        elements.append(element)
+    return elements
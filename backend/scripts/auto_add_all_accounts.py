@@ -3,9 +3,17 @@
 使用 twitterapi.io 自动获取 user_id 并添加账号
 """
 import asyncio
+import sys
+from pathlib import Path
+
 import httpx
 from loguru import logger
 
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.twitter_collector import twitter_collector
+
 
 # 需要添加的 21 个账号
 ACCOUNTS_TO_ADD = [
@@ -32,12 +40,10 @@ ACCOUNTS_TO_ADD = [
     {"username": "thinkymachines", "display_name": "Thinky Machines"},
 ]
 
-API_KEY = "new1_7590bc837c4d4104ada0ef3419ab7d6c"
-
 
 async def fetch_user_id_from_api(username: str) -> dict:
     """
-    使用 twitterapi.io 获取用户信息
+    使用 twitterapi.io 获取用户信息（复用采集服务的连接池）
 
     Args:
         username: Twitter username
@@ -45,40 +51,7 @@ async def fetch_user_id_from_api(username: str) -> dict:
     Returns:
         包含 user_id, username, display_name 的字典，失败返回 None
     """
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"https://api.twitterapi.io/twitter/user/last_tweets?userName={username}",
-                headers={"x-api-key": API_KEY}
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if data.get("status") == "success":
-                    tweets = data.get("data", {}).get("tweets", [])
-
-                    if tweets and len(tweets) > 0:
-                        author = tweets[0].get("author", {})
-
-                        return {
-                            "user_id": author.get("id"),
-                            "username": author.get("userName"),
-                            "display_name": author.get("name"),
-                        }
-                    else:
-                        logger.warning(f"@{username}: 没有找到推文数据")
-                        return None
-                else:
-                    logger.error(f"@{username}: API 返回错误 - {data.get('msg')}")
-                    return None
-            else:
-                logger.error(f"@{username}: HTTP {response.status_code}")
-                return None
-
-    except Exception as e:
-        logger.error(f"@{username}: 请求出错 - {e}")
-        return None
+    return await twitter_collector.fetch_user_by_username(username)
 
 
 async def add_account_to_system(username: str, user_id: str, display_name: str):
@@ -254,5 +227,11 @@ async def main():
     print()
 
 
+async def run():
+    """在共享的 Twitter 客户端生命周期内运行"""
+    async with twitter_collector:
+        await main()
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run())
@@ -0,0 +1,87 @@
+"""
+Benchmark AI analysis throughput versus in-flight Claude calls.
+
+Runs AIAnalyzer.analyze_batches over synthetic tweets against a local fake
+Messages API (no network, no API cost) with a fixed per-call latency, once
+per concurrency level. With --pack, requests are sized by the token-budgeted
+batch packer instead of --batch-size.
+
+Usage:
+    python scripts/benchmark_analyzer.py [--tweets 200] [--batch-size 10] [--latency 1.0]
+    python scripts/benchmark_analyzer.py --concurrency 1 2 4 8 16
+    python scripts/benchmark_analyzer.py --pack
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.batch_packer import BatchPacker
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+async def run_level(tweets, batch_size: int, concurrency: int, latency: float, pack: bool) -> dict:
+    """Analyze every batch once at the given concurrency."""
+    api = FakeMessagesAPI(latency=latency)
+    # Every level analyzes the same texts, so the cache would answer all but the first
+    cache = AnalysisCache()
+    cache.enabled = False
+    packer = BatchPacker()
+    analyzer = AIAnalyzer(client=api.client(), cache=cache, packer=packer)
+    if pack:
+        batches = packer.pack(tweets, analyzer.max_tokens)
+    else:
+        batches = [tweets[i:i + batch_size] for i in range(0, len(tweets), batch_size)]
+
+    started = time.perf_counter()
+    analyzed = 0
+    async for _, results in analyzer.analyze_batches(batches, concurrency):
+        analyzed += len(results)
+    elapsed = time.perf_counter() - started
+    await analyzer.close()
+
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "tweets_per_second": analyzed / elapsed,
+        "max_in_flight": api.max_in_flight,
+        "tweets_per_call": packer.get_stats()["tweets_per_call"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent Claude analysis")
+    parser.add_argument("--tweets", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds per fake Claude call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--pack", action="store_true", help="Size requests by estimated tokens")
+    args = parser.parse_args()
+
+    logger.remove()
+    tweets = [Tweet(tweet_id=str(i), text=f"Synthetic tweet {i} about LLM inference") for i in range(args.tweets)]
+
+    sizing = "token-packed requests" if args.pack else f"batches of {args.batch_size}"
+    print(f"{args.tweets} tweets, {sizing}, {args.latency}s per call")
+    print(f"{'concurrency':>11} {'seconds':>9} {'tweets/s':>9} {'speedup':>8} {'peak':>5} {'tweets/call':>12}")
+    baseline = None
+    for level in args.concurrency:
+        result = asyncio.run(run_level(tweets, args.batch_size, level, args.latency, args.pack))
+        baseline = baseline or result["seconds"]
+        print(
+            f"{result['concurrency']:>11} {result['seconds']:>9.2f} {result['tweets_per_second']:>9.1f} "
+            f"{baseline / result['seconds']:>7.2f}x {result['max_in_flight']:>5} {result['tweets_per_call']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark tweet payload decoding and parsing: legacy vs fast path.
+
+The legacy path is the original parse_tweet (strptime with the locale
+dependent "%a %b" format, per-metric dict lookups, a throwaway dict for
+calculate_engagement_score, raw payload kept as metadata) on bodies decoded
+with the stdlib json module. The fast path is TwitterCollector._json plus the
+current parse_tweet.
+
+The corpus is every successful page in a response archive (see
+TWITTER_ARCHIVE_DIR), or synthetic twitterapi.io pages when none is given.
+
+Usage:
+    python scripts/benchmark_parse.py [--archive-dir data/twitter_archive] [--repeat 5]
+    python scripts/benchmark_parse.py --pages 500 --page-size 20
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from loguru import logger
+
+from app.services.tweet_archive import ResponseArchive
+from app.services import twitter_collector as collector_module
+from app.services.twitter_collector import TwitterCollector
+
+
+def legacy_parse(collector: TwitterCollector, tweet_data: dict, account_id: int) -> dict:
+    """The original parse_tweet implementation."""
+    tweet_id = tweet_data.get("id")
+    text = tweet_data.get("text", "")
+
+    created_at_str = tweet_data.get("createdAt", "")
+    try:
+        created_at = datetime.strptime(created_at_str, "%a %b %d %H:%M:%S %z %Y")
+    except (ValueError, TypeError):
+        created_at = datetime.utcnow()
+
+    like_count = tweet_data.get("likeCount", 0)
+    retweet_count = tweet_data.get("retweetCount", 0)
+    reply_count = tweet_data.get("replyCount", 0)
+    bookmark_count = tweet_data.get("bookmarkCount", 0)
+
+    engagement_data = {
+        "like_count": like_count,
+        "retweet_count": retweet_count,
+        "reply_count": reply_count,
+        "bookmark_count": bookmark_count,
+    }
+    engagement_score = collector.calculate_engagement_score(engagement_data)
+
+    tweet_url = tweet_data.get("url", f"https://twitter.com/i/status/{tweet_id}")
+
+    return {
+        "tweet_id": tweet_id,
+        "user_id": account_id,
+        "text": text,
+        "created_at": created_at,
+        "tweet_url": tweet_url,
+        "like_count": like_count,
+        "retweet_count": retweet_count,
+        "reply_count": reply_count,
+        "bookmark_count": bookmark_count,
+        "engagement_score": engagement_score,
+        "metadata": tweet_data,
+        "processed": False,
+    }
+
+
+def synthetic_pages(pages: int, page_size: int) -> list:
+    """twitterapi.io-shaped last_tweets pages with realistic nesting."""
+    rng = random.Random(42)
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    bodies = []
+    for p in range(pages):
+        tweets = []
+        for i in range(page_size):
+            tweet_id = str(1_900_000_000_000_000_000 + p * page_size + i)
+            tweets.append({
+                "type": "tweet",
+                "id": tweet_id,
+                "url": f"https://x.com/user{p}/status/{tweet_id}",
+                "text": " ".join(rng.choice(["LLM", "inference", "GPU", "agents", "open", "weights", "benchmark"])
+                                 for _ in range(rng.randint(10, 50))),
+                "createdAt": f"{rng.choice(days)} {rng.choice(months)} {rng.randint(1, 28):02d} "
+                             f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} +0000 2026",
+                "lang": "en",
+                "likeCount": rng.randint(0, 5000),
+                "retweetCount": rng.randint(0, 500),
+                "replyCount": rng.randint(0, 200),
+                "quoteCount": rng.randint(0, 50),
+                "viewCount": rng.randint(0, 500000),
+                "bookmarkCount": rng.randint(0, 300),
+                "isReply": False,
+                "author": {"userName": f"user{p}", "name": f"User {p}", "followers": rng.randint(0, 10 ** 6),
+                           "description": "AI researcher " * 5, "profilePicture": "https://pbs.twimg.com/x.jpg"},
+                "entities": {"hashtags": [{"text": "AI"}], "urls": [], "user_mentions": []},
+            })
+        bodies.append(json.dumps({"status": "success", "data": {"tweets": tweets}}).encode())
+    return bodies
+
+
+def archived_pages(archive_dir: str) -> list:
+    """Re-encode successful archived pages to raw bytes."""
+    bodies = []
+    for record in ResponseArchive(archive_dir).iter_records():
+        if record.get("status") == 200 and isinstance(record.get("json"), dict):
+            bodies.append(json.dumps(record["json"]).encode())
+    return bodies
+
+
+def page_tweets(data: dict) -> list:
+    return data.get("tweets") or (data.get("data") or {}).get("tweets", [])
+
+
+def run(label: str, bodies: list, decode, parse, repeat: int) -> float:
+    """Decode and parse every page ``repeat`` times; report the best run."""
+    best = None
+    count = 0
+    for _ in range(repeat):
+        count = 0
+        started = time.perf_counter()
+        for body in bodies:
+            for tweet_data in page_tweets(decode(body)):
+                parse(tweet_data, 1)
+                count += 1
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    rate = count / best if best else 0.0
+    print(f"{label:<24} {count:>7} tweets  {best * 1000:>8.1f} ms  {rate:>12,.0f} tweets/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive-dir", default=None)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    if args.archive_dir:
+        bodies = archived_pages(args.archive_dir)
+        source = f"archive {args.archive_dir}"
+    else:
+        bodies = synthetic_pages(args.pages, args.page_size)
+        source = "synthetic pages"
+    if not bodies:
+        print("No pages to benchmark")
+        return
+
+    collector = TwitterCollector()
+    legacy_decode = lambda body: httpx.Response(200, content=body).json()  # noqa: E731
+    fast_decode = lambda body: collector._json(httpx.Response(200, content=body))  # noqa: E731
+
+    print(f"{len(bodies)} pages from {source}, orjson={'yes' if collector_module.ORJSON_AVAILABLE else 'no'}")
+    parse_legacy = run("parse only (legacy)", [json.loads(b) for b in bodies], lambda d: d,
+                       lambda t, a: legacy_parse(collector, t, a), args.repeat)
+    parse_fast = run("parse only (fast)", [json.loads(b) for b in bodies], lambda d: d,
+                     collector.parse_tweet, args.repeat)
+    full_legacy = run("decode+parse (legacy)", bodies, legacy_decode,
+                      lambda t, a: legacy_parse(collector, t, a), args.repeat)
+    full_fast = run("decode+parse (fast)", bodies, fast_decode, collector.parse_tweet, args.repeat)
+
+    print(f"speedup: parse {parse_fast / parse_legacy:.2f}x, decode+parse {full_fast / full_legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
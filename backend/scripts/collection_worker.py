@@ -0,0 +1,52 @@
+"""
+Run tweet collection workers that lease due accounts from the database.
+
+Start as many as needed, on one machine or several sharing DATABASE_URL.
+Set COLLECTION_WORKERS_ENABLED=True so the scheduler only analyzes tweets
+and leaves collection to the workers.
+
+Usage:
+    python scripts/collection_worker.py                # one worker, runs until stopped
+    python scripts/collection_worker.py --processes 4  # four local worker processes
+    python scripts/collection_worker.py --once         # exit when no account is due
+"""
+import argparse
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.tasks.collection_worker import default_worker_id, run_worker_process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run tweet collection workers")
+    parser.add_argument("--processes", type=int, default=1, help="Local worker processes to start")
+    parser.add_argument("--worker-id", default=None, help="Lease owner name (single process only)")
+    parser.add_argument("--once", action="store_true", help="Exit when no account is due")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        totals = [run_worker_process(args.worker_id or default_worker_id(), once=args.once)]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.processes, mp_context=context) as pool:
+            futures = [pool.submit(run_worker_process, None, args.once) for _ in range(args.processes)]
+            totals = [future.result() for future in futures]
+
+    for worker in totals:
+        print(
+            f"{worker['worker_id']}: {worker['tweets']} tweets from {worker['accounts']} accounts "
+            f"({worker['failed_accounts']} failed) in {worker['batches']} batches"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        # Unreleased leases expire after WORKER_LEASE_SECONDS
+        sys.exit(130)
@@ -1,7 +1,6 @@
 """
 Script to fetch Twitter user IDs for given usernames.
 """
-import httpx
 import asyncio
 import sys
 from pathlib import Path
@@ -9,7 +8,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from app.config import settings
+from app.services.twitter_collector import twitter_collector
 from loguru import logger
 
 
@@ -50,39 +49,15 @@ async def fetch_user_id(username: str) -> dict:
     """
     Fetch user ID and display name for a given username.
 
+    Uses the shared pooled client of the Twitter collector.
+
     Args:
         username: Twitter username (without @)
 
     Returns:
         Dictionary with user_id, username, and display_name
     """
-    headers = {
-        "x-api-key": settings.twitter_api_key,
-        "Content-Type": "application/json"
-    }
-
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{settings.twitter_api_base_url}/users/by/username/{username}",
-                headers=headers,
-                params={"user.fields": "name,username"}
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            user_data = data.get("data", {})
-            return {
-                "user_id": user_data.get("id"),
-                "username": user_data.get("username"),
-                "display_name": user_data.get("name"),
-            }
-    except httpx.HTTPError as e:
-        logger.error(f"HTTP error fetching user {username}: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Error fetching user {username}: {e}")
-        return None
+    return await twitter_collector.fetch_user_by_username(username)
 
 
 async def main():
@@ -90,18 +65,19 @@ async def main():
     logger.info(f"Fetching user IDs for {len(USERNAMES)} accounts")
 
     results = []
-    for username in USERNAMES:
-        logger.info(f"Fetching {username}...")
-        user_data = await fetch_user_id(username)
-
-        if user_data:
-            results.append(user_data)
-            logger.info(f"✓ {username}: {user_data['user_id']}")
-        else:
-            logger.warning(f"✗ Failed to fetch {username}")
-
-        # Rate limiting - wait a bit between requests
-        await asyncio.sleep(0.5)
+    async with twitter_collector:
+        for username in USERNAMES:
+            logger.info(f"Fetching {username}...")
+            user_data = await fetch_user_id(username)
+
+            if user_data:
+                results.append(user_data)
+                logger.info(f"✓ {username}: {user_data['user_id']}")
+            else:
+                logger.warning(f"✗ Failed to fetch {username}")
+
+            # Rate limiting - wait a bit between requests
+            await asyncio.sleep(0.5)
 
     # Print results in Python format
     print("\n" + "="*80)
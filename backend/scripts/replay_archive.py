@@ -0,0 +1,124 @@
+"""
+Work with archived twitterapi.io responses offline (no API quota used).
+
+Modes:
+    parse    Benchmark TwitterCollector.parse_tweet over every archived tweet
+    collect  Run collect_all_tweets against the archive (replay transport)
+    rebuild  Re-insert every archived tweet into the database, e.g. after a
+             schema change (accounts are matched by author userName)
+
+Usage:
+    python scripts/replay_archive.py parse --archive-dir data/twitter_archive [--days 14]
+    python scripts/replay_archive.py collect --archive-dir data/twitter_archive --database-url sqlite:///replay.db
+    python scripts/replay_archive.py rebuild --archive-dir data/twitter_archive
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, SessionLocal
+from app.models.monitored_account import MonitoredAccount
+from app.services.tweet_archive import ResponseArchive, replay_window
+from app.services.twitter_collector import TwitterCollector
+
+
+def benchmark_parse(archive: ResponseArchive, start, end):
+    """Time parse_tweet over all archived tweets."""
+    collector = TwitterCollector()
+    tweets = list(archive.iter_tweets(start, end))
+    if not tweets:
+        print("No archived tweets in range")
+        return
+
+    started = time.perf_counter()
+    for tweet_data in tweets:
+        collector.parse_tweet(tweet_data, 0)
+    elapsed = time.perf_counter() - started
+    print(f"parsed {len(tweets)} tweets in {elapsed:.3f}s ({elapsed / len(tweets) * 1e6:.1f} us/tweet)")
+
+
+def open_session(database_url):
+    """Session for --database-url (tables created), or the configured database."""
+    if not database_url:
+        return SessionLocal()
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+async def replay_collect(archive_dir: str, database_url):
+    """Run a full collection cycle served from the archive."""
+    db = open_session(database_url)
+    try:
+        async with TwitterCollector(replay_dir=archive_dir) as collector:
+            started = time.perf_counter()
+            stats = await collector.collect_all_tweets(db)
+            elapsed = time.perf_counter() - started
+            transport = collector.client._transport
+            print(f"{stats} in {elapsed:.2f}s (archive hits={transport.hits}, misses={transport.misses})")
+    finally:
+        db.close()
+
+
+def rebuild(archive: ResponseArchive, start, end, database_url):
+    """Insert every archived tweet for known accounts, skipping duplicates."""
+    db = open_session(database_url)
+    collector = TwitterCollector()
+    try:
+        accounts = {
+            account.username.lower(): account.id
+            for account in db.query(MonitoredAccount).all()
+        }
+        rows, unknown = [], set()
+        for tweet_data in archive.iter_tweets(start, end):
+            username = (tweet_data.get("author") or {}).get("userName", "")
+            account_id = accounts.get(username.lower())
+            if account_id is None:
+                unknown.add(username)
+                continue
+            rows.append(collector.parse_tweet(tweet_data, account_id))
+
+        started = time.perf_counter()
+        inserted = collector.insert_tweets(db, rows)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"inserted {inserted} of {len(rows)} archived tweets in {elapsed:.2f}s")
+        if unknown:
+            print(f"skipped tweets from {len(unknown)} unknown accounts: {', '.join(sorted(unknown)[:10])}")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["parse", "collect", "rebuild"])
+    parser.add_argument("--archive-dir", required=True)
+    parser.add_argument("--days", type=int, default=None, help="Only use the last N days of the archive")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    archive = ResponseArchive(args.archive_dir)
+    start, end = replay_window(args.days) if args.days else (None, None)
+
+    if args.mode == "parse":
+        benchmark_parse(archive, start, end)
+    elif args.mode == "collect":
+        asyncio.run(replay_collect(args.archive_dir, args.database_url))
+    else:
+        rebuild(archive, start, end, args.database_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Re-score stored analyses against the rolling engagement percentiles.
+
+Importance scores written before rolling normalization were scaled by the
+maximum engagement of whichever batch a tweet was analyzed in. This
+recomputes them for history so rankings are comparable across days.
+
+Usage:
+    python scripts/rescore_importance.py --backfill           # rebuild the histogram, then re-score everything
+    python scripts/rescore_importance.py --since 2026-09-01   # only tweets created since a date
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import get_db_context
+from app.services.ai_analyzer import ai_analyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score importance against rolling engagement percentiles")
+    parser.add_argument("--backfill", action="store_true", help="Rebuild the engagement histogram from stored tweets first")
+    parser.add_argument("--since", default=None, help="Only tweets created on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows updated per commit")
+    args = parser.parse_args()
+
+    since = datetime.fromisoformat(args.since) if args.since else None
+
+    with get_db_context() as db:
+        if args.backfill:
+            counted = ai_analyzer.normalizer.backfill(db)
+            print(f"Engagement histogram rebuilt from {counted} tweets")
+
+        try:
+            updated = ai_analyzer.rescore_importance(db, since=since, chunk_size=args.chunk_size)
+        except ValueError as e:
+            print(f"Cannot re-score: {e}")
+            sys.exit(1)
+
+        stats = ai_analyzer.normalizer.get_stats()
+        print(f"Re-scored {updated} processed tweets against {stats['samples']} tweets ({stats['quantiles']})")
+
+
+if __name__ == "__main__":
+    main()
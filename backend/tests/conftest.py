@@ -2,15 +2,22 @@
 Test configuration and fixtures for pytest.
 """
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, BigInteger
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
 from app.database import Base
 from app.config import settings
 
 
-@pytest.fixture(scope="session")
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    """SQLite only auto-increments INTEGER PRIMARY KEY columns."""
+    return "INTEGER"
+
+
+@pytest.fixture(scope="function")
 def test_engine():
-    """Create test database engine."""
+    """Create a fresh test database engine per test."""
     # Use in-memory SQLite for tests
     engine = create_engine("sqlite:///:memory:")
     Base.metadata.create_all(engine)
@@ -29,6 +36,14 @@ def test_db(test_engine):
         db.close()
 
 
+@pytest.fixture(scope="function")
+def test_analysis_cache(test_engine):
+    """Analysis cache backed by the test database."""
+    from app.services.analysis_cache import AnalysisCache
+
+    return AnalysisCache(session_factory=sessionmaker(autocommit=False, autoflush=False, bind=test_engine))
+
+
 @pytest.fixture
 def sample_tweet_data():
     """Sample tweet data for testing."""
@@ -0,0 +1,308 @@
+"""
+In-process stand-in for the Anthropic Messages API.
+
+Serves ``POST /v1/messages`` (plain or streamed, text or forced tool use)
+and the Message Batches endpoints through an httpx transport with a
+configurable latency, so analyzer code can be benchmarked and tested against
+the real SDK without network access or API cost.
+"""
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import anthropic
+import httpx
+
+_TWEET_HEADER = re.compile(r"^Tweet \d+ \(ID: ([^)]+)\):", re.MULTILINE)
+
+# Characters per streamed delta
+_STREAM_CHUNK = 64
+
+
+def _prompt(body: Dict) -> str:
+    prompt = body["messages"][-1]["content"]
+    if not isinstance(prompt, str):
+        prompt = "".join(block.get("text", "") for block in prompt)
+    return prompt
+
+
+def analysis_responder(body: Dict) -> str:
+    """
+    Answer an analyze_tweet_batch prompt with one result per tweet.
+
+    Args:
+        body: Decoded request body
+
+    Returns:
+        Response text (a JSON array, as Claude would return it); when the
+        request offers tools it becomes the tool input's "results"
+    """
+    prompt = _prompt(body)
+    return json.dumps([
+        {
+            "tweet_id": tweet_id,
+            "is_ai_related": True,
+            "ai_relevance_score": 7,
+            "summary": f"Summary of {tweet_id}",
+            "topics": ["LLM"],
+        }
+        for tweet_id in _TWEET_HEADER.findall(prompt)
+    ])
+
+
+def translation_responder(body: Dict) -> str:
+    """
+    Answer a translation prompt: one result per tweet header when batched,
+    plain text for a single tweet.
+
+    Args:
+        body: Decoded request body
+
+    Returns:
+        Response text
+    """
+    if not body.get("tools"):
+        return "翻译"
+    return json.dumps([
+        {"tweet_id": tweet_id, "translation": f"翻译 {tweet_id}"}
+        for tweet_id in _TWEET_HEADER.findall(_prompt(body))
+    ], ensure_ascii=False)
+
+
+def default_responder(body: Dict) -> str:
+    """Dispatch translation prompts to translation_responder and the rest to analysis_responder."""
+    if _prompt(body).startswith("Translate"):
+        return translation_responder(body)
+    return analysis_responder(body)
+
+
+class FakeMessagesAPI:
+    """Fake Messages endpoints that record request counts and concurrency."""
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        responder: Optional[Callable[[Dict], str]] = None,
+        polls_until_ended: int = 1,
+        rate_limited: int = 0,
+        rate_limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            latency: Seconds each request takes
+            responder: Builds the response text from the decoded request body
+                (defaults to default_responder)
+            polls_until_ended: Batch retrievals answered "in_progress" before
+                a Message Batch ends
+            rate_limited: Initial message requests answered with 429
+            rate_limits: Per-minute "requests" and "tokens" limits reported in
+                the anthropic-ratelimit-* headers
+        """
+        self.latency = latency
+        self.responder = responder or default_responder
+        self.polls_until_ended = polls_until_ended
+        self.rate_limited = rate_limited
+        self.rate_limits = rate_limits or {"requests": 4000, "tokens": 400000}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batches: Dict[str, Dict] = {}
+        self.batches_created = 0
+        self.errored_custom_ids: Set[str] = set()  # Batch requests that come back errored
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """httpx.MockTransport handler."""
+        parts = request.url.path.strip("/").split("/")  # ["v1", "messages", ...]
+        if parts[:2] != ["v1", "messages"]:
+            return self._not_found()
+        if len(parts) == 2 and request.method == "POST":
+            return await self._create_message(request)
+        if len(parts) == 3 and parts[2] == "batches" and request.method == "POST":
+            return self._create_batch(request)
+        if len(parts) == 5 and parts[2] == "batches" and parts[4] == "cancel" and request.method == "POST":
+            batch = self.batches.get(parts[3])
+            if batch is None:
+                return self._not_found()
+            batch["cancelled"] = True
+            return httpx.Response(200, json=self._batch_object(batch))
+        if len(parts) >= 4 and parts[2] == "batches" and request.method == "GET":
+            batch = self.batches.get(parts[3])
+            if batch is None:
+                return self._not_found()
+            if len(parts) == 5 and parts[4] == "results":
+                return self._batch_results(batch)
+            batch["polls"] += 1
+            return httpx.Response(200, json=self._batch_object(batch))
+        return self._not_found()
+
+    @staticmethod
+    def _not_found() -> httpx.Response:
+        return httpx.Response(404, json={"type": "error", "error": {"type": "not_found_error", "message": "not found"}})
+
+    @staticmethod
+    def _reply(body: Dict, text: str) -> Tuple[str, str, int]:
+        """Reply content (tool input JSON when tools are offered), stop reason and output tokens."""
+        stop_reason = "end_turn"
+        if body.get("tools"):
+            text = '{"results": ' + text + "}"
+            stop_reason = "tool_use"
+        # ~4 characters per token; replies longer than max_tokens are cut off
+        output_tokens = len(text) // 4
+        if output_tokens > body.get("max_tokens", output_tokens):
+            output_tokens = body["max_tokens"]
+            text = text[:output_tokens * 4]
+            stop_reason = "max_tokens"
+        return text, stop_reason, output_tokens
+
+    @staticmethod
+    def _content_block(message_id: str, body: Dict, content: str, complete: bool) -> Dict:
+        if not body.get("tools"):
+            return {"type": "text", "text": content}
+        try:
+            tool_input = json.loads(content) if complete else {}
+        except ValueError:
+            tool_input = {}
+        return {"type": "tool_use", "id": f"toolu_{message_id}", "name": body["tools"][0]["name"], "input": tool_input}
+
+    def _message(self, message_id: str, body: Dict, text: str) -> Dict:
+        content, stop_reason, output_tokens = self._reply(body, text)
+        return {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [self._content_block(message_id, body, content, stop_reason != "max_tokens")],
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": len(json.dumps(body)) // 4,
+                "output_tokens": output_tokens,
+            },
+        }
+
+    def _stream(self, message_id: str, body: Dict, text: str) -> httpx.Response:
+        content, stop_reason, output_tokens = self._reply(body, text)
+        if body.get("tools"):
+            block = {"type": "tool_use", "id": f"toolu_{message_id}", "name": body["tools"][0]["name"], "input": {}}
+            delta_type, delta_field = "input_json_delta", "partial_json"
+        else:
+            block = {"type": "text", "text": ""}
+            delta_type, delta_field = "text_delta", "text"
+
+        events: List[Dict] = [
+            {"type": "message_start", "message": {
+                "id": message_id, "type": "message", "role": "assistant", "model": body.get("model"),
+                "content": [], "stop_reason": None, "stop_sequence": None,
+                "usage": {"input_tokens": len(json.dumps(body)) // 4, "output_tokens": 0},
+            }},
+            {"type": "content_block_start", "index": 0, "content_block": block},
+        ]
+        events += [
+            {"type": "content_block_delta", "index": 0,
+             "delta": {"type": delta_type, delta_field: content[start:start + _STREAM_CHUNK]}}
+            for start in range(0, len(content), _STREAM_CHUNK)
+        ]
+        events += [
+            {"type": "content_block_stop", "index": 0},
+            {"type": "message_delta", "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+             "usage": {"output_tokens": output_tokens}},
+            {"type": "message_stop"},
+        ]
+        payload = "".join(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" for event in events)
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=payload.encode())
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        """anthropic-ratelimit-* headers; the fake never runs out before its 429s."""
+        headers = {}
+        for kind, limit in self.rate_limits.items():
+            headers[f"anthropic-ratelimit-{kind}-limit"] = str(limit)
+            headers[f"anthropic-ratelimit-{kind}-remaining"] = str(limit)
+        return headers
+
+    async def _create_message(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests += 1
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return httpx.Response(
+                429,
+                headers={"retry-after": "0", **self._rate_limit_headers()},
+                json={"type": "error", "error": {"type": "rate_limit_error", "message": "rate limited"}},
+            )
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            text = self.responder(body)
+        finally:
+            self.in_flight -= 1
+
+        message_id = f"msg_fake_{self.requests}"
+        if body.get("stream"):
+            response = self._stream(message_id, body, text)
+        else:
+            response = httpx.Response(200, json=self._message(message_id, body, text))
+        response.headers.update(self._rate_limit_headers())
+        return response
+
+    def _create_batch(self, request: httpx.Request) -> httpx.Response:
+        self.batches_created += 1
+        batch_id = f"msgbatch_fake_{self.batches_created}"
+        batch = {
+            "id": batch_id,
+            "requests": json.loads(request.content)["requests"],
+            "created_at": datetime.now(timezone.utc),
+            "polls": 0,
+        }
+        self.batches[batch_id] = batch
+        return httpx.Response(200, json=self._batch_object(batch))
+
+    def _batch_object(self, batch: Dict) -> Dict:
+        ended = batch["polls"] > self.polls_until_ended
+        total = len(batch["requests"])
+        errored = sum(1 for r in batch["requests"] if r["custom_id"] in self.errored_custom_ids)
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": batch["created_at"].isoformat(),
+            "expires_at": (batch["created_at"] + timedelta(hours=24)).isoformat(),
+            "ended_at": datetime.now(timezone.utc).isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": batch["created_at"].isoformat() if batch.get("cancelled") else None,
+            "results_url": (
+                f"https://api.anthropic.com/v1/messages/batches/{batch['id']}/results" if ended else None
+            ),
+        }
+
+    def _batch_results(self, batch: Dict) -> httpx.Response:
+        lines = []
+        for number, item in enumerate(batch["requests"], 1):
+            custom_id = item["custom_id"]
+            if custom_id in self.errored_custom_ids:
+                result = {"type": "errored", "error": {
+                    "type": "error", "error": {"type": "api_error", "message": "fake failure"}
+                }}
+            else:
+                text = self.responder(item["params"])
+                result = {"type": "succeeded", "message": self._message(f"msg_batch_{number}", item["params"], text)}
+            lines.append(json.dumps({"custom_id": custom_id, "result": result}))
+        # Results are not returned in request order
+        return httpx.Response(200, content="\n".join(reversed(lines)).encode())
+
+    def client(self) -> anthropic.AsyncAnthropic:
+        """AsyncAnthropic client whose requests are answered by this fake."""
+        return anthropic.AsyncAnthropic(
+            api_key="fake",
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle)),
+        )
@@ -0,0 +1,138 @@
+"""
+Tests for the per-account circuit breaker.
+"""
+import asyncio
+import httpx
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+from app.services.account_breaker import AccountCircuitBreaker
+from app.services.twitter_collector import TwitterCollector
+
+
+def test_cooldown_grows_exponentially_and_caps(monkeypatch):
+    """Test the cool-down schedule around the failure threshold."""
+    monkeypatch.setattr(settings, "account_breaker_failure_threshold", 3)
+    monkeypatch.setattr(settings, "account_breaker_base_cooldown_minutes", 60)
+    monkeypatch.setattr(settings, "account_breaker_max_cooldown_minutes", 300)
+    breaker = AccountCircuitBreaker()
+
+    assert [breaker.compute_cooldown(n) for n in range(1, 8)] == [0, 0, 60, 120, 240, 300, 300]
+
+
+def test_failures_open_then_deactivate(monkeypatch):
+    """Test that failures open the breaker, success closes it, and dead accounts deactivate."""
+    monkeypatch.setattr(settings, "account_breaker_failure_threshold", 2)
+    monkeypatch.setattr(settings, "account_breaker_deactivate_after", 4)
+    breaker = AccountCircuitBreaker()
+    account = MonitoredAccount(username="flaky", is_active=True, consecutive_failures=0)
+    now = datetime(2026, 1, 1, 12, 0)
+
+    assert not breaker.record_failure(account, "timeout", now=now)
+    assert account.breaker_open_until is None
+    assert not breaker.record_failure(account, "timeout", now=now)
+    assert account.breaker_open_until > now
+
+    breaker.record_success(account)
+    assert account.consecutive_failures == 0
+    assert account.breaker_open_until is None
+
+    # Unavailable trips the breaker at once
+    assert not breaker.record_failure(account, "unavailable: Suspended", unavailable=True, now=now)
+    assert account.consecutive_failures == 2
+    assert account.breaker_open_until is not None
+
+    breaker.record_failure(account, "unavailable: Suspended", unavailable=True, now=now)
+    assert breaker.record_failure(account, "unavailable: Suspended", unavailable=True, now=now)
+    assert account.is_active is False
+    assert account.deactivated_at == now
+
+
+def _collector(statuses):
+    """Collector whose API answers per username: "ok", "unavailable", "down" (503) or "forbidden" (403)."""
+    requests = []
+
+    def handler(request):
+        username = request.url.params["userName"]
+        requests.append(username)
+        status = statuses[username]
+        if status == "down":
+            return httpx.Response(503)
+        if status == "forbidden":
+            return httpx.Response(403)
+        if status == "unavailable":
+            return httpx.Response(200, json={
+                "status": "success",
+                "data": {"unavailable": True, "unavailableReason": "Suspended"},
+            })
+        return httpx.Response(200, json={"status": "success", "data": {"tweets": []}})
+
+    collector = TwitterCollector()
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    collector.request_engine.max_retries = 0
+    return collector, requests
+
+
+def test_collect_skips_open_breakers(test_db):
+    """Test that a suspended account is skipped on the next run while others continue."""
+    test_db.add_all([
+        MonitoredAccount(user_id="1", username="alive", is_active=True),
+        MonitoredAccount(user_id="2", username="suspended", is_active=True),
+        MonitoredAccount(user_id="3", username="outage", is_active=True),
+    ])
+    test_db.commit()
+    collector, requests = _collector({"alive": "ok", "suspended": "unavailable", "outage": "down"})
+
+    stats = asyncio.run(collector.collect_all_tweets(test_db, due_only=False))
+    assert stats["successful_accounts"] == 1
+    assert stats["failed_accounts"] == 2
+
+    suspended = test_db.query(MonitoredAccount).filter_by(username="suspended").one()
+    outage = test_db.query(MonitoredAccount).filter_by(username="outage").one()
+    assert suspended.breaker_open_until > datetime.utcnow()
+    assert suspended.last_failure_reason == "unavailable: Suspended"
+    # API-wide failures (retries exhausted) do not count against the account
+    assert outage.consecutive_failures == 0
+
+    requests.clear()
+    stats = asyncio.run(collector.collect_all_tweets(test_db, due_only=False))
+    assert sorted(requests) == ["alive", "outage"]
+    assert stats["total_accounts"] == 2
+
+
+def test_collect_retries_after_cooldown(test_db):
+    """Test that an account is polled again once its cool-down has passed."""
+    test_db.add(MonitoredAccount(
+        user_id="1",
+        username="recovered",
+        is_active=True,
+        consecutive_failures=3,
+        breaker_open_until=datetime.utcnow() - timedelta(minutes=1),
+    ))
+    test_db.commit()
+    collector, requests = _collector({"recovered": "ok"})
+
+    asyncio.run(collector.collect_all_tweets(test_db, due_only=False))
+
+    account = test_db.query(MonitoredAccount).one()
+    assert requests == ["recovered"]
+    assert account.consecutive_failures == 0
+    assert account.breaker_open_until is None
+
+
+def test_account_errors_trip_the_breaker(test_db, monkeypatch):
+    """Test that an account answered with an error status fails instead of counting as empty."""
+    monkeypatch.setattr(settings, "account_breaker_failure_threshold", 2)
+    test_db.add(MonitoredAccount(user_id="1", username="blocked", is_active=True))
+    test_db.commit()
+    collector, requests = _collector({"blocked": "forbidden"})
+
+    for _ in range(2):
+        stats = asyncio.run(collector.collect_all_tweets(test_db, due_only=False))
+        assert (stats["successful_accounts"], stats["failed_accounts"]) == (0, 1)
+
+    account = test_db.query(MonitoredAccount).one()
+    assert account.consecutive_failures == 2
+    assert account.last_failure_reason == "HTTP 403"
+    assert account.breaker_open_until > datetime.utcnow()
@@ -0,0 +1,99 @@
+"""
+Tests for bulk account onboarding.
+"""
+import asyncio
+import httpx
+
+from app.models.monitored_account import MonitoredAccount
+from app.services.account_onboarding import AccountOnboarding
+from app.services.twitter_collector import TwitterCollector
+from app.utils.ttl_cache import TTLCache
+
+
+def _onboarding(known_users, delay=0.0):
+    """Onboarding whose API knows ``known_users`` (username -> user_id)."""
+    stats = {"requests": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        username = request.url.params["userName"]
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        await asyncio.sleep(delay)
+        stats["in_flight"] -= 1
+        if username not in known_users:
+            return httpx.Response(200, json={"status": "success", "data": {"tweets": []}})
+        author = {"id": known_users[username], "userName": username, "name": username.title()}
+        return httpx.Response(200, json={"status": "success", "data": {"tweets": [{"author": author}]}})
+
+    collector = TwitterCollector()
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AccountOnboarding(collector), stats
+
+
+def test_onboard_bulk_inserts_and_skips_existing(test_db):
+    """Test one pass resolving, de-duplicating and inserting a mixed list."""
+    test_db.add(MonitoredAccount(user_id="100", username="Existing", is_active=True))
+    test_db.commit()
+    onboarding, stats = _onboarding({"alice": "1", "bob": "2", "existing": "100"})
+
+    result = asyncio.run(onboarding.onboard(test_db, [
+        {"username": "@alice"},
+        {"username": "bob", "display_name": "Bobby"},
+        {"username": "ALICE"},
+        {"username": "existing"},
+        {"username": "ghost"},
+        {"username": "carol", "user_id": "3"},
+    ]))
+
+    assert result["added"] == 3
+    assert result["skipped"] == 2
+    assert result["errors"] == 1
+    assert result["details"]["errors"][0]["username"] == "ghost"
+    # carol already had a user_id; ALICE was a duplicate of alice
+    assert stats["requests"] == 4
+
+    accounts = {a.username: a for a in test_db.query(MonitoredAccount).all()}
+    assert accounts["alice"].user_id == "1"
+    assert accounts["alice"].display_name == "Alice"
+    assert accounts["bob"].display_name == "Bobby"
+    assert accounts["carol"].user_id == "3"
+    assert accounts["alice"].created_at is not None
+
+
+def test_onboard_resolves_concurrently_and_caches(test_db, monkeypatch):
+    """Test bounded concurrent lookups and the username cache."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "collection_concurrency", 5)
+    users = {f"user{i}": str(i) for i in range(20)}
+    onboarding, stats = _onboarding(users, delay=0.05)
+    job = onboarding.create_job([{"username": u} for u in users])
+
+    result = asyncio.run(onboarding.onboard(test_db, [{"username": u} for u in users], job=job))
+
+    assert result["added"] == 20
+    assert job["resolved"] == 20
+    assert stats["max_in_flight"] == 5
+
+    # Second import of the same handles hits the cache, not the API
+    stats["requests"] = 0
+    result = asyncio.run(onboarding.onboard(test_db, [{"username": u} for u in users]))
+    assert stats["requests"] == 0
+    assert result["skipped"] == 20
+
+
+def test_ttl_cache_expires(monkeypatch):
+    """Test expiry and LRU eviction."""
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.utils.ttl_cache.time.monotonic", lambda: now["t"])
+    cache = TTLCache(ttl=60, maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts b, the least recently used
+    assert cache.get("b") is None
+
+    now["t"] += 61
+    assert cache.get("a") is None
+    assert cache.get_stats()["hits"] == 1
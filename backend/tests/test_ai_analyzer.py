@@ -1,8 +1,17 @@
 """
 Tests for AI analyzer service.
 """
+import asyncio
+import json
 import pytest
+from datetime import datetime, timedelta
+
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
 from app.services.ai_analyzer import AIAnalyzer
+from app.services.batch_packer import BatchPacker
+from tests.fake_anthropic import FakeMessagesAPI, analysis_responder
+from app.utils.json_salvage import salvage_json_array
 
 
 def test_calculate_importance_score():
@@ -66,3 +75,92 @@ def test_calculate_importance_score_zero_max():
     # When max is 0, normalized engagement should be 0
     # Expected: 0*0.7 + 5*0.3 = 1.5
     assert importance == 1.5
+
+
+def test_process_unprocessed_tweets_concurrently(test_db, sample_monitored_account, test_analysis_cache):
+    """Test that batches run concurrently against the fake Messages API and commit in order."""
+    now = datetime.utcnow()
+    for i in range(12):
+        test_db.add(Tweet(
+            tweet_id=str(i), user_id=sample_monitored_account.id, text=f"tweet {i}",
+            created_at=now - timedelta(minutes=i), tweet_url=f"https://x.com/i/status/{i}",
+            engagement_score=float(i)
+        ))
+    test_db.commit()
+
+    api = FakeMessagesAPI(latency=0.1)
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache)
+
+    processed = asyncio.run(analyzer.process_unprocessed_tweets(test_db, batch_size=2, concurrency=3))
+
+    assert processed == 12
+    assert api.requests == 6
+    assert api.max_in_flight == 3
+
+    # Results are matched to the right tweets and stored newest batch first
+    rows = test_db.query(ProcessedTweet).order_by(ProcessedTweet.id).all()
+    assert [row.tweet.tweet_id for row in rows] == [str(i) for i in range(12)]
+    assert all(row.summary == f"Summary of {row.tweet.tweet_id}" for row in rows)
+
+
+def test_salvage_json_array():
+    """Test that complete elements survive truncation and malformed elements."""
+    truncated = '```json\n[{"tweet_id": "1", "ok": true}, {"tweet_id": "2"}, {"tweet_id": "3", "ok'
+    assert salvage_json_array(truncated) == [{"tweet_id": "1", "ok": True}, {"tweet_id": "2"}]
+
+    malformed = '[{"tweet_id": "1"}, {"tweet_id": 2 3}, {"tweet_id": "3"},]'
+    assert salvage_json_array(malformed) == [{"tweet_id": "1"}, {"tweet_id": "3"}]
+
+    tool_input = '{"results": [{"tweet_id": "1", "topics": ["LLM"]}, {"tweet_id": "2", "topics": ["G'
+    assert salvage_json_array(tool_input, key="results") == [{"tweet_id": "1", "topics": ["LLM"]}]
+    assert salvage_json_array("no json here") == []
+
+
+def test_results_matched_by_tweet_id_and_missing_requeued(test_analysis_cache):
+    """Test that shuffled, partial replies are matched by ID and only missing tweets are re-sent."""
+    sent = []
+
+    def responder(body):
+        # Reversed order, dropping the first tweet of every multi-tweet request
+        results = json.loads(analysis_responder(body))
+        sent.append([r["tweet_id"] for r in results])
+        if len(results) > 1:
+            results = results[1:]
+        return json.dumps(list(reversed(results)))
+
+    api = FakeMessagesAPI(latency=0, responder=responder)
+    packer = BatchPacker()
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache, packer=packer)
+
+    tweets = [Tweet(tweet_id=str(i), text=f"tweet {i}") for i in range(4)]
+    results = asyncio.run(analyzer.analyze_tweet_batch(tweets))
+
+    assert [(r["tweet_id"], r["summary"]) for r in results] == [(str(i), f"Summary of {i}") for i in range(4)]
+    assert sent == [["0", "1", "2", "3"], ["0"]]
+    assert packer.get_stats()["requeued"] == 1
+
+
+def test_store_batch_results_matches_by_tweet_id(test_db, sample_monitored_account):
+    """Test that results are stored for the tweet they name and missing tweets stay unprocessed."""
+    now = datetime.utcnow()
+    tweets = []
+    for i in range(3):
+        tweet = Tweet(
+            tweet_id=str(i), user_id=sample_monitored_account.id, text=f"tweet {i}",
+            created_at=now, tweet_url=f"https://x.com/i/status/{i}", engagement_score=1.0
+        )
+        test_db.add(tweet)
+        tweets.append(tweet)
+    test_db.commit()
+
+    results = [
+        {"tweet_id": "2", "is_ai_related": True, "ai_relevance_score": 9, "summary": "two"},
+        {"tweet_id": "0", "is_ai_related": False, "ai_relevance_score": 1},
+        {"tweet_id": "7", "is_ai_related": True, "ai_relevance_score": 9},  # Unknown tweet
+    ]
+    processed, ai_related = AIAnalyzer().store_batch_results(test_db, tweets, results, 1.0)
+    test_db.commit()
+
+    assert (processed, ai_related) == (2, 1)
+    assert [tweet.processed for tweet in tweets] == [True, False, True]
+    assert tweets[2].processed_tweet.summary == "two"
@@ -0,0 +1,63 @@
+"""
+Tests for the content-hash analysis cache.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.analysis_cache import normalize_text
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+def test_normalize_text():
+    """Test that URLs, whitespace and case do not change the cache key."""
+    assert normalize_text("Big  LAUNCH today\n https://t.co/abc123 ") == "big launch today"
+    assert normalize_text("big launch today https://example.com/x?y=1") == "big launch today"
+
+
+def test_duplicate_texts_skip_the_api(test_db, test_analysis_cache):
+    """Test that duplicates within and across batches reuse one analysis."""
+    api = FakeMessagesAPI(latency=0)
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache)
+
+    first = [
+        Tweet(tweet_id="1", text="Big launch today https://t.co/aaa"),
+        Tweet(tweet_id="2", text="big   LAUNCH today https://t.co/bbb"),
+        Tweet(tweet_id="3", text="Something else"),
+    ]
+    results = asyncio.run(analyzer.analyze_tweet_batch(first))
+    assert [r["tweet_id"] for r in results] == ["1", "2", "3"]
+    assert results[1]["summary"] == results[0]["summary"] == "Summary of 1"
+    assert api.requests == 1
+
+    # A cross-post in a later batch is answered from the database
+    results = asyncio.run(analyzer.analyze_tweet_batch([Tweet(tweet_id="9", text="BIG launch today")]))
+    assert results == [{
+        "is_ai_related": True, "ai_relevance_score": 7, "summary": "Summary of 1",
+        "topics": ["LLM"], "tweet_id": "9"
+    }]
+    assert api.requests == 1
+
+    stats = test_analysis_cache.get_stats(test_db)
+    assert (stats["lookups"], stats["hits"], stats["entries"]) == (4, 2, 2)
+    assert stats["hit_rate"] == 0.5
+    assert stats["estimated_tokens_saved"] > 0
+    assert test_db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.hits == 1).count() == 1
+
+
+def test_expired_entries_miss_and_prune(test_db, test_analysis_cache):
+    """Test the TTL and entry-count bounds."""
+    cache = test_analysis_cache
+    cache.store([("a", {"is_ai_related": True}), ("b", {"is_ai_related": False}), ("c", {"is_ai_related": True})])
+    test_db.query(AnalysisCacheEntry).filter(AnalysisCacheEntry.content_hash == "a").update(
+        {"created_at": datetime.utcnow() - cache.ttl - timedelta(minutes=1)}
+    )
+    test_db.commit()
+
+    assert set(cache.lookup([("a", "x"), ("b", "y")])) == {"b"}
+
+    cache.max_entries = 1
+    assert cache.prune(test_db) == 2  # "a" expired, "c" is the least recently used
+    assert [entry.content_hash for entry in test_db.query(AnalysisCacheEntry)] == ["b"]
@@ -0,0 +1,119 @@
+"""
+Tests for the keyset-paginated backlog drain.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.backlog_drain import BacklogDrain
+
+
+def _backlog(db, account, count):
+    """Unprocessed tweets; several share a timestamp so the id tie-break matters."""
+    start = datetime(2026, 1, 1)
+    for i in range(count):
+        db.add(Tweet(
+            tweet_id=str(i), user_id=account.id, text=f"tweet {i}",
+            created_at=start + timedelta(minutes=i // 3), tweet_url=f"https://x.com/i/status/{i}",
+            engagement_score=float(i)
+        ))
+    db.commit()
+
+
+def _drain(skip=()):
+    """Drain whose analyzer returns a result for every tweet except ``skip``."""
+    analyzer = AIAnalyzer()
+    calls = []
+
+    async def fake_analyze(tweets):
+        calls.append([tweet.tweet_id for tweet in tweets])
+        return [
+            {"tweet_id": tweet.tweet_id, "is_ai_related": True, "ai_relevance_score": 7, "summary": "s"}
+            for tweet in tweets if tweet.tweet_id not in skip
+        ]
+
+    analyzer.analyze_tweet_batch = fake_analyze
+    return BacklogDrain(analyzer), calls
+
+
+def test_drain_walks_backlog_oldest_first(test_db, sample_monitored_account, monkeypatch):
+    """Test that every unprocessed tweet is analyzed once, oldest first, in chunks."""
+    monkeypatch.setattr("app.config.settings.analyzer_token_packing", False)
+    monkeypatch.setattr("app.config.settings.batch_size", 4)
+    _backlog(test_db, sample_monitored_account, 10)
+    drain, calls = _drain()
+
+    result = asyncio.run(drain.drain(test_db, chunk_size=4))
+
+    assert [tweet_id for call in calls for tweet_id in call] == [str(i) for i in range(10)]
+    assert [len(call) for call in calls] == [4, 4, 2]
+    assert result["status"] == "completed"
+    assert (result["chunks"], result["processed"], result["remaining"]) == (3, 10, 0)
+    assert test_db.query(Tweet).filter(Tweet.processed == False).count() == 0
+
+
+def test_drain_resumes_from_checkpoint(test_db, sample_monitored_account, monkeypatch):
+    """Test that a stopped drain continues after its cursor and passes over tweets without a result."""
+    monkeypatch.setattr("app.config.settings.analyzer_token_packing", False)
+    _backlog(test_db, sample_monitored_account, 9)
+
+    first, first_calls = _drain(skip={"1"})
+    result = asyncio.run(first.drain(test_db, chunk_size=3, max_chunks=2))
+    assert result["status"] == "running"
+    assert (result["processed"], result["skipped"], result["remaining"]) == (5, 1, 3)
+
+    # A new instance (as after a restart) picks up at the cursor
+    second, second_calls = _drain()
+    result = asyncio.run(second.drain(test_db, chunk_size=3))
+
+    assert second_calls == [["6", "7", "8"]]
+    assert result["status"] == "completed"
+    assert (result["chunks"], result["processed"], result["skipped"]) == (3, 8, 1)
+    assert [t.tweet_id for t in test_db.query(Tweet).filter(Tweet.processed == False)] == ["1"]
+
+
+def test_drain_pauses_when_nothing_is_analyzed(test_db, sample_monitored_account):
+    """Test that an API outage stops the drain without moving the cursor."""
+    _backlog(test_db, sample_monitored_account, 4)
+    drain, calls = _drain(skip={str(i) for i in range(4)})
+
+    result = asyncio.run(drain.drain(test_db, chunk_size=2))
+
+    assert len(calls) == 1
+    assert result["status"] == "running"
+    assert result["cursor"]["id"] is None
+    assert result["remaining"] == 4
+    assert "paused" in result["error"]
+    assert test_db.query(ProcessedTweet).count() == 0
+
+
+def test_drain_and_regular_run_do_not_overlap(test_db, sample_monitored_account, monkeypatch):
+    """Test that a drain running alongside a regular analysis run never stores a tweet twice."""
+    monkeypatch.setattr("app.config.settings.analyzer_token_packing", False)
+    _backlog(test_db, sample_monitored_account, 12)
+    drain, calls = _drain()
+    analyzer = drain.analyzer
+    analyze = analyzer.analyze_tweet_batch
+
+    async def slow_analyze(tweets):
+        await asyncio.sleep(0.01)
+        return await analyze(tweets)
+
+    analyzer.analyze_tweet_batch = slow_analyze
+
+    async def run():
+        return await asyncio.gather(
+            drain.drain(test_db, chunk_size=4),
+            analyzer.process_unprocessed_tweets(test_db, batch_size=2),
+        )
+
+    result, processed = asyncio.run(run())
+
+    analyzed = [tweet_id for call in calls for tweet_id in call]
+    assert sorted(analyzed) == sorted(str(i) for i in range(12))
+    assert result["processed"] + processed == 12
+    assert result["processed"] > 0 and processed > 0
+    assert test_db.query(ProcessedTweet).count() == 12
+    assert analyzer.unprocessed_tweets(test_db).count() == 0
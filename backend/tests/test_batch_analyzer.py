@@ -0,0 +1,117 @@
+"""
+Tests for offline analysis through Message Batches.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models.analysis_batch import AnalysisBatch
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.batch_analyzer import BatchAnalyzer
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+def _add_tweets(db, account, count):
+    now = datetime.utcnow()
+    for i in range(count):
+        db.add(Tweet(
+            tweet_id=str(i), user_id=account.id, text=f"tweet {i}",
+            created_at=now - timedelta(minutes=i), tweet_url=f"https://x.com/i/status/{i}",
+            engagement_score=float(i)
+        ))
+    db.commit()
+
+
+def test_batch_submit_resume_and_store(test_db, sample_monitored_account, test_analysis_cache):
+    """Test submitting a backlog, resuming after a restart and storing results."""
+    _add_tweets(test_db, sample_monitored_account, 5)
+    api = FakeMessagesAPI(polls_until_ended=1)
+    api.errored_custom_ids.add("tweets-1")
+
+    analyzer = BatchAnalyzer(AIAnalyzer(client=api.client(), cache=test_analysis_cache))
+    submitted = asyncio.run(analyzer.submit(test_db, batch_size=2))
+    assert submitted.request_count == 3 and submitted.tweet_count == 5
+    assert submitted.requests == {"tweets-0": [1, 2], "tweets-1": [3, 4], "tweets-2": [5]}
+    assert api.requests == 0  # No interactive calls
+
+    # A fresh instance (as after a restart) finds the batch in the database
+    resumed = BatchAnalyzer(AIAnalyzer(client=api.client(), cache=test_analysis_cache))
+    assert asyncio.run(resumed.submit(test_db, batch_size=2)) is None  # Everything is claimed
+
+    asyncio.run(resumed.resume(test_db))
+    batch = test_db.query(AnalysisBatch).one()
+    assert batch.status == "submitted"
+
+    asyncio.run(resumed.resume(test_db))
+    test_db.refresh(batch)
+    assert batch.status == "completed"
+    assert (batch.succeeded_count, batch.errored_count, batch.processed_count) == (2, 1, 3)
+
+    rows = test_db.query(ProcessedTweet).all()
+    assert sorted(row.tweet.tweet_id for row in rows) == ["0", "1", "4"]
+    assert all(row.summary == f"Summary of {row.tweet.tweet_id}" for row in rows)
+    assert resumed.open_batches(test_db) == []
+
+    # Tweets of the errored request go into the next submission
+    retry = asyncio.run(resumed.submit(test_db, batch_size=2))
+    assert retry.requests == {"tweets-0": [3, 4]}
+
+
+def test_claimed_tweets_skip_interactive_analysis(test_db, sample_monitored_account, test_analysis_cache):
+    """Test that tweets in an open batch are left out of interactive analysis."""
+    _add_tweets(test_db, sample_monitored_account, 5)
+    api = FakeMessagesAPI(latency=0)
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache)
+
+    asyncio.run(BatchAnalyzer(analyzer).submit(test_db, batch_size=2, max_tweets=3))
+    assert [tweet.id for tweet in analyzer.unprocessed_tweets(test_db)] == [4, 5]
+    assert [tweet.analysis_batch_id for tweet in test_db.query(Tweet).order_by(Tweet.id)] == [1, 1, 1, None, None]
+    # Claims are filtered in SQL, not bound tweet by tweet
+    assert len(analyzer.unprocessed_tweets(test_db).statement.compile().params) == 1
+
+    assert asyncio.run(analyzer.process_unprocessed_tweets(test_db, batch_size=10)) == 2
+    assert api.requests == 1
+    assert sorted(tweet.tweet_id for tweet in test_db.query(Tweet).filter(Tweet.processed == True)) == ["3", "4"]
+
+
+def test_lost_or_cancelled_batches_release_their_tweets(test_db, sample_monitored_account, test_analysis_cache):
+    """Test that a batch the API no longer has, or a cancelled one, fails and frees its tweets."""
+    _add_tweets(test_db, sample_monitored_account, 4)
+    api = FakeMessagesAPI(latency=0)
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache)
+    batches = BatchAnalyzer(analyzer)
+
+    lost = asyncio.run(batches.submit(test_db, batch_size=2, max_tweets=2))
+    cancelled = asyncio.run(batches.submit(test_db, batch_size=2))
+    assert analyzer.unprocessed_tweets(test_db).count() == 0
+
+    # The API has no record of the first batch any more
+    del api.batches[lost.batch_id]
+    asyncio.run(batches.resume(test_db))
+    assert lost.status == "failed" and "not found" in lost.error
+    assert sorted(tweet.id for tweet in analyzer.unprocessed_tweets(test_db)) == [1, 2]
+
+    asyncio.run(batches.cancel(test_db, cancelled))
+    assert api.batches[cancelled.batch_id]["cancelled"]
+    assert cancelled.status == "failed"
+    assert batches.open_batches(test_db) == []
+
+    # Released tweets go into the next submission
+    retry = asyncio.run(batches.submit(test_db, batch_size=4))
+    assert retry.tweet_count == 4
+
+
+def test_batches_past_results_retention_fail(test_db, sample_monitored_account, test_analysis_cache):
+    """Test that a batch older than the results retention is not polled."""
+    _add_tweets(test_db, sample_monitored_account, 2)
+    api = FakeMessagesAPI(latency=0)
+    batches = BatchAnalyzer(AIAnalyzer(client=api.client(), cache=test_analysis_cache))
+
+    batch = asyncio.run(batches.submit(test_db, batch_size=2))
+    batch.created_at = datetime.utcnow() - timedelta(days=30)
+    test_db.commit()
+
+    asyncio.run(batches.resume(test_db))
+    assert batch.status == "failed"
+    assert api.batches[batch.batch_id]["polls"] == 0
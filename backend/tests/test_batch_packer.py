@@ -0,0 +1,75 @@
+"""
+Tests for token-budgeted analyzer batch packing.
+"""
+import asyncio
+
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.batch_packer import BatchPacker
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+def _tweets(count, length, start=0):
+    return [Tweet(tweet_id=str(start + i), text=f"{start + i} " + "x" * length) for i in range(count)]
+
+
+def test_pack_respects_token_budgets():
+    """Test that short tweets share requests and long ones are spread out."""
+    packer = BatchPacker()
+    packer.input_budget = 2000
+    packer.max_tweets = 40
+    packer.output_tokens_per_tweet = 20
+
+    # ~37 input tokens each: the tweet cap binds first
+    assert [len(b) for b in packer.pack(_tweets(100, 100), max_tokens=10000)] == [40, 40, 20]
+
+    # ~513 input tokens each: two per request would exceed the input budget
+    packer.input_budget = 1000
+    long_batches = packer.pack(_tweets(3, 2000), max_tokens=10000)
+    assert [len(b) for b in long_batches] == [1, 1, 1]
+
+    # Output budget: 0.75 * 100 tokens fits three 21-token results
+    assert [len(b) for b in packer.pack(_tweets(7, 10), max_tokens=100)] == [3, 3, 1]
+
+    # Order is preserved across requests
+    batches = packer.pack(_tweets(5, 10), max_tokens=100)
+    assert [t.tweet_id for b in batches for t in b] == ["0", "1", "2", "3", "4"]
+
+
+def test_truncated_reply_keeps_complete_results(test_analysis_cache):
+    """Test that a reply cut off at max_tokens keeps its complete results and re-requests the rest."""
+    api = FakeMessagesAPI(latency=0)
+    packer = BatchPacker()
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache, packer=packer)
+    analyzer.max_tokens = 120  # The fake's reply is ~28 tokens per tweet
+
+    tweets = _tweets(8, 20)
+    results = asyncio.run(analyzer.analyze_tweet_batch(tweets))
+
+    assert [r["summary"] for r in results] == [f"Summary of {t.tweet_id}" for t in tweets]
+    stats = packer.get_stats()
+    assert stats["splits"] == 0
+    assert stats["truncated"] >= 1
+    assert stats["requeued"] >= 4
+    assert api.requests == stats["calls"]
+    assert stats["tweets"] == 8  # Every tweet was analyzed exactly once
+    assert stats["tweets_per_call"] < 8
+    assert stats["output_estimate_per_tweet"] != 90  # Learned from the replies
+
+
+def test_truncated_reply_without_results_is_split(test_analysis_cache):
+    """Test that a truncated reply with no complete result is retried as two halves."""
+    api = FakeMessagesAPI(latency=0)
+    packer = BatchPacker()
+    analyzer = AIAnalyzer(client=api.client(), cache=test_analysis_cache, packer=packer)
+    analyzer.max_tokens = 40  # Fits one ~28-token result
+
+    # The first tweet's result alone (a 120-character ID) exceeds max_tokens
+    tweets = [Tweet(tweet_id="9" * 120, text="first"), Tweet(tweet_id="1", text="one"), Tweet(tweet_id="2", text="two")]
+    results = asyncio.run(analyzer.analyze_tweet_batch(tweets))
+
+    # The oversized tweet stays unprocessed, the other half is analyzed
+    assert [r["tweet_id"] for r in results] == ["1", "2"]
+    stats = packer.get_stats()
+    assert stats["splits"] == 1
+    assert stats["tweets"] == 2
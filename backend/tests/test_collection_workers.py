@@ -0,0 +1,172 @@
+"""
+Tests for leased, multi-process tweet collection.
+"""
+import asyncio
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes.tasks import trigger_collection
+from app.config import settings
+from app.database import Base
+from app.models.monitored_account import MonitoredAccount
+from app.models.tweet import Tweet
+from app.services.account_leases import AccountLeaseManager
+from app.tasks.collection_worker import run_worker_process
+
+
+def _add_accounts(db, count):
+    for i in range(count):
+        db.add(MonitoredAccount(user_id=str(i), username=f"user{i}", is_active=True))
+    db.commit()
+
+
+def test_lease_skips_held_accounts_and_expires(test_db):
+    """Test that live leases are exclusive and expired ones are re-leased."""
+    _add_accounts(test_db, 5)
+    leases = AccountLeaseManager()
+    now = datetime.utcnow()
+
+    first = leases.lease_batch(test_db, "a", batch_size=3, lease_seconds=60, now=now)
+    second = leases.lease_batch(test_db, "b", batch_size=3, lease_seconds=600, now=now)
+    assert len(first) == 3 and len(second) == 2
+    assert not {a.id for a in first} & {a.id for a in second}
+    assert leases.lease_batch(test_db, "c", batch_size=3, lease_seconds=60, now=now) == []
+
+    # Worker "a" crashed: its leases expire and another worker picks the accounts up
+    later = now + timedelta(seconds=61)
+    taken_over = leases.lease_batch(test_db, "c", batch_size=5, lease_seconds=60, now=later)
+    assert {a.id for a in taken_over} == {a.id for a in first}
+
+    # A late release from the crashed worker does not clear the new owner's leases
+    assert leases.release(test_db, [a.id for a in first], "a", now=later) == 0
+    assert leases.get_lease_status(test_db)["workers"].get("c") == 3
+
+
+def test_release_defers_accounts_that_stayed_due(test_db, monkeypatch):
+    """Test that a failed account is not leased again in the same cycle."""
+    monkeypatch.setattr(settings, "worker_retry_minutes", 30)
+    _add_accounts(test_db, 2)
+    leases = AccountLeaseManager()
+    now = datetime.utcnow()
+
+    polled, failed = leases.lease_batch(test_db, "a", batch_size=2, now=now)
+    polled.next_poll_at = now + timedelta(hours=2)
+    test_db.commit()
+
+    assert leases.release(test_db, [polled.id, failed.id], "a", now=now) == 2
+    test_db.expire_all()
+    assert polled.next_poll_at == now + timedelta(hours=2)
+    assert failed.next_poll_at == now + timedelta(minutes=30)
+    assert failed.lease_owner is None and failed.lease_expires_at is None
+    assert leases.lease_batch(test_db, "b", now=now) == []
+
+
+class _FakeTwitterAPI(BaseHTTPRequestHandler):
+    """Serves /twitter/user/last_tweets and counts calls per username."""
+
+    delay = 0.2
+    calls = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        username = parse_qs(url.query)["userName"][0]
+        with self.lock:
+            self.calls[username] = self.calls.get(username, 0) + 1
+        time.sleep(self.delay)
+
+        index = int(username[4:])
+        body = json.dumps({
+            "status": "success",
+            "data": {"tweets": [
+                {"id": str(index * 10 + n), "type": "tweet", "text": f"{username} {n}",
+                 "createdAt": "Tue Feb 10 00:43:37 +0000 2026", "likeCount": n}
+                for n in range(2)
+            ]},
+            "has_next_page": False,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_api():
+    _FakeTwitterAPI.calls = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTwitterAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _FakeTwitterAPI.calls
+    server.shutdown()
+    server.server_close()
+
+
+def test_worker_processes_collect_each_account_once(tmp_path, monkeypatch, fake_api):
+    """Test that several worker processes split the accounts without overlap."""
+    base_url, calls = fake_api
+    database_url = f"sqlite:///{tmp_path / 'workers.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    _add_accounts(db, 12)
+
+    # Spawned workers build their settings from the environment
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    monkeypatch.setenv("TWITTER_API_BASE_URL", base_url)
+    monkeypatch.setenv("WORKER_LEASE_BATCH_SIZE", "2")
+    monkeypatch.setenv("COLLECTION_CONCURRENCY", "2")
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=3, mp_context=context) as pool:
+        futures = [pool.submit(run_worker_process, f"worker-{i}", True) for i in range(3)]
+        totals = [future.result(timeout=60) for future in futures]
+
+    assert calls == {f"user{i}": 1 for i in range(12)}
+    assert sum(worker["accounts"] for worker in totals) == 12
+    assert sum(worker["tweets"] for worker in totals) == 24
+    assert db.query(Tweet).count() == 24
+
+    accounts = db.query(MonitoredAccount).all()
+    assert all(a.lease_owner is None and a.lease_expires_at is None for a in accounts)
+    assert all(a.next_poll_at > datetime.utcnow() for a in accounts)
+    db.close()
+    engine.dispose()
+
+
+def test_manual_collection_defers_to_workers(test_db, monkeypatch):
+    """Test that the collect endpoint only analyzes when collection workers are enabled."""
+    calls = []
+
+    async def collect_all_tweets(db, **kwargs):
+        calls.append("collect")
+        return {"total_tweets": 0}
+
+    async def process_unprocessed_tweets(db):
+        calls.append("analyze")
+        return 3
+
+    monkeypatch.setattr(settings, "collection_workers_enabled", True)
+    monkeypatch.setattr("app.services.twitter_collector.twitter_collector.collect_all_tweets", collect_all_tweets)
+    monkeypatch.setattr("app.services.ai_analyzer.ai_analyzer.process_unprocessed_tweets", process_unprocessed_tweets)
+
+    result = asyncio.run(trigger_collection(BackgroundTasks(), db=test_db))
+
+    assert calls == ["analyze"]
+    assert result["status"] == "success"
+    assert result["stats"]["processed"] == 3
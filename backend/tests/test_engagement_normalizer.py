@@ -0,0 +1,141 @@
+"""
+Tests for rolling engagement normalization of importance scores.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+from app.models.engagement_histogram import EngagementHistogramBucket
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.engagement_normalizer import EngagementNormalizer, bucket_for
+from app.services.twitter_collector import TwitterCollector
+
+
+def _normalizer(test_db, scores, min_samples=100):
+    normalizer = EngagementNormalizer()
+    normalizer.min_samples = min_samples
+    now = datetime.utcnow()
+    normalizer.record(test_db, [(now - timedelta(hours=i % 48), score) for i, score in enumerate(scores)])
+    normalizer.refresh(test_db)
+    test_db.commit()
+    return normalizer
+
+
+def test_percentile_follows_rolling_distribution(test_db):
+    """Test that percentiles track the recorded distribution and are monotonic."""
+    normalizer = _normalizer(test_db, range(1000))
+
+    assert normalizer.percentile(0) == 0
+    assert normalizer.percentile(500) == pytest.approx(0.5, abs=0.05)
+    assert normalizer.percentile(900) == pytest.approx(0.9, abs=0.05)
+    assert normalizer.percentile(10 ** 6) == 1
+    samples = [normalizer.percentile(score) for score in range(0, 1200, 7)]
+    assert samples == sorted(samples)
+    assert normalizer.quantile(0.5) == pytest.approx(500, rel=0.1)
+
+
+def test_importance_is_comparable_across_batches(test_db):
+    """Test that the batch maximum no longer changes a tweet's score once the window is ready."""
+    analyzer = AIAnalyzer(normalizer=_normalizer(test_db, range(1000)))
+    in_small_batch = analyzer.calculate_importance_score(500.0, 7.0, max_engagement=600.0)
+    in_large_batch = analyzer.calculate_importance_score(500.0, 7.0, max_engagement=50000.0)
+    assert in_small_batch == in_large_batch
+
+    # Too few samples: falls back to the batch maximum
+    sparse = AIAnalyzer(normalizer=_normalizer(test_db, range(10), min_samples=2000))
+    assert sparse.calculate_importance_score(500.0, 8.0, max_engagement=1000.0) == 5.9
+
+
+def test_window_drops_old_days(test_db):
+    """Test that days outside the window are ignored and pruned."""
+    normalizer = EngagementNormalizer()
+    old = datetime.utcnow() - timedelta(days=normalizer.window_days + 5)
+    normalizer.record(test_db, [(old, 10.0)] * 50 + [(datetime.utcnow(), 10.0)] * 5)
+    normalizer.refresh(test_db)
+    test_db.commit()
+
+    assert normalizer.get_stats()["samples"] == 5
+    assert test_db.query(func.sum(EngagementHistogramBucket.tweet_count)).scalar() == 5
+
+
+def test_inserted_tweets_are_recorded_once(test_db, sample_monitored_account):
+    """Test that the collector adds only newly inserted tweets to the histogram."""
+    collector = TwitterCollector()
+    rows = [
+        collector.parse_tweet(
+            {"id": str(i), "text": f"tweet {i}", "likeCount": i, "createdAt": "Tue Feb 10 00:43:37 +0000 2026"},
+            sample_monitored_account.id
+        )
+        for i in range(6)
+    ]
+    assert collector.insert_tweets(test_db, rows[:4]) == 4
+    assert collector.insert_tweets(test_db, rows) == 2
+    test_db.commit()
+
+    assert test_db.query(func.sum(EngagementHistogramBucket.tweet_count)).scalar() == 6
+
+
+def test_rescore_importance_for_history(test_db, sample_monitored_account):
+    """Test that the bulk re-score rewrites batch-max scores with percentile scores."""
+    now = datetime.utcnow()
+    for i in range(300):
+        tweet = Tweet(
+            tweet_id=str(i), user_id=sample_monitored_account.id, text=f"tweet {i}",
+            created_at=now - timedelta(hours=i % 24), tweet_url=f"https://x.com/i/status/{i}",
+            engagement_score=float(i), processed=True
+        )
+        tweet.processed_tweet = ProcessedTweet(
+            is_ai_related=True, ai_relevance_score=5.0, importance_score=0.0, processed_at=now
+        )
+        test_db.add(tweet)
+    test_db.commit()
+
+    normalizer = EngagementNormalizer()
+    analyzer = AIAnalyzer(normalizer=normalizer)
+    with pytest.raises(ValueError):
+        analyzer.rescore_importance(test_db)
+
+    assert normalizer.backfill(test_db) == 300
+    assert analyzer.rescore_importance(test_db, chunk_size=64) == 300
+
+    scores = [
+        score for (score,) in
+        test_db.query(ProcessedTweet.importance_score).join(Tweet).order_by(Tweet.engagement_score)
+    ]
+    assert scores == sorted(scores)
+    assert scores[0] == 1.5  # Lowest engagement: only the relevance share remains
+    assert scores[-1] > 8  # Top percentile: close to 10 * 0.7 + 5 * 0.3
+
+
+def test_refreshed_scores_move_buckets(test_db):
+    """Test that re-scored tweets leave their insert-time bucket."""
+    normalizer = _normalizer(test_db, [0.0] * 100)
+    now = datetime.utcnow()
+
+    moved = [(now - timedelta(hours=i % 48), 0.0, 1000.0) for i in range(30)]
+    assert normalizer.move(test_db, moved + [(now, 0.0, 0.0)] * 5) == 30
+    test_db.commit()
+
+    assert normalizer.get_stats()["samples"] == 100
+    assert normalizer.percentile(100.0) == pytest.approx(0.7)
+    counts = dict(test_db.query(EngagementHistogramBucket.bucket, func.sum(EngagementHistogramBucket.tweet_count))
+                  .group_by(EngagementHistogramBucket.bucket))
+    assert counts == {0: 70, bucket_for(1000.0): 30}
+
+
+def test_window_changes_only_after_commit(test_db):
+    """Test that rolled-back increments never reach the loaded window."""
+    normalizer = _normalizer(test_db, range(100))
+    now = datetime.utcnow()
+
+    normalizer.record(test_db, [(now, 5.0)] * 50)
+    assert normalizer.get_stats()["samples"] == 100
+    test_db.rollback()
+    assert normalizer.get_stats()["samples"] == 100
+
+    normalizer.record(test_db, [(now, 5.0)] * 50)
+    test_db.commit()
+    assert normalizer.get_stats()["samples"] == 150
@@ -0,0 +1,72 @@
+"""
+Tests for the shared LLM gateway.
+"""
+import asyncio
+from datetime import datetime
+
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.aggregator import AggregatorService
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.ai_report_editor import AIReportEditorService
+from app.services.llm_gateway import LLMGateway
+from tests.fake_anthropic import FakeMessagesAPI, default_responder
+
+
+def test_services_share_one_client_with_call_site_profiles(test_db, sample_monitored_account):
+    """Test that every service calls through the same client with its own model and max_tokens."""
+    bodies = []
+
+    def responder(body):
+        bodies.append(body)
+        return default_responder(body)
+
+    api = FakeMessagesAPI(latency=0, responder=responder)
+    gateway = LLMGateway(api.client())
+    gateway.profiles["report"]["model"] = "report-model"
+
+    analyzer = AIAnalyzer(gateway=gateway)
+    aggregator = AggregatorService(gateway=gateway)
+    editor = AIReportEditorService(gateway=gateway)
+    assert analyzer.client is gateway.client
+
+    tweet = Tweet(
+        tweet_id="1", user_id=sample_monitored_account.id, text="New model released",
+        created_at=datetime.utcnow(), tweet_url="https://x.com/i/status/1"
+    )
+    tweet.processed_tweet = ProcessedTweet(is_ai_related=True, summary="s", importance_score=8.0)
+    test_db.add(tweet)
+    test_db.commit()
+
+    async def run():
+        await analyzer.translate_tweet("hello")
+        await aggregator.generate_highlights_summary([tweet.processed_tweet])
+        await gateway.complete("report", "Write the report", system=editor.system_prompt)
+
+    asyncio.run(run())
+
+    assert api.requests == 3
+    assert [body["max_tokens"] for body in bodies] == [1000, 1500, 8000]
+    assert bodies[2]["model"] == "report-model"
+    assert bodies[2]["system"] == editor.system_prompt
+
+
+def test_pooled_client_uses_settings(monkeypatch):
+    """Test that the pooled client honours base_url and retries, and is rebuilt after close."""
+    monkeypatch.setattr("app.config.settings.anthropic_base_url", "https://relay.example.com")
+    monkeypatch.setattr("app.config.settings.llm_max_retries", 5)
+    gateway = LLMGateway()
+
+    client = gateway.client
+    assert str(client.base_url).startswith("https://relay.example.com")
+    assert client.max_retries == 0  # Retries belong to the rate limiter
+    assert gateway.limiter.max_retries == 5
+    assert gateway.client is client
+
+    asyncio.run(gateway.close())
+    assert client.is_closed()
+    assert gateway.client is not client
+
+    fake = FakeMessagesAPI(latency=0).client()
+    gateway.use_client(fake)
+    assert gateway.client is fake
@@ -0,0 +1,61 @@
+"""
+Tests for the process-wide Claude rate limiter.
+"""
+import asyncio
+
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.llm_gateway import LLMGateway
+from app.services.llm_rate_limiter import BULK, INTERACTIVE, LLMRateLimiter
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+def test_interactive_calls_go_first():
+    """Test that a report call queued behind bulk analysis is served before it."""
+    limiter = LLMRateLimiter(requests_per_minute=600, tokens_per_minute=100000)
+    limiter.requests.take(limiter.requests.capacity)  # Exhausted: 10 requests per second refill
+    order = []
+
+    async def call(name, priority, delay):
+        await asyncio.sleep(delay)
+        await limiter.acquire(10, priority)
+        order.append(name)
+
+    async def run():
+        await asyncio.gather(
+            call("bulk-1", BULK, 0), call("bulk-2", BULK, 0.01), call("report", INTERACTIVE, 0.02)
+        )
+
+    asyncio.run(run())
+
+    assert order == ["report", "bulk-1", "bulk-2"]
+    assert limiter.get_stats()["throttled"] == {"interactive": 1, "bulk": 2}
+
+
+def test_rate_limited_batch_is_retried_not_dropped(test_analysis_cache):
+    """Test that 429s are retried with backoff and the limits adapt to the response headers."""
+    api = FakeMessagesAPI(latency=0, rate_limited=2, rate_limits={"requests": 120, "tokens": 9000})
+    limiter = LLMRateLimiter(max_retries=3, backoff_base=0.01)
+    analyzer = AIAnalyzer(gateway=LLMGateway(api.client(), limiter), cache=test_analysis_cache)
+
+    tweets = [Tweet(tweet_id=str(i), text=f"tweet {i}") for i in range(3)]
+    results = asyncio.run(analyzer.analyze_tweet_batch(tweets))
+
+    assert [result["tweet_id"] for result in results] == ["0", "1", "2"]
+    assert api.requests == 3
+    stats = limiter.get_stats()
+    assert (stats["retries"], stats["retries_by_reason"], stats["gave_up"]) == (2, {"429": 2}, 0)
+    assert (limiter.requests.capacity, limiter.tokens.capacity) == (120, 9000)
+
+
+def test_gives_up_after_max_retries(test_analysis_cache):
+    """Test that a persistent 429 surfaces after the configured retries."""
+    api = FakeMessagesAPI(latency=0, rate_limited=10)
+    limiter = LLMRateLimiter(max_retries=1, backoff_base=0.01)
+    analyzer = AIAnalyzer(gateway=LLMGateway(api.client(), limiter), cache=test_analysis_cache)
+
+    results = asyncio.run(analyzer.analyze_tweet_batch([Tweet(tweet_id="1", text="tweet")]))
+
+    assert results == []
+    assert api.requests == 2
+    assert limiter.get_stats()["gave_up"] == 1
@@ -0,0 +1,118 @@
+"""
+Tests for per-call Claude telemetry and its daily rollups.
+"""
+import asyncio
+import threading
+from datetime import datetime
+
+import anthropic
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+
+from app.models.llm_call import LLMCall
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.llm_gateway import LLMGateway
+from app.services.llm_rate_limiter import LLMRateLimiter
+from app.services.llm_telemetry import LLMTelemetry, estimate_cost
+from tests.fake_anthropic import FakeMessagesAPI
+
+
+@pytest.fixture
+def test_telemetry(test_engine):
+    """Telemetry backed by the test database."""
+    return LLMTelemetry(session_factory=sessionmaker(autocommit=False, autoflush=False, bind=test_engine))
+
+
+def test_estimate_cost():
+    """Test list-price costs, prompt caching factors and the batch discount."""
+    assert estimate_cost("claude-3-5-sonnet-20241022", 1_000_000, 100_000) == pytest.approx(4.5)
+    assert estimate_cost("claude-3-5-sonnet-20241022", 0, 0, 1_000_000, 1_000_000) == pytest.approx(4.05)
+    assert estimate_cost("claude-3-5-haiku-20241022", 1_000_000, 0, batch=True) == pytest.approx(0.4)
+    assert estimate_cost("some-other-model", 1000, 1000) is None
+
+
+def test_estimate_cost_uses_current_model_prices():
+    """Test that each model generation gets its own price, not its family's oldest."""
+    assert estimate_cost("claude-opus-4-5-20251101", 1_000_000, 1_000_000) == pytest.approx(30.0)
+    assert estimate_cost("claude-opus-4-1-20250805", 1_000_000, 1_000_000) == pytest.approx(90.0)
+    assert estimate_cost("claude-sonnet-4-5-20250929", 1_000_000, 1_000_000) == pytest.approx(18.0)
+    assert estimate_cost("claude-haiku-4-5-20251001", 1_000_000, 1_000_000) == pytest.approx(6.0)
+
+
+def test_configured_models_have_prices():
+    """Test that every configured Claude model has a list price."""
+    models = {
+        settings.claude_model,
+        settings.llm_translation_model or settings.claude_model,
+        settings.llm_summary_model or settings.claude_model,
+        settings.llm_report_model or settings.claude_model,
+    }
+    for model in models:
+        assert estimate_cost(model, 1000, 1000) is not None, model
+
+
+def test_gateway_calls_are_rolled_up_by_stage(test_db, test_telemetry, test_analysis_cache):
+    """Test that every call is recorded with its stage, tokens, retries and errors."""
+    api = FakeMessagesAPI(latency=0.01, rate_limited=1)
+    gateway = LLMGateway(api.client(), LLMRateLimiter(max_retries=1, backoff_base=0.01), test_telemetry)
+    analyzer = AIAnalyzer(gateway=gateway, cache=test_analysis_cache)
+
+    async def run():
+        await analyzer.analyze_tweet_batch([Tweet(tweet_id=str(i), text=f"tweet {i}") for i in range(3)])
+        await gateway.complete("report", "Write the report", system="You are an editor")
+        api.rate_limited = 2
+        with pytest.raises(anthropic.RateLimitError):
+            await gateway.complete("summary", "Summarize")
+
+    asyncio.run(run())
+    assert test_db.query(LLMCall).count() == 0  # Buffered until a flush
+    assert test_telemetry.flush() == 3
+
+    calls = {call.stage: call for call in test_db.query(LLMCall)}
+    assert calls["analysis"].retries == 1 and calls["analysis"].status == "ok"
+    assert calls["analysis"].input_tokens > 0 and calls["analysis"].output_tokens > 0
+    assert calls["analysis"].latency_ms >= 10
+    assert calls["report"].retries == 0
+    assert calls["summary"].status == "error" and "RateLimitError" in calls["summary"].error
+
+    stats = test_telemetry.get_stats(test_db)
+    assert [rollup["stage"] for rollup in stats["daily"]] == ["analysis", "report", "summary"]
+    assert {rollup["day"] for rollup in stats["daily"]} == {datetime.utcnow().date().isoformat()}
+    analysis = stats["totals_by_stage"]["analysis"]
+    assert (analysis["calls"], analysis["retries"], analysis["errors"]) == (1, 1, 0)
+    assert analysis["estimated_cost_usd"] > 0
+    assert stats["totals_by_stage"]["summary"]["errors"] == 1
+    assert test_telemetry.get_stats(test_db, stage="report")["totals_by_stage"].keys() == {"report"}
+
+
+def test_calls_are_written_in_bulk_off_the_event_loop(tmp_path):
+    """Test that buffered calls are flushed from an executor thread and on close."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'telemetry.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    telemetry = LLMTelemetry(session_factory=Session)
+    telemetry.flush_size = 3
+    threads = []
+    flush = telemetry.flush
+    telemetry.flush = lambda: threads.append(threading.current_thread()) or flush()
+
+    api = FakeMessagesAPI(latency=0)
+    gateway = LLMGateway(api.client(), LLMRateLimiter(), telemetry)
+
+    async def run():
+        for _ in range(4):
+            await gateway.complete("summary", "Summarize")
+        await asyncio.sleep(0.05)
+        written = Session().query(LLMCall).count()
+        await gateway.close()
+        return written
+
+    assert asyncio.run(run()) == 3
+    assert Session().query(LLMCall).count() == 4
+    assert telemetry.get_stats(Session())["buffered"] == 0
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,90 @@
+"""
+Tests for the engagement metric refresher.
+"""
+import asyncio
+import httpx
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import ai_analyzer
+from app.services.metric_refresher import MetricRefresher
+from app.services.twitter_collector import TwitterCollector
+
+
+def _refresher(metrics_by_id):
+    """Refresher whose collector serves ``metrics_by_id`` as current tweet objects."""
+    requests = []
+
+    def handler(request):
+        ids = request.url.params["tweet_ids"].split(",")
+        requests.append(ids)
+        tweets = [
+            {"id": tweet_id, "likeCount": metrics_by_id[tweet_id], "retweetCount": 0,
+             "replyCount": 0, "bookmarkCount": 0}
+            for tweet_id in ids if tweet_id in metrics_by_id
+        ]
+        return httpx.Response(200, json={"status": "success", "tweets": tweets})
+
+    collector = TwitterCollector()
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return MetricRefresher(collector), requests
+
+
+def _add_tweet(db, account, tweet_id, likes, age_hours=1):
+    tweet = Tweet(
+        tweet_id=tweet_id,
+        user_id=account.id,
+        text=f"Tweet {tweet_id}",
+        tweet_url=f"https://x.com/i/status/{tweet_id}",
+        created_at=datetime.utcnow() - timedelta(hours=age_hours),
+        like_count=likes,
+        engagement_score=float(likes),
+    )
+    db.add(tweet)
+    db.flush()
+    return tweet
+
+
+def test_refresh_updates_only_changed_tweets(test_db, sample_monitored_account, monkeypatch):
+    """Test that only tweets whose counts moved are updated and rescored."""
+    monkeypatch.setattr(settings, "metric_refresh_batch_size", 2)
+    changed = _add_tweet(test_db, sample_monitored_account, "1", likes=10)
+    unchanged = _add_tweet(test_db, sample_monitored_account, "2", likes=50)
+    stale = _add_tweet(test_db, sample_monitored_account, "3", likes=5, age_hours=72)
+    test_db.add(ProcessedTweet(tweet_id=changed.id, is_ai_related=True, ai_relevance_score=8.0, importance_score=1.0))
+    test_db.commit()
+
+    refresher, requests = _refresher({"1": 100, "2": 50, "3": 500})
+    stats = asyncio.run(refresher.refresh_recent_metrics(test_db, window_hours=36))
+
+    assert stats["candidates"] == 2
+    assert stats["api_calls"] == 1
+    assert stats["tweets_updated"] == 1
+    assert stats["scores_updated"] == 1
+    assert sorted(requests[0]) == ["1", "2"]
+
+    test_db.expire_all()
+    assert test_db.get(Tweet, changed.id).like_count == 100
+    assert test_db.get(Tweet, changed.id).engagement_score == 100.0
+    assert test_db.get(Tweet, unchanged.id).like_count == 50
+    assert test_db.get(Tweet, stale.id).like_count == 5
+
+    processed = test_db.query(ProcessedTweet).filter(ProcessedTweet.tweet_id == changed.id).one()
+    assert processed.importance_score == ai_analyzer.calculate_importance_score(100.0, 8.0, 100.0)
+
+
+def test_refresh_batches_requests(test_db, sample_monitored_account, monkeypatch):
+    """Test that tweet IDs are fetched in batches of the configured size."""
+    monkeypatch.setattr(settings, "metric_refresh_batch_size", 2)
+    for tweet_id in ("1", "2", "3", "4", "5"):
+        _add_tweet(test_db, sample_monitored_account, tweet_id, likes=1)
+    test_db.commit()
+
+    refresher, requests = _refresher({})
+    stats = asyncio.run(refresher.refresh_recent_metrics(test_db, window_hours=36))
+
+    assert [len(batch) for batch in requests] == [2, 2, 1]
+    assert stats["api_calls"] == 3
+    assert stats["tweets_updated"] == 0
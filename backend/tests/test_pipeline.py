@@ -0,0 +1,129 @@
+"""
+Tests for the streaming collect -> analyze pipeline.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models.monitored_account import MonitoredAccount
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.pipeline import CollectAnalyzePipeline
+from app.services.twitter_collector import TwitterCollector
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """File-backed SQLite so collection and worker sessions share one database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pipeline.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _pipeline(session_factory, accounts=5, tweets_per_account=4, fetch_delay=0.1, analyze_delay=0.1):
+    db = session_factory()
+    for i in range(accounts):
+        db.add(MonitoredAccount(user_id=str(i), username=f"user{i}", is_active=True))
+    db.commit()
+
+    collector = TwitterCollector()
+
+    async def fake_fetch(username, since_id=None, max_results=None, max_pages=None):
+        await asyncio.sleep(fetch_delay)
+        index = int(username[4:])
+        return [
+            {"id": str(index * 100 + n), "text": f"{username} tweet {n}", "likeCount": n,
+             "createdAt": "Tue Feb 10 00:43:37 +0000 2026"}
+            for n in range(tweets_per_account)
+        ]
+
+    collector.fetch_user_tweets = fake_fetch
+
+    analyzer = AIAnalyzer()
+    calls = []
+
+    async def fake_analyze(tweets):
+        calls.append(len(tweets))
+        await asyncio.sleep(analyze_delay)
+        return [
+            {"tweet_id": tweet.tweet_id, "is_ai_related": True, "ai_relevance_score": 7, "summary": "s", "topics": []}
+            for tweet in tweets
+        ]
+
+    analyzer.analyze_tweet_batch = fake_analyze
+    pipeline = CollectAnalyzePipeline(collector, analyzer, session_factory=session_factory)
+    return pipeline, db, calls
+
+
+def test_pipeline_overlaps_collection_and_analysis(session_factory, monkeypatch):
+    """Test that analysis starts before collection ends and every tweet is processed."""
+    monkeypatch.setattr(settings, "collection_concurrency", 1)
+    pipeline, db, calls = _pipeline(session_factory)
+
+    result = asyncio.run(pipeline.run(db, batch_size=4, workers=1))
+    timings = result["timings"]
+
+    assert result["collection"]["total_tweets"] == 20
+    assert result["analysis"]["processed"] == 20
+    assert calls == [4] * 5
+    assert db.query(Tweet).filter(Tweet.processed == False).count() == 0
+    assert db.query(ProcessedTweet).count() == 20
+
+    # Sequential would be ~0.5s collect + ~0.5s analyze
+    assert timings["first_batch_seconds"] < timings["collect_seconds"]
+    assert timings["total_seconds"] < timings["collect_seconds"] + timings["analyze_seconds"] - 0.2
+    db.close()
+
+
+def test_pipeline_backpressure_and_drain(session_factory, monkeypatch):
+    """Test that a small queue blocks collection and partial batches are flushed on drain."""
+    monkeypatch.setattr(settings, "collection_concurrency", 5)
+    monkeypatch.setattr(settings, "pipeline_flush_seconds", 0.05)
+    pipeline, db, calls = _pipeline(session_factory, accounts=3, tweets_per_account=3, fetch_delay=0.0)
+
+    result = asyncio.run(pipeline.run(db, batch_size=2, queue_size=2, workers=1))
+
+    assert result["analysis"]["processed"] == 9
+    assert calls == [2, 2, 2, 2, 1]
+    assert result["timings"]["collect_blocked_seconds"] >= 0.1
+    db.close()
+
+
+def test_pipeline_catches_up_on_leftover_tweets(session_factory, monkeypatch):
+    """Test that tweets left unprocessed before or by the run are analyzed at the end."""
+    monkeypatch.setattr(settings, "collection_concurrency", 1)
+    monkeypatch.setattr(settings, "analyzer_token_packing", False)
+    pipeline, db, calls = _pipeline(session_factory, accounts=2, tweets_per_account=2, analyze_delay=0)
+    account = db.query(MonitoredAccount).first()
+    db.add(Tweet(tweet_id="backlog", user_id=account.id, text="old tweet",
+                 created_at=datetime(2026, 1, 1), tweet_url="https://x.com/i/status/1"))
+    db.commit()
+
+    result = asyncio.run(pipeline.run(db, batch_size=2, workers=1))
+
+    assert result["analysis"]["processed"] == 4
+    assert result["analysis"]["catch_up_processed"] == 1
+    assert db.query(Tweet).filter(Tweet.processed == False).count() == 0
+    db.close()
+
+
+def test_pipeline_packs_worker_batches(session_factory, monkeypatch):
+    """Test that without an explicit batch size, worker batches are packed by estimated tokens."""
+    monkeypatch.setattr(settings, "collection_concurrency", 1)
+    monkeypatch.setattr(settings, "analyzer_token_packing", True)
+    monkeypatch.setattr(settings, "pipeline_flush_seconds", 0.05)
+    pipeline, db, calls = _pipeline(session_factory, accounts=1, tweets_per_account=6, analyze_delay=0)
+    monkeypatch.setattr(pipeline.analyzer.packer, "max_tweets", 4)
+
+    result = asyncio.run(pipeline.run(db, workers=1))
+
+    assert result["analysis"]["processed"] == 6
+    assert calls == [4, 2]
+    db.close()
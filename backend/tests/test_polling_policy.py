@@ -0,0 +1,53 @@
+"""
+Tests for adaptive polling policy.
+"""
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+from app.services.polling_policy import AdaptivePollingPolicy
+
+
+def test_compute_interval_clamped():
+    """Test interval bounds for prolific, quiet and unknown accounts."""
+    policy = AdaptivePollingPolicy()
+
+    assert policy.compute_interval(None) == settings.adaptive_poll_min_minutes
+    assert policy.compute_interval(0.0) == settings.adaptive_poll_max_minutes
+    assert policy.compute_interval(100.0) == settings.adaptive_poll_min_minutes
+    assert policy.compute_interval(0.0001) == settings.adaptive_poll_max_minutes
+
+    # 3 target tweets at 1 tweet/hour -> every 3 hours
+    assert policy.compute_interval(1.0) == 180
+
+
+def test_record_poll_backs_off_quiet_account():
+    """Test that empty polls stretch the interval and set next_poll_at."""
+    policy = AdaptivePollingPolicy()
+    account = MonitoredAccount(username="quiet")
+    now = datetime(2026, 1, 1, 12, 0)
+
+    policy.record_poll(account, new_tweets=2, now=now)
+    first_interval = account.poll_interval_minutes
+
+    for hour in range(1, 6):
+        policy.record_poll(account, new_tweets=0, now=now + timedelta(hours=hour * 6))
+
+    assert account.poll_interval_minutes > first_interval
+    assert account.next_poll_at == account.last_polled_at + timedelta(minutes=account.poll_interval_minutes)
+
+
+def test_due_filter_selects_only_due_accounts(test_db):
+    """Test that only never-polled or overdue accounts are selected."""
+    policy = AdaptivePollingPolicy()
+    now = datetime.utcnow()
+    test_db.add_all([
+        MonitoredAccount(user_id="1", username="new", is_active=True),
+        MonitoredAccount(user_id="2", username="overdue", is_active=True, next_poll_at=now - timedelta(minutes=5)),
+        MonitoredAccount(user_id="3", username="later", is_active=True, next_poll_at=now + timedelta(hours=2)),
+    ])
+    test_db.commit()
+
+    due = test_db.query(MonitoredAccount).filter(policy.due_filter(now)).all()
+
+    assert sorted(a.username for a in due) == ["new", "overdue"]
@@ -0,0 +1,118 @@
+"""
+Tests for the rate-limited request engine.
+"""
+import asyncio
+import time
+import httpx
+import pytest
+
+from app.services.request_engine import (
+    DeadlineExceeded,
+    RequestEngine,
+    RequestEngineError,
+    TokenBucket,
+    parse_retry_after,
+    request_deadline,
+)
+
+
+def _client(responses):
+    """Client whose transport replays the given responses in order."""
+    calls = iter(responses)
+
+    def handler(request):
+        return next(calls)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_token_bucket_throttles_beyond_burst():
+    """Test that acquisitions past the burst wait for refill."""
+    bucket = TokenBucket(rate=50.0, capacity=5)
+
+    async def run():
+        for _ in range(10):
+            await bucket.acquire()
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    # 5 extra tokens at 50/s -> ~0.1s
+    assert elapsed >= 0.08
+    stats = bucket.get_stats()
+    assert stats["acquired"] == 10
+    assert stats["throttled"] == 5
+    assert stats["saturation"] == 0.5
+
+
+def test_parse_retry_after_headers():
+    """Test Retry-After seconds and rate-limit reset headers."""
+    assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "3"})) == 3.0
+    assert parse_retry_after(httpx.Response(429, headers={"x-ratelimit-remaining": "0", "x-ratelimit-reset": "7"})) == 7.0
+    assert parse_retry_after(httpx.Response(429, headers={"x-ratelimit-remaining": "5", "x-ratelimit-reset": "7"})) is None
+    assert parse_retry_after(httpx.Response(503)) is None
+
+
+def test_engine_retries_rate_limit_then_succeeds():
+    """Test that a 429 with Retry-After is retried and counted."""
+    engine = RequestEngine(rate=100.0, burst=10, max_retries=3, backoff_base=0.01)
+    client = _client([
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"status": "success"}),
+    ])
+
+    async def run():
+        return await engine.request(lambda: client.get("https://api.test/x"))
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    stats = engine.get_stats()
+    assert stats["retries"] == 2
+    assert stats["retries_by_reason"] == {"429": 1, "503": 1}
+
+
+def test_engine_gives_up_after_max_retries():
+    """Test that persistent server errors raise instead of returning empty."""
+    engine = RequestEngine(rate=100.0, burst=10, max_retries=2, backoff_base=0.01)
+    client = _client([httpx.Response(502)] * 3)
+
+    with pytest.raises(RequestEngineError):
+        asyncio.run(engine.request(lambda: client.get("https://api.test/x")))
+
+    assert engine.get_stats()["gave_up"] == 1
+
+
+def test_engine_respects_run_deadline():
+    """Test that a long Retry-After is not waited out past the deadline."""
+    engine = RequestEngine(rate=100.0, burst=10, max_retries=3)
+    client = _client([httpx.Response(429, headers={"Retry-After": "30"})])
+
+    async def run():
+        with request_deadline(0.5):
+            await engine.request(lambda: client.get("https://api.test/x"))
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(run())
+
+    assert engine.get_stats()["deadline_exceeded"] == 1
+
+
+def test_exhausted_window_pauses_after_success():
+    """Test that a 200 reporting no remaining requests holds off the next request until the reset."""
+    engine = RequestEngine(rate=100.0, burst=10)
+    client = _client([
+        httpx.Response(200, headers={"x-ratelimit-remaining": "0", "x-ratelimit-reset": "0.2"}),
+        httpx.Response(200, headers={"x-ratelimit-remaining": "9", "x-ratelimit-reset": "60"}),
+    ])
+
+    async def run():
+        await engine.request(lambda: client.get("https://api.test/x"))
+        started = time.perf_counter()
+        await engine.request(lambda: client.get("https://api.test/x"))
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) >= 0.15
+    assert engine.get_stats()["limiter"]["throttled"] == 1
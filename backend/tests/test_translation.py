@@ -0,0 +1,105 @@
+"""
+Tests for batched, cached translation of top tweets.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.processed_tweet import ProcessedTweet
+from app.models.tweet import Tweet
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.llm_gateway import LLMGateway
+from app.services.translation_cache import TranslationCache
+from tests.fake_anthropic import FakeMessagesAPI, default_responder
+
+
+@pytest.fixture
+def test_translation_cache(test_engine):
+    """Translation cache backed by the test database."""
+    return TranslationCache(session_factory=sessionmaker(autocommit=False, autoflush=False, bind=test_engine))
+
+
+def _processed_tweets(db, account, texts):
+    now = datetime.utcnow()
+    rows = []
+    for i, text in enumerate(texts):
+        tweet = Tweet(
+            tweet_id=str(i), user_id=account.id, text=text, created_at=now,
+            tweet_url=f"https://x.com/i/status/{i}", engagement_score=1.0, processed=True
+        )
+        tweet.processed_tweet = ProcessedTweet(is_ai_related=True, importance_score=1.0, processed_at=now)
+        db.add(tweet)
+        rows.append(tweet.processed_tweet)
+    db.commit()
+    return rows
+
+
+def test_top_tweets_translated_in_concurrent_batches(test_db, sample_monitored_account, test_translation_cache):
+    """Test that distinct texts share batched calls and re-runs are answered from the cache."""
+    texts = [f"AI news {i}" for i in range(12)] + ["AI news 0", "AI news 1"]
+    rows = _processed_tweets(test_db, sample_monitored_account, texts)
+    ids = [row.id for row in rows]
+
+    api = FakeMessagesAPI(latency=0.05)
+    analyzer = AIAnalyzer(client=api.client(), translation_cache=test_translation_cache)
+
+    translated = asyncio.run(analyzer.translate_top_tweets(test_db, ids, batch_size=5, concurrency=3))
+
+    assert translated == 14
+    assert api.requests == 3  # 12 distinct texts in batches of 5
+    assert api.max_in_flight == 3
+    assert [row.translation for row in rows[:12]] == [f"翻译 {i}" for i in range(12)]
+    assert [row.translation for row in rows[12:]] == ["翻译 0", "翻译 1"]
+
+    # Already translated rows are skipped; cleared ones come from the cache
+    assert asyncio.run(analyzer.translate_top_tweets(test_db, ids)) == 0
+    for row in rows:
+        row.translation = None
+    test_db.commit()
+    assert asyncio.run(analyzer.translate_top_tweets(test_db, ids)) == 14
+    assert api.requests == 3
+
+
+def test_missing_batch_translations_fall_back(test_db, sample_monitored_account, test_translation_cache):
+    """Test that tweets a batched reply leaves out are translated one by one."""
+    rows = _processed_tweets(test_db, sample_monitored_account, ["first", "second", "third"])
+
+    def responder(body):
+        text = default_responder(body)
+        if body.get("tools"):
+            return json.dumps(json.loads(text)[1:], ensure_ascii=False)
+        return text
+
+    api = FakeMessagesAPI(latency=0, responder=responder)
+    analyzer = AIAnalyzer(client=api.client(), translation_cache=test_translation_cache)
+
+    translated = asyncio.run(analyzer.translate_top_tweets(test_db, [row.id for row in rows]))
+
+    assert translated == 3
+    assert api.requests == 2
+    assert [row.translation for row in rows] == ["翻译", "翻译 1", "翻译 2"]
+
+
+def test_translations_use_translation_profile(test_db, sample_monitored_account, test_translation_cache):
+    """Test that batched and single translations use the translation model and max_tokens."""
+    rows = _processed_tweets(test_db, sample_monitored_account, ["first", "second"])
+    bodies = []
+
+    def responder(body):
+        bodies.append(body)
+        text = default_responder(body)
+        if body.get("tools"):
+            return json.dumps(json.loads(text)[1:], ensure_ascii=False)
+        return text
+
+    api = FakeMessagesAPI(latency=0, responder=responder)
+    gateway = LLMGateway(api.client())
+    gateway.profiles["translation"].update(model="translation-model", max_tokens=321)
+    analyzer = AIAnalyzer(gateway=gateway, translation_cache=test_translation_cache)
+
+    assert asyncio.run(analyzer.translate_top_tweets(test_db, [row.id for row in rows])) == 2
+    assert len(bodies) == 2  # One batched call, one fallback for the missing tweet
+    assert {(body["model"], body["max_tokens"]) for body in bodies} == {("translation-model", 321)}
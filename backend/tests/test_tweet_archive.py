@@ -0,0 +1,94 @@
+"""
+Tests for the raw response archive and replay transport.
+"""
+import asyncio
+import gzip
+import httpx
+import pytest
+from datetime import date, datetime
+
+from app.services.request_engine import RequestEngineError
+from app.services.tweet_archive import ResponseArchive, ReplayTransport
+from app.services.twitter_collector import TwitterCollector
+
+
+def _page(tweet_ids, next_cursor=""):
+    return {
+        "status": "success",
+        "data": {"tweets": [{"id": tweet_id, "type": "tweet", "text": f"Tweet {tweet_id}", "likeCount": 1} for tweet_id in tweet_ids]},
+        "has_next_page": bool(next_cursor),
+        "next_cursor": next_cursor,
+    }
+
+
+def _archiving_collector(tmp_path, pages):
+    """Collector that talks to a mock API serving ``pages`` by cursor and archives to tmp_path."""
+    def handler(request):
+        return httpx.Response(200, json=pages[request.url.params.get("cursor", "")])
+
+    collector = TwitterCollector(archive_dir=str(tmp_path))
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return collector
+
+
+def test_archive_partitions_by_date(tmp_path):
+    """Test that responses land in gzip JSONL files per UTC day."""
+    archive = ResponseArchive(str(tmp_path))
+    request = httpx.Request("GET", "https://api.example.com/v1/twitter/user/last_tweets?userName=a")
+    response = httpx.Response(200, json=_page(["1"]), request=request)
+
+    archive.record(response, received_at=datetime(2026, 3, 1, 23, 59))
+    archive.record(response, received_at=datetime(2026, 3, 2, 0, 1))
+    archive.record(response, received_at=datetime(2026, 3, 2, 9, 0))
+
+    files = archive.files()
+    assert [f.name for f in files] == ["2026-03-01.jsonl.gz", "2026-03-02.jsonl.gz"]
+    with gzip.open(files[1], "rt") as f:
+        assert len(f.readlines()) == 2
+
+    records = list(archive.iter_records(start=date(2026, 3, 2)))
+    assert len(records) == 2
+    assert records[0]["params"] == {"userName": "a"}
+    assert records[0]["json"]["data"]["tweets"][0]["id"] == "1"
+
+
+def test_replay_serves_archived_pages(tmp_path):
+    """Test that a replaying collector reproduces an archived paginated fetch offline."""
+    pages = {"": _page(["30", "29"], next_cursor="c1"), "c1": _page(["28", "27"])}
+    live = _archiving_collector(tmp_path, pages)
+    live_tweets = asyncio.run(live.fetch_user_tweets("busy", since_id="10"))
+    assert live.archive.records_written == 2
+
+    replay = TwitterCollector(replay_dir=str(tmp_path))
+    replayed = asyncio.run(replay.fetch_user_tweets("busy", since_id="10"))
+
+    assert [t["id"] for t in replayed] == [t["id"] for t in live_tweets] == ["30", "29", "28", "27"]
+    assert replay.archive is None
+    assert replay.client._transport.hits == 2
+
+
+def test_replay_miss_fails_like_an_api_outage(tmp_path):
+    """Test that requests missing from the archive fail like an exhausted retry."""
+    replay = TwitterCollector(replay_dir=str(tmp_path))
+
+    with pytest.raises(RequestEngineError):
+        asyncio.run(replay.fetch_user_tweets("unknown"))
+    assert asyncio.run(replay.fetch_user_by_username("unknown")) is None
+    assert replay.client._transport.misses == 2
+
+
+def test_replay_repeats_requests_in_order(tmp_path):
+    """Test that repeated identical requests replay successive archived responses."""
+    archive = ResponseArchive(str(tmp_path))
+    request = httpx.Request("GET", "https://api.example.com/v1/twitter/user/last_tweets?userName=a")
+    archive.record(httpx.Response(200, json=_page(["1"]), request=request))
+    archive.record(httpx.Response(200, json=_page(["2", "1"]), request=request))
+
+    async def replay_three():
+        async with httpx.AsyncClient(transport=ReplayTransport(archive)) as client:
+            return [
+                (await client.get(str(request.url))).json()["data"]["tweets"][0]["id"]
+                for _ in range(3)
+            ]
+
+    assert asyncio.run(replay_three()) == ["1", "2", "2"]
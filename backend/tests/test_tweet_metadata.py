@@ -0,0 +1,68 @@
+"""
+Tests for compact tweet metadata storage.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import undefer
+
+from app.models.tweet import Tweet
+from app.services.twitter_collector import TwitterCollector
+from app.utils.compression import compress_json, decompress_json, split_fields
+
+
+def _payload():
+    return {
+        "id": "77",
+        "type": "tweet",
+        "text": "New open-weights model",
+        "createdAt": "Tue Feb 10 00:43:37 +0000 2026",
+        "likeCount": 5,
+        "lang": "en",
+        "viewCount": 1200,
+        "author": {"id": "9", "userName": "lab", "name": "Lab", "description": "bio " * 50},
+        "entities": {"hashtags": [{"text": "AI"}]},
+    }
+
+
+def test_split_fields_keeps_allow_list():
+    """Test top-level and dotted allow-list fields and dropped columns."""
+    kept, rest = split_fields(_payload(), ["lang", "author.userName", "missing"], drop=["id", "text", "likeCount"])
+
+    assert kept == {"lang": "en", "author": {"userName": "lab"}}
+    assert "id" not in rest and "likeCount" not in rest
+    assert rest["author"] == {"id": "9", "name": "Lab", "description": "bio " * 50}
+    assert rest["entities"] == {"hashtags": [{"text": "AI"}]}
+
+
+def test_compress_round_trip():
+    """Test both codecs read back, whatever the current setting."""
+    data = {"a": [1, 2, 3], "b": "ü" * 100}
+    assert decompress_json(compress_json(data, "gzip")) == data
+    assert decompress_json(compress_json(data, "zstd")) == data
+
+
+def test_raw_metadata_is_deferred(test_db, sample_monitored_account, test_engine):
+    """Test that Tweet queries skip the compressed column until it is accessed."""
+    collector = TwitterCollector()
+    row = collector.parse_tweet(_payload(), sample_monitored_account.id)
+    assert row["tweet_metadata"]["author"] == {"id": "9", "userName": "lab", "name": "Lab"}
+    assert "text" not in row["tweet_metadata"]
+
+    collector.insert_tweets(test_db, [row])
+    test_db.commit()
+    test_db.expire_all()
+
+    statements = []
+    event.listen(test_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    tweet = test_db.query(Tweet).one()
+    assert "raw_metadata" not in statements[-1]
+
+    metadata = tweet.full_metadata()
+    assert "raw_metadata" in statements[-1]
+    assert metadata["author"]["description"] == "bio " * 50
+    assert metadata["lang"] == "en"
+    assert metadata["entities"] == {"hashtags": [{"text": "AI"}]}
+
+    test_db.expire_all()
+    tweet = test_db.query(Tweet).options(undefer(Tweet.raw_metadata)).one()
+    assert tweet.raw_metadata is not None
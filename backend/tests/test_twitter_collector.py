@@ -1,8 +1,21 @@
 """
 Tests for Twitter collector service.
 """
+import asyncio
+import httpx
+import json
+import threading
+import time
 import pytest
-from app.services.twitter_collector import TwitterCollector
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from loguru import logger
+from unittest.mock import MagicMock
+
+from app.config import settings
+from app.models.monitored_account import MonitoredAccount
+from app.models.tweet import Tweet
+from app.services.twitter_collector import TwitterCollector, parse_twitter_date, TWITTER_DATE_FORMAT
 
 
 def test_calculate_engagement_score():
@@ -78,3 +91,239 @@ def test_parse_tweet(sample_monitored_account):
     assert parsed['engagement_score'] == 262.5
     assert parsed['user_id'] == sample_monitored_account.id
     assert parsed['processed'] is False
+
+
+@pytest.mark.parametrize("value", [
+    "Tue Feb 10 00:43:37 +0000 2026",
+    "Sun Dec 31 23:59:59 +0530 2023",
+    "Mon Jan 01 00:00:00 -0800 2024",
+])
+def test_parse_twitter_date_matches_strptime(value):
+    """Test that the sliced fast path agrees with strptime."""
+    assert parse_twitter_date(value) == datetime.strptime(value, TWITTER_DATE_FORMAT)
+    assert parse_twitter_date(value).utcoffset() == datetime.strptime(value, TWITTER_DATE_FORMAT).utcoffset()
+
+
+def test_parse_twitter_date_fallbacks():
+    """Test ISO input, invalid dates and garbage."""
+    assert parse_twitter_date("2024-02-06T10:30:00Z") == datetime(2024, 2, 6, 10, 30, tzinfo=timezone.utc)
+    assert parse_twitter_date("Tue Feb 30 00:43:37 +0000 2026") is None
+    assert parse_twitter_date("not a date") is None
+    assert parse_twitter_date("") is None
+
+
+def test_parse_tweet_twitterapi_format():
+    """Test parsing the twitterapi.io payload shape."""
+    collector = TwitterCollector()
+
+    parsed = collector.parse_tweet(_raw_tweet("42"), 7)
+
+    assert parsed["created_at"] == datetime(2026, 2, 10, 0, 43, 37, tzinfo=timezone.utc)
+    assert (parsed["like_count"], parsed["retweet_count"], parsed["reply_count"]) == (10, 2, 1)
+    assert parsed["engagement_score"] == collector.calculate_engagement_score(parsed)
+    assert parsed["tweet_url"] == "https://twitter.com/i/status/42"
+    assert "metadata" not in parsed
+
+
+def test_collect_all_tweets_runs_accounts_concurrently():
+    """Test that a collection pass takes about as long as the slowest account."""
+    collector = TwitterCollector()
+    accounts = [
+        MonitoredAccount(id=i, username=f"user{i}", last_tweet_id=None)
+        for i in range(8)
+    ]
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = accounts
+
+    async def fake_fetch(username, since_id=None, max_results=100):
+        await asyncio.sleep(0.2)
+        if username == "user3":
+            raise RuntimeError("boom")
+        return []
+
+    collector.fetch_user_tweets = fake_fetch
+
+    started = time.perf_counter()
+    stats = asyncio.run(collector.collect_all_tweets(db, concurrency=8))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8  # Sequential would take 8 * 0.2s
+    assert stats["total_accounts"] == 8
+    assert stats["successful_accounts"] == 7
+    assert stats["failed_accounts"] == 1
+    assert stats["total_tweets"] == 0
+
+
+def test_collect_all_tweets_account_timeout(monkeypatch):
+    """Test that a hung account fetch is abandoned after the timeout."""
+    monkeypatch.setattr(settings, "collection_account_timeout", 0.1)
+
+    collector = TwitterCollector()
+    accounts = [MonitoredAccount(id=1, username="slow", last_tweet_id=None)]
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = accounts
+
+    async def hanging_fetch(username, since_id=None, max_results=100):
+        await asyncio.sleep(10)
+        return []
+
+    collector.fetch_user_tweets = hanging_fetch
+
+    stats = asyncio.run(collector.collect_all_tweets(db))
+
+    assert stats["failed_accounts"] == 1
+    assert stats["successful_accounts"] == 0
+
+
+class _LastTweetsHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive twitterapi.io stand-in."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"status": "success", "data": {"tweets": []}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_pooled_client_reuses_connections():
+    """Test that sequential requests share one keep-alive connection."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LastTweetsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    collector = TwitterCollector()
+    collector.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run():
+        async with collector:
+            for username in ("a", "b", "c"):
+                await collector.fetch_user_tweets(username)
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    stats = collector.get_http_stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+
+
+def _raw_tweet(tweet_id: str) -> dict:
+    """Build a twitterapi.io-shaped tweet payload."""
+    return {
+        "id": tweet_id,
+        "type": "tweet",
+        "text": f"Tweet {tweet_id}",
+        "createdAt": "Tue Feb 10 00:43:37 +0000 2026",
+        "likeCount": 10,
+        "retweetCount": 2,
+        "replyCount": 1,
+        "bookmarkCount": 0,
+    }
+
+
+def test_insert_tweets_skips_existing(test_db, sample_monitored_account):
+    """Test that bulk insert only counts rows that were actually inserted."""
+    collector = TwitterCollector()
+    first = [collector.parse_tweet(_raw_tweet(i), sample_monitored_account.id) for i in ("101", "102", "103")]
+    assert collector.insert_tweets(test_db, first) == 3
+    test_db.commit()
+
+    # Overlapping page, including a duplicate inside the page itself
+    second = [collector.parse_tweet(_raw_tweet(i), sample_monitored_account.id) for i in ("103", "104", "104")]
+    assert collector.insert_tweets(test_db, second) == 1
+    test_db.commit()
+
+    assert test_db.query(Tweet).count() == 4
+
+
+def test_store_account_tweets_advances_last_tweet_id(test_db, sample_monitored_account):
+    """Test that storing a page records the newest tweet ID on the account."""
+    collector = TwitterCollector()
+
+    count = collector.store_account_tweets(
+        test_db,
+        sample_monitored_account,
+        [_raw_tweet("200"), _raw_tweet("250"), _raw_tweet("225")]
+    )
+
+    assert count == 3
+    assert sample_monitored_account.last_tweet_id == "250"
+
+
+def _paged_collector(pages):
+    """Collector whose API serves ``pages`` (lists of tweet IDs) by cursor."""
+    requests = []
+
+    def handler(request):
+        requests.append(dict(request.url.params))
+        index = int(request.url.params.get("cursor", 0))
+        has_next = index + 1 < len(pages)
+        return httpx.Response(200, json={
+            "status": "success",
+            "data": {"tweets": [_raw_tweet(tweet_id) for tweet_id in pages[index]]},
+            "has_next_page": has_next,
+            "next_cursor": str(index + 1) if has_next else "",
+        })
+
+    collector = TwitterCollector()
+    collector._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return collector, requests
+
+
+def test_fetch_user_tweets_paginates_until_since_id():
+    """Test that pagination stops at the page containing since_id."""
+    collector, requests = _paged_collector([["30", "29", "28"], ["27", "26", "25"], ["24", "23"]])
+
+    tweets = asyncio.run(collector.fetch_user_tweets("busy", since_id="26"))
+
+    assert [t["id"] for t in tweets] == ["30", "29", "28", "27"]
+    assert len(requests) == 2
+
+
+def test_fetch_user_tweets_quiet_account_single_page():
+    """Test that an account with nothing new costs one request."""
+    collector, requests = _paged_collector([["30", "29"], ["28", "27"]])
+
+    tweets = asyncio.run(collector.fetch_user_tweets("quiet", since_id="30"))
+
+    assert tweets == []
+    assert len(requests) == 1
+
+
+def test_fetch_user_tweets_respects_caps():
+    """Test page and tweet caps."""
+    collector, requests = _paged_collector([["9", "8"], ["7", "6"], ["5", "4"]])
+
+    tweets = asyncio.run(collector.fetch_user_tweets("busy", max_pages=2))
+    assert [t["id"] for t in tweets] == ["9", "8", "7", "6"]
+    assert len(requests) == 2
+
+    tweets = asyncio.run(collector.fetch_user_tweets("busy", max_results=3))
+    assert [t["id"] for t in tweets] == ["9", "8", "7"]
+
+
+def test_fetch_user_tweets_warns_when_cap_skips_tweets():
+    """Test that a tweet cap hit before since_id is reported, not silently dropped."""
+    collector, requests = _paged_collector([["9", "8", "7"], ["6", "5"], ["4", "3"]])
+    warnings = []
+    sink = logger.add(lambda message: warnings.append(message.record["message"]), level="WARNING")
+    try:
+        tweets = asyncio.run(collector.fetch_user_tweets("busy", since_id="3", max_results=2))
+        assert [t["id"] for t in tweets] == ["9", "8"]
+        assert len(requests) == 1
+        assert len(warnings) == 1 and "since_id 3" in warnings[0]
+
+        tweets = asyncio.run(collector.fetch_user_tweets("busy", since_id="5", max_results=4))
+        assert [t["id"] for t in tweets] == ["9", "8", "7", "6"]
+        assert len(warnings) == 1
+    finally:
+        logger.remove(sink)